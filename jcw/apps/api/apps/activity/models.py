@@ -1,11 +1,12 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from apps.core.models import TenantScopedModel
 import uuid
 
 User = get_user_model()
 
 
-class ActivityLog(models.Model):
+class ActivityLog(TenantScopedModel):
     """
     Tenant-scoped activity logging for audit trails.
     """
@@ -44,6 +45,9 @@ class ActivityLog(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['tenant', '-created_at'], name='activity_tenant_created_idx'),
+        ]
     
     def __str__(self):
         username = self.user.username if self.user else 'System'
@@ -0,0 +1,38 @@
+"""
+Helpers shared by the benchmark management commands.
+"""
+import json
+import math
+import time
+from contextlib import contextmanager
+
+
+@contextmanager
+def timed(results, key):
+    """
+    Store the wall time of the block, in seconds, as results[key].
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        results[key] = round(time.perf_counter() - started, 4)
+
+
+def percentiles(samples, points=(50, 95, 99)):
+    """
+    Nearest-rank percentiles (and mean) of durations in seconds, reported in milliseconds.
+    """
+    if not samples:
+        return {'count': 0}
+    ordered = sorted(samples)
+    result = {'count': len(ordered), 'mean_ms': round(sum(ordered) / len(ordered) * 1000, 3)}
+    for point in points:
+        index = min(len(ordered) - 1, max(0, math.ceil(point / 100 * len(ordered)) - 1))
+        result[f'p{point}_ms'] = round(ordered[index] * 1000, 3)
+    return result
+
+
+def write_report(path, report):
+    with open(path, 'w') as report_file:
+        json.dump(report, report_file, indent=2, default=str)
@@ -0,0 +1,207 @@
+"""
+Tenant-namespaced cache facade.
+
+Every key is prefixed with the namespace of the active tenant schema, so a
+view can cache tenant data without any risk of serving it to another tenant.
+Shared (cross-tenant) data goes through `tenant_cache.shared`.
+
+Keys embed a per-namespace version and a global version:
+
+    tc:<global version>:<namespace>:<namespace version>:<key>
+
+Bumping a namespace version drops a whole tenant's cache in O(1); bumping the
+global version drops every namespace (used when shared content changes).
+Stale entries are never deleted explicitly, they just age out.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+
+from .utils import get_current_tenant, is_row_tenancy
+
+
+SHARED_NAMESPACE = 'shared'
+PUBLIC_NAMESPACE = 'public'
+
+_stats_lock = threading.Lock()
+_stats = {}
+
+
+def row_tenant_namespace(tenant_id):
+    """
+    Namespace of a tenant in row-level tenancy mode.
+    """
+    return f'tenant-{tenant_id}'
+
+
+def current_namespace():
+    """
+    Namespace for the active tenant: its row scope in row-level tenancy mode,
+    its schema name under django-tenants, otherwise the public namespace.
+    """
+    if is_row_tenancy():
+        tenant = get_current_tenant()
+        return row_tenant_namespace(tenant.pk) if tenant is not None else PUBLIC_NAMESPACE
+    schema_name = getattr(connection, 'schema_name', None)
+    return schema_name or PUBLIC_NAMESPACE
+
+
+class TenantCache:
+    """
+    Cache facade bound to a namespace, or to the active tenant when namespace is None.
+    """
+    key_prefix = 'tc'
+
+    def __init__(self, namespace=None, alias='default', timeout=None):
+        self._namespace = namespace
+        self.alias = alias
+        self._timeout = timeout
+
+    @property
+    def timeout(self):
+        if self._timeout is None:
+            return getattr(settings, 'TENANT_CACHE_TIMEOUT', 300)
+        return self._timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def namespace(self):
+        return self._namespace or current_namespace()
+
+    @property
+    def shared(self):
+        return TenantCache(SHARED_NAMESPACE, alias=self.alias, timeout=self._timeout)
+
+    def for_namespace(self, namespace):
+        return TenantCache(namespace, alias=self.alias, timeout=self._timeout)
+
+    # Versioning
+
+    def _global_version_key(self):
+        return f'{self.key_prefix}:global:version'
+
+    def _version_key(self, namespace):
+        return f'{self.key_prefix}:ns:{namespace}:version'
+
+    def _prefix(self, namespace):
+        global_key, version_key = self._global_version_key(), self._version_key(namespace)
+        versions = self.cache.get_many([global_key, version_key])
+        return f'{self.key_prefix}:{versions.get(global_key, 0)}:{namespace}:{versions.get(version_key, 0)}'
+
+    def _bump(self, key):
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # Missing or evicted: restart from a value no earlier version could have used
+            version = int(time.time() * 1000)
+            self.cache.set(key, version, None)
+            return version
+
+    def invalidate(self):
+        """
+        Drop everything cached in this namespace.
+        """
+        namespace = self.namespace
+        self._record(namespace, 'invalidations')
+        return self._bump(self._version_key(namespace))
+
+    def invalidate_all(self):
+        """
+        Drop everything cached in every namespace.
+        """
+        self._record(SHARED_NAMESPACE, 'invalidations')
+        return self._bump(self._global_version_key())
+
+    # Cache operations
+
+    def get(self, key, default=None):
+        namespace = self.namespace
+        sentinel = object()
+        value = self.cache.get(f'{self._prefix(namespace)}:{key}', sentinel)
+        if value is sentinel:
+            self._record(namespace, 'misses')
+            return default
+        self._record(namespace, 'hits')
+        return value
+
+    def set(self, key, value, timeout=None):
+        namespace = self.namespace
+        self.cache.set(f'{self._prefix(namespace)}:{key}', value, self.timeout if timeout is None else timeout)
+        self._record(namespace, 'sets')
+
+    def delete(self, key):
+        namespace = self.namespace
+        self.cache.delete(f'{self._prefix(namespace)}:{key}')
+
+    def get_many(self, keys):
+        """
+        Return {key: value} for the keys that are cached.
+        """
+        namespace = self.namespace
+        prefix = self._prefix(namespace)
+        found = self.cache.get_many([f'{prefix}:{key}' for key in keys])
+        values = {key: found[f'{prefix}:{key}'] for key in keys if f'{prefix}:{key}' in found}
+        self._record(namespace, 'hits', len(values))
+        self._record(namespace, 'misses', len(keys) - len(values))
+        return values
+
+    def set_many(self, mapping, timeout=None):
+        namespace = self.namespace
+        prefix = self._prefix(namespace)
+        self.cache.set_many(
+            {f'{prefix}:{key}': value for key, value in mapping.items()},
+            self.timeout if timeout is None else timeout,
+        )
+        self._record(namespace, 'sets', len(mapping))
+
+    def get_or_set(self, key, default, timeout=None):
+        """
+        Return the cached value, computing and storing it (default may be callable) on a miss.
+        """
+        namespace = self.namespace
+        # Keep the version read before computing: if the namespace is
+        # invalidated meanwhile, the value lands under the dead version
+        cache_key = f'{self._prefix(namespace)}:{key}'
+        sentinel = object()
+        value = self.cache.get(cache_key, sentinel)
+        if value is not sentinel:
+            self._record(namespace, 'hits')
+            return value
+        self._record(namespace, 'misses')
+        value = default() if callable(default) else default
+        self.cache.set(cache_key, value, self.timeout if timeout is None else timeout)
+        self._record(namespace, 'sets')
+        return value
+
+    # Statistics (per worker process)
+
+    @staticmethod
+    def _record(namespace, counter, amount=1):
+        if not amount:
+            return
+        with _stats_lock:
+            namespace_stats = _stats.setdefault(
+                namespace, {'hits': 0, 'misses': 0, 'sets': 0, 'invalidations': 0}
+            )
+            namespace_stats[counter] += amount
+
+    @staticmethod
+    def stats():
+        with _stats_lock:
+            result = {}
+            for namespace, counters in _stats.items():
+                lookups = counters['hits'] + counters['misses']
+                result[namespace] = {
+                    **counters,
+                    'hit_rate': round(counters['hits'] / lookups, 4) if lookups else 0.0,
+                }
+            return result
+
+
+tenant_cache = TenantCache()
@@ -0,0 +1,94 @@
+"""
+Management command to benchmark tenant slug allocation under heavy collisions
+"""
+import json
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.benchmarks import percentiles, write_report
+from apps.core.utils import ensure_unique_tenant_slug
+from apps.tenants.models import Tenant
+
+
+def legacy_unique_slug(base_slug):
+    """
+    The previous allocator: one exists() query per candidate suffix, random
+    suffix after 100 misses. Kept here only as the benchmark baseline.
+    """
+    slug = base_slug
+    counter = 1
+    while Tenant.objects.filter(slug=slug).exists():
+        counter += 1
+        slug = f'{base_slug}-{counter}'
+        if counter > 100:
+            return f'{base_slug}-{uuid.uuid4().hex[:6]}'
+    return slug
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill the tenant table with "<base>", "<base>-2" ... "<base>-N" and time the next slug '
+        'allocation with the prefix-query allocator against the old per-suffix lookups. '
+        'Runs inside a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base', default='cafe', help='Colliding base slug')
+        parser.add_argument('--collisions', type=int, nargs='+', default=[10, 100, 1000, 5000],
+                          help='Numbers of existing colliding slugs')
+        parser.add_argument('--samples', type=int, default=50, help='Allocations timed per measurement')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        base, report = options['base'], {}
+        with transaction.atomic():
+            existing = 0
+            for collisions in sorted(options['collisions']):
+                existing = self.fill(base, existing, collisions)
+                report[str(collisions)] = {
+                    'prefix_query': self.measure(ensure_unique_tenant_slug, base, options['samples']),
+                    'legacy': self.measure(legacy_unique_slug, base, options['samples']),
+                }
+                result = report[str(collisions)]
+                self.stdout.write(
+                    f"{collisions} collisions: prefix query p50 {result['prefix_query']['p50_ms']}ms "
+                    f"({result['prefix_query']['queries']} queries), legacy p50 {result['legacy']['p50_ms']}ms "
+                    f"({result['legacy']['queries']} queries)"
+                )
+            transaction.set_rollback(True)
+
+        if options['output']:
+            write_report(options['output'], report)
+            self.stdout.write(f"Report written to {options['output']}")
+        self.stdout.write(self.style.SUCCESS('Benchmark complete'))
+        self.stdout.write(json.dumps(report, indent=2, default=str))
+
+    def fill(self, base, existing, collisions):
+        """
+        Add tenants until base and base-2 .. base-<collisions> are all taken.
+        """
+        tenants = [
+            Tenant(
+                slug=base if index == 1 else f'{base}-{index}',
+                business_name=f'Benchmark {index}',
+                contact_email=f'bench{index}@example.com',
+            )
+            for index in range(existing + 1, collisions + 1)
+        ]
+        Tenant.objects.bulk_create(tenants, batch_size=1000)
+        return max(existing, collisions)
+
+    def measure(self, allocate, base, samples):
+        timings = []
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(samples):
+                started = time.perf_counter()
+                allocate(base)
+                timings.append(time.perf_counter() - started)
+        result = percentiles(timings)
+        result['queries'] = len(queries) // samples
+        return result
@@ -3,7 +3,7 @@ Management command to create a new tenant
 """
 from django.core.management.base import BaseCommand
 from apps.tenants.models import Tenant, Domain
-from apps.core.utils import generate_tenant_slug, ensure_unique_tenant_slug
+from apps.core.utils import create_tenant_with_unique_slug, generate_tenant_slug
 from django.db import transaction
 
 
@@ -28,15 +28,11 @@ class Command(BaseCommand):
         try:
             with transaction.atomic():
                 # Generate or use custom slug
-                if options['slug']:
-                    slug = ensure_unique_tenant_slug(options['slug'])
-                else:
-                    base_slug = generate_tenant_slug(business_name)
-                    slug = ensure_unique_tenant_slug(base_slug)
+                base_slug = options['slug'] or generate_tenant_slug(business_name)
                 
                 # Create tenant
-                tenant = Tenant.objects.create(
-                    slug=slug,
+                tenant = create_tenant_with_unique_slug(
+                    base_slug,
                     business_name=business_name,
                     industry_category=options['industry'],
                     city=options['city'],
@@ -44,6 +40,7 @@ class Command(BaseCommand):
                     contact_email=contact_email,
                     contact_phone=options['phone'],
                 )
+                slug = tenant.slug
                 
                 # Create development domain
                 domain_name = f"{slug}.lvh.me"
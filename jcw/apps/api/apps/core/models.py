@@ -0,0 +1,55 @@
+from django.db import models
+
+from .utils import get_current_tenant, is_row_tenancy
+
+
+class TenantScopedManager(models.Manager):
+    """
+    Default manager of tenant-scoped models. In row-level tenancy mode it only
+    returns rows of the active tenant (or rows without a tenant when none is
+    active); in schema mode the schema already does the scoping.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not is_row_tenancy():
+            return queryset
+        tenant = get_current_tenant()
+        if tenant is None:
+            return queryset.filter(tenant__isnull=True)
+        return queryset.filter(tenant=tenant)
+
+
+class TenantScopedModel(models.Model):
+    """
+    Abstract base for models owned by a tenant. The tenant column is only
+    filled in row-level tenancy mode; `unscoped` bypasses the tenant filter.
+    Rows are removed with their tenant by a pre_delete handler rather than a
+    cascade, which would query tables missing from the public schema in
+    schema mode.
+    """
+    tenant = models.ForeignKey(
+        'tenants.Tenant',
+        null=True,
+        blank=True,
+        editable=False,
+        on_delete=models.DO_NOTHING,
+        related_name='+',
+        db_index=False,  # Covered by the composite indexes leading with tenant
+    )
+    
+    objects = TenantScopedManager()
+    unscoped = models.Manager()
+    
+    class Meta:
+        abstract = True
+    
+    def save(self, *args, **kwargs):
+        if self.tenant_id is None and is_row_tenancy():
+            self.tenant = get_current_tenant()
+        super().save(*args, **kwargs)
+
+
+def tenant_scoped_models():
+    from django.apps import apps
+    return [model for model in apps.get_models() if issubclass(model, TenantScopedModel)]
@@ -0,0 +1,168 @@
+"""
+django-tenants PostgreSQL backend with connection pooling and search_path tracking.
+
+django-tenants issues `SET search_path` on every cursor, even when the
+connection is already on the right schema. This backend remembers the
+search_path applied to each physical connection and skips the statement when
+it already matches. Physical connections can come from a psycopg_pool
+ConnectionPool (OPTIONS['pool']), so the remembered schema survives across
+requests.
+
+The remembered value is dropped whenever it might no longer be true: new
+physical connection, transaction or savepoint rollback (which undoes a SET
+issued inside it), or a connection returned to the pool mid-transaction.
+"""
+import threading
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django_tenants.postgresql_backend.base import DatabaseWrapper as TenantDatabaseWrapper, psycopg
+
+try:
+    from psycopg import IsolationLevel
+    from psycopg.pq import TransactionStatus
+    from psycopg_pool import ConnectionPool
+except ImportError:  # psycopg2 / no psycopg_pool: pooling unavailable
+    ConnectionPool = None
+
+
+SEARCH_PATH_ATTR = 'jcw_search_path'
+
+_pools = {}
+_pools_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {
+    'search_path_switches': 0,
+    'search_path_skips': 0,
+    'pool_checkouts': 0,
+    'pool_wait_total': 0.0,
+    'pool_wait_max': 0.0,
+}
+
+
+def _count(key, amount=1):
+    with _stats_lock:
+        _stats[key] += amount
+
+
+def _forget_search_path(raw_connection):
+    # Also the pool's `configure` hook, so new physical connections start unknown
+    setattr(raw_connection, SEARCH_PATH_ATTR, None)
+
+
+def get_connection_stats():
+    """
+    Per-process search_path and pool counters, plus psycopg_pool's own stats.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    checkouts = stats['pool_checkouts']
+    stats['pool_wait_avg'] = stats['pool_wait_total'] / checkouts if checkouts else 0.0
+    stats['pools'] = {alias: pool.get_stats() for alias, pool in _pools.items()}
+    return stats
+
+
+class DatabaseWrapper(TenantDatabaseWrapper):
+    """
+    Tenant-aware wrapper: pooled physical connections that remember their schema.
+    """
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        self.pool_options = conn_params.pop('pool', None)
+        if self.pool_options and ConnectionPool is None:
+            raise ImproperlyConfigured("OPTIONS['pool'] requires psycopg 3 and psycopg_pool.")
+        if self.pool_options is True:
+            self.pool_options = {}
+        return conn_params
+
+    def _get_pool(self, conn_params):
+        with _pools_lock:
+            pool = _pools.get(self.alias)
+            if pool is None:
+                options = {'min_size': 2, 'max_size': 10, 'timeout': 10.0, **self.pool_options}
+                pool = ConnectionPool(
+                    kwargs=conn_params,
+                    configure=_forget_search_path,
+                    name=self.alias,
+                    open=True,
+                    **options,
+                )
+                _pools[self.alias] = pool
+            return pool
+
+    def get_new_connection(self, conn_params):
+        if not self.pool_options:
+            connection = super().get_new_connection(conn_params)
+            _forget_search_path(connection)
+            return connection
+
+        # Same isolation level handling as the stock backend's connect()
+        isolation_level_value = self.settings_dict['OPTIONS'].get('isolation_level')
+        if isolation_level_value is None:
+            self.isolation_level = IsolationLevel.READ_COMMITTED
+        else:
+            try:
+                self.isolation_level = IsolationLevel(isolation_level_value)
+            except ValueError:
+                raise ImproperlyConfigured(
+                    f"Invalid transaction isolation level {isolation_level_value} specified."
+                )
+
+        pool = self._get_pool(conn_params)
+        started = time.perf_counter()
+        connection = pool.getconn()
+        waited = time.perf_counter() - started
+        with _stats_lock:
+            _stats['pool_checkouts'] += 1
+            _stats['pool_wait_total'] += waited
+            _stats['pool_wait_max'] = max(_stats['pool_wait_max'], waited)
+
+        if isolation_level_value is not None:
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        if not self.pool_options:
+            return super()._close()
+        if self.connection.info.transaction_status != TransactionStatus.IDLE:
+            # The pool rolls this back, which may undo our SET search_path
+            _forget_search_path(self.connection)
+        with self.wrap_database_errors:
+            _pools[self.alias].putconn(self.connection)
+
+    def _rollback(self):
+        if self.connection is not None:
+            _forget_search_path(self.connection)
+        return super()._rollback()
+
+    def _savepoint_rollback(self, sid):
+        _forget_search_path(self.connection)
+        return super()._savepoint_rollback(sid)
+
+    def _cursor(self, name=None):
+        # Skip django-tenants' unconditional SET; use the plain backend cursor
+        cursor = super(TenantDatabaseWrapper, self)._cursor(name=name) if name else \
+            super(TenantDatabaseWrapper, self)._cursor()
+
+        if not self.schema_name:
+            raise ImproperlyConfigured("Database schema not set. Did you forget "
+                                       "to call set_schema() or set_tenant()?")
+        search_paths = self._get_cursor_search_paths()
+        if getattr(self.connection, SEARCH_PATH_ATTR, None) == search_paths:
+            _count('search_path_skips')
+            return cursor
+
+        formatted_search_paths = ["'{}'".format(s) for s in search_paths]
+        try:
+            with self.connection.cursor() as search_path_cursor:
+                search_path_cursor.execute('SET search_path = {0}'.format(','.join(formatted_search_paths)))
+        except psycopg.Error:
+            # Aborted transaction: the next statement fails anyway, as in django-tenants
+            _forget_search_path(self.connection)
+            self.search_path_set_schemas = None
+        else:
+            setattr(self.connection, SEARCH_PATH_ATTR, search_paths)
+            self.search_path_set_schemas = search_paths
+            _count('search_path_switches')
+        return cursor
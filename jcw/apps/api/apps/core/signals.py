@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import current_namespace, row_tenant_namespace, tenant_cache
+from .utils import is_schema_tenancy
+
+
+def _in_tenant_schema(model):
+    # Per-schema copy under django-tenants; otherwise one row shared by every tenant
+    tenant_only_apps = set(getattr(settings, 'TENANT_APPS', [])) - set(getattr(settings, 'SHARED_APPS', []))
+    return is_schema_tenancy() and model._meta.app_config.name in tenant_only_apps
+
+
+@receiver(post_save, sender='pages.Page')
+@receiver(post_delete, sender='pages.Page')
+@receiver(post_save, sender='pages.PageSection')
+@receiver(post_delete, sender='pages.PageSection')
+@receiver(post_save, sender='themes.SiteTheme')
+@receiver(post_delete, sender='themes.SiteTheme')
+def invalidate_tenant_cache(sender, instance, **kwargs):
+    """
+    Drop the cache namespace of the tenant whose content changed: the one
+    owning the row in row tenancy (admin edits, jobs and imports run
+    without a tenant scope), the active schema's otherwise. The namespace
+    is captured now, the active schema may differ at commit time.
+    """
+    tenant_id = getattr(instance, 'tenant_id', None)
+    namespace = row_tenant_namespace(tenant_id) if tenant_id is not None else current_namespace()
+    transaction.on_commit(tenant_cache.for_namespace(namespace).invalidate)
+
+
+@receiver(post_save, sender='sections.Section')
+@receiver(post_delete, sender='sections.Section')
+@receiver(post_save, sender='templates.Template')
+@receiver(post_delete, sender='templates.Template')
+@receiver(post_save, sender='templates.TemplateSection')
+@receiver(post_delete, sender='templates.TemplateSection')
+def invalidate_shared_content_cache(sender, instance, **kwargs):
+    """
+    Sections and templates live in each schema under schema tenancy, and
+    are shared by every tenant otherwise: then every namespace may hold them.
+    """
+    if _in_tenant_schema(sender):
+        invalidate_tenant_cache(sender, instance, **kwargs)
+    else:
+        transaction.on_commit(tenant_cache.invalidate_all)
@@ -0,0 +1,33 @@
+from django.test import TestCase
+
+from apps.core.cache import row_tenant_namespace, tenant_cache
+from apps.core.utils import tenant_scope
+from apps.pages.models import Page
+from apps.tenants.models import Tenant
+
+
+class TenantCacheInvalidationTests(TestCase):
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(slug='cached', business_name='Cached', contact_email='cached@example.com')
+        self.cache = tenant_cache.for_namespace(row_tenant_namespace(self.tenant.pk))
+        with tenant_scope(self.tenant):
+            self.page = Page.objects.create(slug='home', title='Home')
+        self.cache.set('pages', ['home'])
+
+    def test_change_outside_tenant_scope_invalidates_owning_tenant(self):
+        # An admin edit or a job: no tenant scope is active
+        with self.captureOnCommitCallbacks(execute=True):
+            Page.unscoped.filter(pk=self.page.pk).get().save()
+
+        self.assertIsNone(self.cache.get('pages'))
+
+    def test_other_tenants_keep_their_cache(self):
+        other = tenant_cache.for_namespace(row_tenant_namespace('other'))
+        other.set('pages', ['about'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Page.unscoped.get(pk=self.page.pk).delete()
+
+        self.assertIsNone(self.cache.get('pages'))
+        self.assertEqual(other.get('pages'), ['about'])
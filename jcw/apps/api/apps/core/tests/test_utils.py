@@ -0,0 +1,44 @@
+from django.test import SimpleTestCase, TestCase
+
+from apps.core.utils import ensure_unique_tenant_slug, next_free_slug
+from apps.tenants.models import Tenant
+
+
+def taken_from(slugs):
+    def taken_slugs(stem):
+        return [slug for slug in slugs if slug == stem or slug.startswith(f'{stem}-')]
+    return taken_slugs
+
+
+class NextFreeSlugTests(SimpleTestCase):
+
+    def test_free_base_slug_is_kept(self):
+        self.assertEqual(next_free_slug('cafe', taken_from([])), 'cafe')
+
+    def test_free_base_slug_is_kept_when_a_suffix_is_taken(self):
+        self.assertEqual(next_free_slug('cafe', taken_from(['cafe-1', 'cafe-2'])), 'cafe')
+
+    def test_lowest_free_suffix_from_two(self):
+        self.assertEqual(next_free_slug('cafe', taken_from(['cafe', 'cafe-1', 'cafe-2', 'cafe-4'])), 'cafe-3')
+
+    def test_unrelated_prefix_matches_are_ignored(self):
+        self.assertEqual(next_free_slug('cafe', taken_from(['cafe', 'cafe-uno', 'cafe-2-b'])), 'cafe-2')
+
+    def test_stem_is_shortened_when_suffix_does_not_fit(self):
+        base = 'a' * 30
+
+        self.assertEqual(next_free_slug(base, taken_from([base])), 'a' * 28)
+
+    def test_shortened_stem_skips_its_taken_suffixes(self):
+        base = 'a' * 30
+        shortened = 'a' * 28
+
+        self.assertEqual(next_free_slug(base, taken_from([base, shortened, f'{shortened}-2'])), f'{shortened}-3')
+
+
+class EnsureUniqueTenantSlugTests(TestCase):
+
+    def test_base_slug_free_when_only_suffixed_slug_exists(self):
+        Tenant.objects.create(slug='cafe-1', business_name='Cafe', contact_email='cafe@example.com')
+
+        self.assertEqual(ensure_unique_tenant_slug('cafe'), 'cafe')
@@ -7,4 +7,5 @@ urlpatterns = [
     path('tenants/', views.AdminTenantListView.as_view(), name='admin_tenants'),
     path('tenants/<uuid:pk>/', views.AdminTenantDetailView.as_view(), name='admin_tenant_detail'),
     path('activity/', views.AdminActivityView.as_view(), name='admin_activity'),
+    path('metrics/', views.AdminMetricsView.as_view(), name='admin_metrics'),
 ]
\ No newline at end of file
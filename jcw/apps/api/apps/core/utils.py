@@ -1,8 +1,16 @@
 import re
 import unicodedata
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
 from django.utils.text import slugify as django_slugify
 
 
+# Tenant scoping tenant-scoped models in row-level tenancy mode
+_row_tenant = ContextVar('row_tenant', default=None)
+
 RESERVED_SLUGS = [
     'www', 'api', 'admin', 'app', 'mail', 'ftp', 'localhost', 'root', 'test',
     'staging', 'dev', 'demo', 'support', 'help', 'blog', 'news', 'about', 'contact'
@@ -46,35 +54,160 @@ def generate_tenant_slug(business_name, max_length=30):
     return slug
 
 
-def ensure_unique_tenant_slug(base_slug, exclude_id=None):
+def next_free_slug(base_slug, taken_slugs, max_length=30):
     """
-    Ensure slug uniqueness by appending -1, -2, etc. if needed.
+    Return base_slug, or base_slug-N with the lowest free N >= 2.
+    taken_slugs(stem) returns the taken slugs equal to stem or starting
+    with "stem-"; it is called again with a shorter stem when the suffix
+    would not fit in max_length.
     """
-    from apps.tenants.models import Tenant
-    
-    slug = base_slug
-    counter = 1
-    
+    stem = base_slug
     while True:
-        # Check if slug exists (excluding current tenant if updating)
-        queryset = Tenant.objects.filter(slug=slug)
+        pattern = re.compile(rf'^{re.escape(stem)}-(\d+)$')
+        stem_taken = False
+        taken = set()  # Suffixes in use; a "stem-1" does not make the stem itself taken
+        for slug in taken_slugs(stem):
+            if slug == stem:
+                stem_taken = True
+            else:
+                match = pattern.match(slug)
+                if match:
+                    taken.add(int(match.group(1)))
+
+        if not stem_taken:
+            return stem
+        counter = 2
+        while counter in taken:
+            counter += 1
+        slug = f'{stem}-{counter}'
+        if len(slug) <= max_length:
+            return slug
+        # No room for the suffix: shorten the stem and look again
+        stem = stem[:max_length - len(str(counter)) - 1].rstrip('-')
+
+
+def ensure_unique_tenant_slug(base_slug, exclude_id=None, max_length=30):
+    """
+    Return the first free slug derived from base_slug. All taken `base` /
+    `base-N` slugs are fetched with a single prefix query; the result can
+    still lose a race, see create_tenant_with_unique_slug.
+    """
+    from apps.tenants.models import Tenant
+
+    def taken_slugs(stem):
+        queryset = Tenant.objects.filter(Q(slug=stem) | Q(slug__startswith=f'{stem}-'))
         if exclude_id:
             queryset = queryset.exclude(id=exclude_id)
-        
-        if not queryset.exists():
-            return slug
-        
-        # Try next suffix
-        counter += 1
-        slug = f"{base_slug}-{counter}"
-        
-        # Prevent infinite loop
-        if counter > 100:
-            import uuid
-            slug = f"{base_slug}-{uuid.uuid4().hex[:6]}"
-            break
-    
-    return slug
+        return queryset.values_list('slug', flat=True)
+
+    return next_free_slug(base_slug, taken_slugs, max_length)
+
+
+def create_tenant_with_unique_slug(base_slug, attempts=5, **fields):
+    """
+    Create a Tenant under the first free slug derived from base_slug.
+    A concurrent signup can take the same slug between the lookup and the
+    insert; the unique constraint catches it and the next free slug is tried.
+    """
+    from apps.tenants.models import Tenant
+
+    for attempt in range(attempts):
+        slug = ensure_unique_tenant_slug(base_slug)
+        try:
+            with transaction.atomic():
+                return Tenant.objects.create(slug=slug, **fields)
+        except IntegrityError:
+            if attempt == attempts - 1 or not Tenant.objects.filter(slug=slug).exists():
+                raise
+
+
+def get_tenant_schema_name(tenant):
+    """
+    Return the PostgreSQL schema name for a tenant.
+    Uses django-tenants' schema_name when the model has one, otherwise
+    derives it from the slug (hyphens are not valid in unquoted identifiers).
+    """
+    schema_name = getattr(tenant, 'schema_name', None)
+    if schema_name:
+        return schema_name
+    return tenant.slug.replace('-', '_')
+
+
+def is_schema_tenancy():
+    """
+    True when running on the django-tenants backend (schema per tenant).
+    """
+    return getattr(settings, 'TENANCY_MODE', 'schema') == 'schema' and hasattr(connection, 'set_schema')
+
+
+def is_row_tenancy():
+    """
+    True when tenant-scoped models share tables and are filtered by their tenant column.
+    """
+    return getattr(settings, 'TENANCY_MODE', 'schema') == 'row'
+
+
+def get_current_tenant():
+    """
+    Return the active tenant: the row-level scope in row mode, otherwise the
+    tenant whose schema is active on the connection. None when no tenant is
+    active (public schema, or a request without a tenant host).
+    """
+    if is_row_tenancy():
+        return _row_tenant.get()
+    from apps.tenants.models import Tenant
+    tenant = getattr(connection, 'tenant', None)
+    return tenant if isinstance(tenant, Tenant) else None
+
+
+def set_current_tenant(tenant):
+    """
+    Activate a row-level tenant scope; returns a token for reset_current_tenant().
+    """
+    return _row_tenant.set(tenant)
+
+
+def reset_current_tenant(token):
+    _row_tenant.reset(token)
+
+
+@contextmanager
+def _row_tenant_scope(tenant):
+    token = set_current_tenant(tenant)
+    try:
+        yield tenant
+    finally:
+        reset_current_tenant(token)
+
+
+@contextmanager
+def _schema_tenant_scope(tenant):
+    from apps.tenants.sharding import tenant_connections
+
+    if not getattr(tenant, 'schema_name', None):
+        tenant.schema_name = get_tenant_schema_name(tenant)
+    # The default connection and, if elsewhere, the tenant's shard
+    previous = [(conn, conn.tenant, conn.include_public_schema) for conn in tenant_connections(tenant)]
+    try:
+        for conn, _, _ in previous:
+            conn.set_tenant(tenant)
+        yield tenant
+    finally:
+        for conn, previous_tenant, include_public in previous:
+            conn.set_tenant(previous_tenant, include_public)
+
+
+def tenant_scope(tenant):
+    """
+    Context manager that activates a tenant for tenant-scoped models: its
+    schema (on its shard) in schema mode, its row scope in row mode, a no-op
+    otherwise.
+    """
+    if is_row_tenancy():
+        return _row_tenant_scope(tenant)
+    if is_schema_tenancy():
+        return _schema_tenant_scope(tenant)
+    return nullcontext()
 
 
 def validate_section_naming_convention(slug):
@@ -2,8 +2,17 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from django.contrib.auth.models import User
+from apps.tenants.jobs import job_stats
+from apps.tenants.middleware import routing_stats
 from apps.tenants.models import Tenant
+from apps.tenants.platform_stats import get_platform_stats
+from apps.tenants.purging import restore_tenant
+from apps.core.cache import TenantCache
+from apps.tenants.negative_cache import unknown_hosts, unknown_slugs
+from apps.tenants.schema_pool import pool_stats
+from apps.tenants.slug_index import slug_index
+from apps.tenants.snapshots import snapshot_staleness
+from django.db import connection
 from django.db.models import Count
 from django.http import JsonResponse
 
@@ -13,12 +22,18 @@ class AdminStatsView(APIView):
     permission_classes = [IsAuthenticated, IsAdminUser]
     
     def get(self, request):
+        # One row maintained by signals, instead of counting across tenant schemas
+        platform = get_platform_stats()
         stats = {
-            'total_tenants': Tenant.objects.count(),
-            'active_tenants': Tenant.objects.filter(is_active=True).count(),
-            'total_pages': 0,  # Will implement when Page model is ready
-            'total_templates': 0,  # Will implement when Template model is ready
-            'total_users': User.objects.count(),
+            'total_tenants': platform.tenants,
+            'active_tenants': platform.active_tenants,
+            'total_pages': platform.pages_draft + platform.pages_published,
+            'pages_by_status': {'draft': platform.pages_draft, 'published': platform.pages_published},
+            'total_templates': platform.templates,
+            'total_sections': platform.sections,
+            'total_users': platform.users,
+            'updated_at': platform.updated_at,
+            'reconciled_at': platform.reconciled_at,
         }
         return Response(stats)
 
@@ -28,7 +43,7 @@ class AdminTenantListView(APIView):
     permission_classes = [IsAuthenticated, IsAdminUser]
     
     def get(self, request):
-        tenants = Tenant.objects.all().order_by('-created_at')
+        tenants = Tenant.objects.filter(deleted_at__isnull=True).order_by('-created_at')
         
         # Simple serialization for now
         data = []
@@ -81,6 +96,11 @@ class AdminTenantDetailView(APIView):
         try:
             tenant = Tenant.objects.get(pk=pk)
             
+            # Reactivating a deleted tenant means cancelling its purge
+            if tenant.deleted_at is not None and request.data.get('is_active'):
+                if not restore_tenant(tenant):
+                    return Response({'error': 'The purge has already started'}, status=status.HTTP_409_CONFLICT)
+            
             # Update allowed fields
             if 'is_active' in request.data:
                 tenant.is_active = request.data['is_active']
@@ -122,6 +142,33 @@ class AdminActivityView(APIView):
         return Response({'results': mock_activities[:limit]})
 
 
+class AdminMetricsView(APIView):
+    """Runtime cache metrics (admin only); in-memory counters are per worker"""
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    
+    def get(self, request):
+        return Response({
+            'tenant_negative_cache': {
+                'hosts': unknown_hosts.stats(),
+                'slugs': unknown_slugs.stats(),
+            },
+            'website_snapshots': snapshot_staleness(),
+            'tenant_cache': TenantCache.stats(),
+            'tenant_routing': routing_stats(),
+            'slug_index': slug_index.stats(),
+            'tenant_jobs': job_stats(),
+            'schema_pool': pool_stats(),
+            'db_connections': self.get_connection_stats(),
+        })
+    
+    def get_connection_stats(self):
+        # Only available on the pooled django-tenants backend
+        if connection.vendor != 'postgresql':
+            return None
+        from apps.core.postgresql_backend.base import get_connection_stats
+        return get_connection_stats()
+
+
 # Simple API info view
 def admin_api_info(request):
     """Simple API info endpoint"""
@@ -131,5 +178,6 @@ def admin_api_info(request):
             '/api/admin/stats/',
             '/api/admin/tenants/',
             '/api/admin/activity/',
+            '/api/admin/metrics/',
         ]
     })
\ No newline at end of file
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from apps.tenants.models import Tenant
 
 
 class OnboardingSerializer(serializers.Serializer):
@@ -13,6 +14,7 @@ class OnboardingSerializer(serializers.Serializer):
     city = serializers.CharField(max_length=100, required=False, allow_blank=True)
     country = serializers.CharField(max_length=100, required=False, allow_blank=True)
     plan = serializers.CharField(max_length=20, required=False, allow_blank=True)
+    website_type = serializers.ChoiceField(choices=Tenant.WEBSITE_TYPE_CHOICES, required=False)
     
     def validate_business_name(self, value):
         if len(value.strip()) < 2:
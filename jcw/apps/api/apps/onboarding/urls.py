@@ -3,5 +3,6 @@ from . import views
 
 urlpatterns = [
     path('start/', views.OnboardingStartView.as_view(), name='onboarding_start'),
+    path('jobs/<uuid:job_id>/', views.OnboardingJobView.as_view(), name='onboarding_job'),
     path('check-slug/', views.CheckSlugView.as_view(), name='onboarding_check_slug'),
 ]
\ No newline at end of file
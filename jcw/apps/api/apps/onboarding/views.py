@@ -2,10 +2,18 @@ from rest_framework import generics, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
+from django.conf import settings
 from django.db import transaction
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from apps.tenants.models import Tenant, Domain
-from apps.core.utils import generate_tenant_slug, ensure_unique_tenant_slug
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from apps.tenants.conditional import get_request_snapshot, website_conditional
+from apps.tenants.jobs import enqueue_job, run_job, start_job
+from apps.tenants.models import Domain, TenantJob
+from apps.tenants.serializers import TenantJobSerializer
+from apps.tenants.slug_index import slug_index
+from apps.core.utils import create_tenant_with_unique_slug, generate_tenant_slug
 from .serializers import OnboardingSerializer
 
 
@@ -18,15 +26,14 @@ class OnboardingStartView(APIView):
     def post(self, request):
         serializer = OnboardingSerializer(data=request.data)
         if serializer.is_valid():
+            provision_async = getattr(settings, 'TENANT_PROVISIONING_ASYNC', False)
             try:
                 with transaction.atomic():
-                    # Generate unique slug
+                    # Create tenant under a unique slug; with async provisioning
+                    # it stays inactive until the worker has built its schema
                     base_slug = generate_tenant_slug(serializer.validated_data['business_name'])
-                    unique_slug = ensure_unique_tenant_slug(base_slug)
-                    
-                    # Create tenant
-                    tenant = Tenant.objects.create(
-                        slug=unique_slug,
+                    tenant = create_tenant_with_unique_slug(
+                        base_slug,
                         business_name=serializer.validated_data['business_name'],
                         contact_email=serializer.validated_data['contact_email'],
                         contact_phone=serializer.validated_data.get('contact_phone', ''),
@@ -35,10 +42,12 @@ class OnboardingStartView(APIView):
                         city=serializer.validated_data.get('city', ''),
                         country=serializer.validated_data.get('country', ''),
                         plan=serializer.validated_data.get('plan', 'basic'),
+                        website_type=serializer.validated_data.get('website_type', 'one_page'),
+                        is_active=not provision_async,
                     )
+                    unique_slug = tenant.slug
                     
                     # Create domain for development
-                    from django.conf import settings
                     suffix = getattr(settings, 'TENANT_SUBDOMAIN_SUFFIX', '.lvh.me')
                     domain_name = f"{unique_slug}{suffix}"
                     
@@ -48,13 +57,36 @@ class OnboardingStartView(APIView):
                         is_primary=True
                     )
                     
+                    job = enqueue_job(tenant, 'provision')
+                
+                if provision_async:
                     return Response({
                         'success': True,
                         'tenant_id': tenant.id,
                         'slug': unique_slug,
-                        'dev_url': tenant.dev_url,
-                        'message': f'Tenant "{tenant.business_name}" created successfully!'
-                    }, status=status.HTTP_201_CREATED)
+                        'job_id': job.id,
+                        'status_url': reverse('onboarding_job', kwargs={'job_id': job.id}),
+                        'message': f'Creating "{tenant.business_name}"...'
+                    }, status=status.HTTP_202_ACCEPTED)
+                
+                start_job(job)
+                run_job(job)
+                if job.status != 'succeeded':
+                    # Left pending: a worker retries it
+                    return Response({
+                        'success': False,
+                        'tenant_id': tenant.id,
+                        'job_id': job.id,
+                        'error': TenantJobSerializer(job).data['error'],
+                    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                
+                return Response({
+                    'success': True,
+                    'tenant_id': tenant.id,
+                    'slug': unique_slug,
+                    'dev_url': tenant.dev_url,
+                    'message': f'Tenant "{tenant.business_name}" created successfully!'
+                }, status=status.HTTP_201_CREATED)
                     
             except Exception as e:
                 return Response({
@@ -65,6 +97,17 @@ class OnboardingStartView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class OnboardingJobView(APIView):
+    """
+    Progress of a tenant provisioning job started by OnboardingStartView.
+    """
+    permission_classes = [AllowAny]  # Job ids are unguessable UUIDs
+    
+    def get(self, request, job_id):
+        job = get_object_or_404(TenantJob.objects.select_related('tenant'), pk=job_id)
+        return Response(TenantJobSerializer(job).data)
+
+
 class CheckSlugView(APIView):
     """
     Check if a business name would generate an available slug.
@@ -76,10 +119,10 @@ class CheckSlugView(APIView):
         if not business_name:
             return Response({'error': 'business_name is required'}, status=status.HTTP_400_BAD_REQUEST)
         
+        # Answered from the in-memory index; the slug is allocated against the database on submit
         base_slug = generate_tenant_slug(business_name)
-        unique_slug = ensure_unique_tenant_slug(base_slug)
+        unique_slug = slug_index.suggest(base_slug)
         
-        from django.conf import settings
         suffix = getattr(settings, 'TENANT_SUBDOMAIN_SUFFIX', '.lvh.me')
         
         return Response({
@@ -89,31 +132,16 @@ class CheckSlugView(APIView):
         })
 
 
+@method_decorator(website_conditional, name='dispatch')
 class WebsiteView(APIView):
     """
     Retrieve website data by slug for localhost preview.
+    Served from the tenant's precomputed website snapshot.
     """
     permission_classes = [AllowAny]
     
     def get(self, request, slug):
-        # Find tenant by slug
-        tenant = get_object_or_404(Tenant, slug=slug)
-        
-        # For now, return basic tenant data
-        # Later this can be enhanced with full template rendering
-        return Response({
-            'success': True,
-            'slug': tenant.slug,
-            'business_name': tenant.business_name,
-            'website_name': tenant.business_name,  # Fallback to business name
-            'description': f"Welcome to {tenant.business_name}",
-            'contact_email': tenant.contact_email,
-            'contact_phone': tenant.contact_phone,
-            'city': tenant.city,
-            'country': tenant.country,
-            'industry_category': tenant.industry_category,
-            'services': [],  # Will be populated from tenant data
-            'logo_url': None,  # Will be populated when logo functionality is added
-            'template_html': None,  # Will be populated when template rendering is added
-            'dev_url': tenant.dev_subdomain_url,
-        })
\ No newline at end of file
+        snapshot = get_request_snapshot(request, slug)
+        if snapshot is None:
+            raise Http404
+        return Response(snapshot.document)
\ No newline at end of file
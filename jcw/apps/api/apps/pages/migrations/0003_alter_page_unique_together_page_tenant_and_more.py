@@ -0,0 +1,47 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0002_initial'),
+        ('sections', '0002_initial'),
+        ('templates', '0005_alter_template_unique_together_and_more'),
+        ('tenants', '0005_websitesnapshot'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='page',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='page',
+            name='tenant',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='tenants.tenant'),
+        ),
+        migrations.AddField(
+            model_name='pagesection',
+            name='tenant',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='tenants.tenant'),
+        ),
+        migrations.AddIndex(
+            model_name='page',
+            index=models.Index(fields=['tenant', 'status'], name='pages_page_tenant_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pagesection',
+            index=models.Index(fields=['tenant', 'page'], name='pages_ps_tenant_page_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='page',
+            constraint=models.UniqueConstraint(fields=('tenant', 'slug'), name='pages_page_tenant_slug_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='page',
+            constraint=models.UniqueConstraint(condition=models.Q(('tenant__isnull', True)), fields=('slug',), name='pages_page_slug_uniq'),
+        ),
+    ]
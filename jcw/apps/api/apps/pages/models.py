@@ -1,9 +1,10 @@
 from django.db import models
 from django.core.validators import RegexValidator
+from apps.core.models import TenantScopedModel
 import uuid
 
 
-class Page(models.Model):
+class Page(TenantScopedModel):
     """
     Tenant-scoped page model. Each page contains ordered sections.
     """
@@ -31,13 +32,22 @@ class Page(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
-        unique_together = ['slug']  # Unique per tenant schema
+        constraints = [
+            # Unique per tenant: per schema in schema mode, per tenant column in row mode
+            models.UniqueConstraint(fields=['tenant', 'slug'], name='pages_page_tenant_slug_uniq'),
+            models.UniqueConstraint(
+                fields=['slug'], condition=models.Q(tenant__isnull=True), name='pages_page_slug_uniq'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['tenant', 'status'], name='pages_page_tenant_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} ({self.slug})"
 
 
-class PageSection(models.Model):
+class PageSection(TenantScopedModel):
     """
     Junction table for page sections with ordering and props.
     """
@@ -52,6 +62,15 @@ class PageSection(models.Model):
     class Meta:
         ordering = ['order_index']
         unique_together = ['page', 'order_index']
+        indexes = [
+            models.Index(fields=['tenant', 'page'], name='pages_ps_tenant_page_idx'),
+        ]
+    
+    def save(self, *args, **kwargs):
+        # Always owned by the page's tenant
+        if self.tenant_id is None:
+            self.tenant_id = self.page.tenant_id
+        super().save(*args, **kwargs)
     
     def __str__(self):
         return f"{self.page.title} - {self.section.name} ({self.order_index})"
\ No newline at end of file
@@ -17,4 +17,13 @@ class PageSerializer(serializers.ModelSerializer):
     class Meta:
         model = Page
         fields = ['id', 'slug', 'title', 'status', 'template', 'page_sections', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
\ No newline at end of file
+        read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    def validate_slug(self, value):
+        # Uniqueness is per tenant, which the model constraints can't express to DRF
+        queryset = Page.objects.filter(slug=value)
+        if self.instance is not None:
+            queryset = queryset.exclude(pk=self.instance.pk)
+        if queryset.exists():
+            raise serializers.ValidationError("A page with this slug already exists.")
+        return value
@@ -1,4 +1,6 @@
 from rest_framework import generics, permissions
+from rest_framework.response import Response
+from apps.core.cache import tenant_cache
 from .models import Page
 from .serializers import PageSerializer
 
@@ -13,6 +15,13 @@ class PageListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         # Tenant-scoped: only pages in current tenant's schema
         return Page.objects.all().order_by('slug')
+    
+    def list(self, request, *args, **kwargs):
+        # Cached per tenant; page changes invalidate the tenant's namespace
+        key = f'pages:list:{request.get_host()}:{request.get_full_path()}'  # Pagination links are absolute
+        return Response(tenant_cache.get_or_set(
+            key, lambda: super(PageListCreateView, self).list(request, *args, **kwargs).data
+        ))
 
 
 class PageDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -23,4 +32,10 @@ class PageDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Page.objects.all()
\ No newline at end of file
+        return Page.objects.all()
+    
+    def retrieve(self, request, *args, **kwargs):
+        key = f"pages:detail:{kwargs['pk']}"
+        return Response(tenant_cache.get_or_set(
+            key, lambda: super(PageDetailView, self).retrieve(request, *args, **kwargs).data
+        ))
@@ -8,6 +8,7 @@ from django.db import transaction
 from django.utils.decorators import method_decorator
 from .models import Template, TemplateSection
 from .serializers import TemplateSerializer, TemplateUploadSerializer, TemplateComposeSerializer
+from apps.core.cache import tenant_cache
 from apps.tenants.views import IsAdminUser
 from .permissions import admin_required
 
@@ -45,15 +46,27 @@ class TemplateViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         """List all templates with optional category filtering"""
         category = request.query_params.get('category')
-        queryset = self.get_queryset()
         
-        if category:
-            queryset = queryset.filter(category=category)
+        def build():
+            queryset = self.get_queryset()
+            
+            if category:
+                queryset = queryset.filter(category=category)
+            
+            # Order by category and name for better organization
+            queryset = queryset.order_by('category', 'name')
+            serializer = self.get_serializer(queryset, many=True)
+            return serializer.data
         
-        # Order by category and name for better organization
-        queryset = queryset.order_by('category', 'name')
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        # Preview URLs are absolute, so the host is part of the key
+        key = f'templates:list:{request.get_host()}:{category or ""}'
+        return Response(tenant_cache.get_or_set(key, build))
+    
+    def retrieve(self, request, *args, **kwargs):
+        key = f"templates:detail:{request.get_host()}:{kwargs['pk']}"
+        return Response(tenant_cache.get_or_set(
+            key, lambda: super(TemplateViewSet, self).retrieve(request, *args, **kwargs).data
+        ))
     
     @method_decorator(admin_required)
     @action(detail=False, methods=['post'])
@@ -86,14 +99,17 @@ class TemplateViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def code(self, request, pk=None):
         """Get HTML and CSS code for a template"""
-        template = get_object_or_404(Template, pk=pk)
-        return Response({
-            'html_content': template.html_content,
-            'css_content': template.css_content,
-            'name': template.name,
-            'category': template.category,
-            'file_name': template.file_name
-        })
+        def build():
+            template = get_object_or_404(Template, pk=pk)
+            return {
+                'html_content': template.html_content,
+                'css_content': template.css_content,
+                'name': template.name,
+                'category': template.category,
+                'file_name': template.file_name
+            }
+        
+        return Response(tenant_cache.get_or_set(f'templates:code:{pk}', build))
     
     @action(detail=False, methods=['get'])
     def categories(self, request):
@@ -107,17 +123,20 @@ class TemplateViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """Get template statistics"""
-        total_templates = Template.objects.count()
-        active_templates = Template.objects.filter(is_active=True).count()
-        categories_count = Template.objects.values('category').distinct().count()
-        total_usage = sum(Template.objects.values_list('used_by_count', flat=True))
+        def build():
+            total_templates = Template.objects.count()
+            active_templates = Template.objects.filter(is_active=True).count()
+            categories_count = Template.objects.values('category').distinct().count()
+            total_usage = sum(Template.objects.values_list('used_by_count', flat=True))
+            
+            return {
+                'total_templates': total_templates,
+                'active_templates': active_templates,
+                'categories_count': categories_count,
+                'total_usage': total_usage
+            }
         
-        return Response({
-            'total_templates': total_templates,
-            'active_templates': active_templates,
-            'categories_count': categories_count,
-            'total_usage': total_usage
-        })
+        return Response(tenant_cache.get_or_set('templates:stats', build))
 
 
 # Legacy views for backward compatibility
@@ -129,6 +148,12 @@ class TemplateListCreateView(generics.ListCreateAPIView):
     serializer_class = TemplateSerializer
     permission_classes = [IsAdminUser]
     
+    def list(self, request, *args, **kwargs):
+        key = f'templates:legacy:list:{request.get_host()}:{request.get_full_path()}'
+        return Response(tenant_cache.get_or_set(
+            key, lambda: super(TemplateListCreateView, self).list(request, *args, **kwargs).data
+        ))
+    
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
@@ -139,4 +164,10 @@ class TemplateDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     queryset = Template.objects.all()
     serializer_class = TemplateSerializer
-    permission_classes = [IsAdminUser]
\ No newline at end of file
+    permission_classes = [IsAdminUser]
+    
+    def retrieve(self, request, *args, **kwargs):
+        key = f"templates:detail:{request.get_host()}:{kwargs['pk']}"
+        return Response(tenant_cache.get_or_set(
+            key, lambda: super(TemplateDetailView, self).retrieve(request, *args, **kwargs).data
+        ))
@@ -0,0 +1,306 @@
+"""
+Per-tenant export archives, for backups and for moving a site between
+environments.
+
+An archive is a zip file holding:
+
+- manifest.json: format version, the tenant's fields and the row count of
+  every model, in import order
+- data/<app_label.model>.jsonl: one JSON object per row of each
+  tenant-scoped model (pages before the sections that reference them)
+- media/<path>: uploaded files referenced from the content (MEDIA_URL paths
+  found in JSON props/options)
+
+The export streams: rows are read with iterator() (server-side cursors on
+PostgreSQL) and the zip is written to an in-memory buffer that is drained
+after every few rows, so neither a whole table nor the whole archive is
+held in memory. References to shared rows (sections, templates, users) are
+written as natural keys and resolved again on import, where ids differ
+between environments.
+"""
+import io
+import json
+import zipfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+
+from apps.core.utils import is_row_tenancy, is_schema_tenancy, tenant_scope
+
+from .sharding import check_writes_allowed
+
+
+ARCHIVE_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+DRAIN_SIZE = 64 * 1024  # Bytes buffered before a chunk is handed on
+TENANT_FIELDS = [
+    'slug', 'business_name', 'city', 'country', 'contact_email', 'contact_phone',
+    'website_url', 'industry_category', 'plan', 'website_type',
+]
+
+
+class ArchiveError(Exception):
+    pass
+
+
+class _StreamBuffer(io.RawIOBase):
+    """
+    Unseekable sink for ZipFile: written bytes wait here until drained.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks, self.size = [], 0
+        return data
+
+
+def check_tenancy():
+    # Without a tenancy mode tenant-scoped models are not scoped at all
+    if not (is_row_tenancy() or is_schema_tenancy()):
+        raise ArchiveError('Tenant archives need row or schema tenancy (TENANCY_MODE)')
+
+
+def natural_keys():
+    return {
+        'sections.Section': 'slug',
+        'templates.Template': 'slug',
+        settings.AUTH_USER_MODEL: get_user_model().USERNAME_FIELD,
+    }
+
+
+def archive_models():
+    """
+    Tenant-scoped models, each after the models it references.
+    """
+    from apps.core.models import tenant_scoped_models
+
+    remaining = tenant_scoped_models()
+    ordered = []
+    while remaining:
+        for model in remaining:
+            parents = {
+                field.related_model for field in model._meta.concrete_fields
+                if field.is_relation and field.related_model in remaining and field.related_model is not model
+            }
+            if not parents:
+                ordered.append(model)
+                remaining.remove(model)
+                break
+        else:
+            raise ArchiveError('Circular references between tenant-scoped models')
+    return ordered
+
+
+def archive_columns(model):
+    """
+    (archive key, values_list lookup) per exported column. The tenant column
+    is left out; foreign keys to shared models become "<field>__<natural key>".
+    """
+    scoped = set(archive_models())
+    keys = natural_keys()
+    columns = []
+    for field in model._meta.concrete_fields:
+        if field.name == 'tenant':
+            continue
+        if field.is_relation and field.related_model not in scoped:
+            lookup = f'{field.name}__{keys[field.related_model._meta.label]}'
+            columns.append((lookup, lookup))
+        else:
+            columns.append((field.attname, field.attname))
+    return columns
+
+
+def media_paths(value):
+    """
+    Storage paths of uploaded files referenced anywhere in a JSON value.
+    """
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from media_paths(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from media_paths(item)
+    elif isinstance(value, str) and value.startswith(settings.MEDIA_URL):
+        path = value[len(settings.MEDIA_URL):]
+        if path:
+            yield path
+
+
+# Export
+
+def iter_archive(tenant):
+    """
+    Yield the tenant's export archive as a stream of bytes chunks.
+    """
+    buffer = _StreamBuffer()
+    check_tenancy()
+    counts = {}
+    media = set()
+    media_count = 0
+    with tenant_scope(tenant), zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for model in archive_models():
+            label = model._meta.label
+            columns = archive_columns(model)
+            json_fields = [
+                index for index, (key, _) in enumerate(columns)
+                if isinstance(model._meta.get_field(key.split('__')[0]), models.JSONField)
+            ]
+            counts[label] = 0
+            with archive.open(f'data/{label}.jsonl', 'w', force_zip64=True) as member:
+                rows = model.objects.order_by().values_list(*[lookup for _, lookup in columns])
+                for row in rows.iterator(chunk_size=2000):
+                    for index in json_fields:
+                        media.update(media_paths(row[index]))
+                    line = json.dumps(dict(zip([key for key, _ in columns], row)), cls=DjangoJSONEncoder)
+                    member.write(line.encode() + b'\n')
+                    counts[label] += 1
+                    if buffer.size >= DRAIN_SIZE:
+                        yield buffer.drain()
+
+        for path in sorted(media):
+            if not default_storage.exists(path):
+                continue
+            with default_storage.open(path, 'rb') as source:
+                with archive.open(f'media/{path}', 'w', force_zip64=True) as member:
+                    # Drain as the file is copied, so a large upload is never buffered whole
+                    while chunk := source.read(DRAIN_SIZE):
+                        member.write(chunk)
+                        if buffer.size >= DRAIN_SIZE:
+                            yield buffer.drain()
+            media_count += 1
+            yield buffer.drain()
+
+        manifest = {
+            'version': ARCHIVE_VERSION,
+            'tenant': {field: getattr(tenant, field) for field in TENANT_FIELDS},
+            'models': counts,
+            'media': media_count,
+        }
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+    yield buffer.drain()
+
+
+# Import
+
+def import_archive(fileobj, tenant, batch_size=500):
+    """
+    Replace the tenant's content with the content of an archive (a path or
+    a seekable file). Rows are inserted with bulk_create, `batch_size` at a
+    time, in one transaction, under new primary keys; rows whose shared
+    section/template no longer exists are skipped. Created/updated
+    timestamps are set to the import time.
+    Returns {model label: rows imported}.
+    """
+    from apps.core.cache import current_namespace, tenant_cache
+
+    from . import platform_stats
+    from .snapshots import rebuild_snapshot
+
+    check_tenancy()
+    check_writes_allowed(tenant.pk)
+    with zipfile.ZipFile(fileobj) as archive:
+        try:
+            manifest = json.loads(archive.read(MANIFEST_NAME))
+        except KeyError:
+            raise ArchiveError('Not a tenant archive: manifest.json is missing')
+        if manifest.get('version') != ARCHIVE_VERSION:
+            raise ArchiveError(f'Unsupported archive version {manifest.get("version")}')
+        by_label = {model._meta.label: model for model in archive_models()}
+        unknown = set(manifest['models']) - set(by_label)
+        if unknown:
+            raise ArchiveError(f'Unknown models in archive: {", ".join(sorted(unknown))}')
+
+        counts = {}
+        new_ids = {}
+        row_tenant = tenant if is_row_tenancy() else None  # bulk_create skips TenantScopedModel.save()
+        with tenant_scope(tenant), transaction.atomic():
+            for model in reversed(list(by_label.values())):
+                model.objects.all().delete()
+            for label in manifest['models']:
+                model = by_label[label]
+                counts[label] = 0
+                with archive.open(f'data/{label}.jsonl') as member:
+                    batch = []
+                    for line in io.TextIOWrapper(member, encoding='utf-8'):
+                        batch.append(json.loads(line))
+                        if len(batch) >= batch_size:
+                            counts[label] += _insert_batch(model, batch, row_tenant, new_ids)
+                            batch = []
+                    if batch:
+                        counts[label] += _insert_batch(model, batch, row_tenant, new_ids)
+
+            for name in archive.namelist():
+                path = name.removeprefix('media/')
+                if name.startswith('media/') and not default_storage.exists(path):
+                    with archive.open(name) as source:
+                        default_storage.save(path, source)
+
+            check_writes_allowed(tenant.pk)  # Frozen for a move meanwhile: roll back
+            # No signals from bulk_create: refresh caches, counters and the public snapshot
+            tenant_cache.for_namespace(current_namespace()).invalidate()
+            platform_stats.adjust(**platform_stats.count_content([by_label['pages.Page'].objects.all()]))
+            transaction.on_commit(lambda: rebuild_snapshot(tenant))
+    return counts
+
+
+def _insert_batch(model, rows, tenant, new_ids):
+    """
+    Resolve natural keys for one batch with one query per shared model,
+    give every row a new primary key (the archive's may exist already, e.g.
+    when copying a site within one database), point references to rows of
+    earlier models at their new keys and bulk insert the batch. `new_ids`
+    maps archive primary keys to new ones and is extended. Returns the
+    number of rows inserted.
+    """
+    keys = {key for row in rows for key in row if '__' in key}
+    resolved = {}
+    for key in keys:
+        field_name, lookup = key.split('__', 1)
+        related = model._meta.get_field(field_name).related_model
+        values = {row[key] for row in rows if row.get(key) is not None}
+        resolved[key] = dict(
+            related._default_manager.filter(**{f'{lookup}__in': values}).values_list(lookup, 'pk')
+        )
+
+    pk_field = model._meta.pk
+    by_attname = {field.attname: field for field in model._meta.concrete_fields}
+    objects = []
+    for row in rows:
+        fields = {}
+        for key, value in row.items():
+            if '__' in key:
+                field = model._meta.get_field(key.split('__', 1)[0])
+                target = resolved[key].get(value)
+            elif key == pk_field.attname:
+                continue
+            else:
+                field = by_attname[key]
+                target = None if value is None else field.to_python(value)
+                if field.is_relation and target is not None:
+                    target = new_ids.get(str(target))
+            if target is None and value is not None and not field.null:
+                break  # The referenced row is missing here: skip this row
+            fields[field.attname] = target
+        else:
+            obj = model(tenant=tenant, **fields) if tenant is not None else model(**fields)
+            obj._archive_pk = row[pk_field.attname]
+            objects.append(obj)
+    model.objects.bulk_create(objects)
+    for obj in objects:
+        new_ids[str(obj._archive_pk)] = obj.pk
+    return len(objects)
@@ -0,0 +1,253 @@
+"""
+Copying one tenant's site (pages, page sections, theme) into another.
+
+Each table is copied with a single INSERT ... SELECT, between the two
+schemas in schema tenancy or within the shared table in row tenancy, so a
+site with thousands of sections costs a handful of statements instead of
+a query per row. New primary keys are derived in SQL as
+md5(target tenant id || old key), which maps every reference between the
+copied rows (a section's page_id) without a lookup table. References to
+sections and templates, which live in each schema, are matched by slug;
+the ones the source site uses are first copied into the target schema
+when it lacks them (a freshly built schema has none). Media are
+referenced by URL, so both sites point at the same files.
+
+The clone target is placed on the source's shard: INSERT ... SELECT cannot
+cross databases.
+"""
+import time
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from apps.core.cache import current_namespace, tenant_cache
+from apps.core.utils import get_tenant_schema_name, is_row_tenancy, is_schema_tenancy, tenant_scope
+
+from . import platform_stats
+from .archive import check_tenancy, natural_keys
+from .sharding import check_writes_allowed, get_tenant_shard
+
+
+def clone_models():
+    from apps.pages.models import Page, PageSection
+    from apps.themes.models import SiteTheme
+
+    return [Page, PageSection, SiteTheme]  # Parents first
+
+
+def _in_tenant_schema(model):
+    return is_schema_tenancy() and model._meta.app_config.name in getattr(settings, 'TENANT_APPS', [])
+
+
+def _new_id(connection, column_sql):
+    # Deterministic per target: the same old key always maps to the same new one
+    if connection.vendor == 'postgresql':
+        return f'md5(%s || {column_sql}::text)::uuid'
+    return f'MD5(%s || {column_sql})'  # SQLite stores UUIDs as 32 hex digits
+
+
+def shared_models():
+    from apps.sections.models import Section
+    from apps.templates.models import Template, TemplateSection
+
+    return [Section, Template, TemplateSection]  # Parents first
+
+
+def _table(model, schema, qn):
+    return f'{qn(schema)}.{qn(model._meta.db_table)}' if schema else qn(model._meta.db_table)
+
+
+def _match_natural_key(related, column, qn, source_schema, target_schema):
+    """
+    SQL for the target schema's key of the `related` row `column` points
+    at in the source schema: each schema has its own copy of shared rows.
+    """
+    key = qn(related._meta.get_field(natural_keys()[related._meta.label]).column)
+    related_pk = qn(related._meta.pk.column)
+    return (
+        f'(SELECT dst.{related_pk} FROM {_table(related, target_schema, qn)} dst '
+        f'JOIN {_table(related, source_schema, qn)} rel ON rel.{key} = dst.{key} '
+        f'WHERE rel.{related_pk} = {column})'
+    )
+
+
+def copy_table_sql(model, connection, source, target, now):
+    """
+    INSERT ... SELECT copying `model`'s rows of `source` to `target`, with
+    its parameters.
+    """
+    qn = connection.ops.quote_name
+    scoped = set(clone_models())
+    source_schema = target_schema = None
+    if is_schema_tenancy():
+        source_schema, target_schema = get_tenant_schema_name(source), get_tenant_schema_name(target)
+
+    columns, values, params = [], [], []
+    for field in model._meta.concrete_fields:
+        column = f'src.{qn(field.column)}'
+        if field.primary_key or (field.is_relation and field.related_model in scoped):
+            value = _new_id(connection, column)
+            params.append(target.pk.hex)
+        elif field.name == 'tenant' and is_row_tenancy():
+            value = '%s'
+            params.append(field.get_db_prep_value(target.pk, connection))
+        elif field.name == 'tenant':
+            value = 'NULL'
+        elif getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+            value = '%s'
+            params.append(field.get_db_prep_value(now, connection))
+        elif field.is_relation and _in_tenant_schema(field.related_model):
+            value = _match_natural_key(field.related_model, column, qn, source_schema, target_schema)
+        else:
+            value = column
+        columns.append(qn(field.column))
+        values.append(value)
+
+    sql = (
+        f'INSERT INTO {_table(model, target_schema, qn)} ({", ".join(columns)}) '
+        f'SELECT {", ".join(values)} FROM {_table(model, source_schema, qn)} src'
+    )
+    if is_row_tenancy():
+        tenant_field = model._meta.get_field('tenant')
+        sql += f' WHERE src.{qn(tenant_field.column)} = %s'
+        params.append(tenant_field.get_db_prep_value(source.pk, connection))
+    return sql, params
+
+
+def copy_shared_sql(model, connection, source, target, now):
+    """
+    Schema tenancy: INSERT ... SELECT copying the rows of a shared model
+    (section, template, template section) that the source site uses and the
+    target schema lacks, with its parameters. Rows keep their keys; a
+    template is copied as non-default, the target keeps its own defaults.
+    """
+    from apps.pages.models import Page, PageSection
+    from apps.sections.models import Section
+    from apps.templates.models import Template, TemplateSection
+
+    qn = connection.ops.quote_name
+    source_schema, target_schema = get_tenant_schema_name(source), get_tenant_schema_name(target)
+
+    def source_column(model, field_name):
+        return f'SELECT {qn(model._meta.get_field(field_name).column)} FROM {_table(model, source_schema, qn)}'
+
+    page_templates = source_column(Page, 'template')
+    template_column = qn(TemplateSection._meta.get_field('template').column)
+    pk = f'src.{qn(model._meta.pk.column)}'
+    if model is Section:
+        used = (
+            f'({pk} IN ({source_column(PageSection, "section")}) OR {pk} IN '
+            f'({source_column(TemplateSection, "section")} WHERE {template_column} IN ({page_templates})))'
+        )
+    elif model is Template:
+        used = f'{pk} IN ({page_templates})'
+    else:
+        used = f'src.{template_column} IN ({page_templates})'
+
+    columns, values, params = [], [], []
+    for field in model._meta.concrete_fields:
+        column = f'src.{qn(field.column)}'
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+            value = '%s'
+            params.append(field.get_db_prep_value(now, connection))
+        elif field.is_relation and _in_tenant_schema(field.related_model):
+            value = _match_natural_key(field.related_model, column, qn, source_schema, target_schema)
+        elif model is Template and field.name == 'is_default':
+            value = 'FALSE'
+        else:
+            value = column
+        columns.append(qn(field.column))
+        values.append(value)
+
+    sql = (
+        f'INSERT INTO {_table(model, target_schema, qn)} ({", ".join(columns)}) '
+        f'SELECT {", ".join(values)} FROM {_table(model, source_schema, qn)} src WHERE {used}'
+    )
+    natural_key = natural_keys().get(model._meta.label)
+    if natural_key:
+        key = qn(model._meta.get_field(natural_key).column)
+        sql += f' AND NOT EXISTS (SELECT 1 FROM {_table(model, target_schema, qn)} dst WHERE dst.{key} = src.{key})'
+    # Template sections the target template already has, or a key taken by another row
+    return sql + ' ON CONFLICT DO NOTHING', params
+
+
+def missing_shared_rows(connection, source, target):
+    """
+    Schema tenancy: natural keys of the sections/templates the source site
+    references that have no match in the target schema, per model label.
+    """
+    qn = connection.ops.quote_name
+    source_schema, target_schema = get_tenant_schema_name(source), get_tenant_schema_name(target)
+    missing = {}
+    with connection.cursor() as cursor:
+        for model in clone_models():
+            for field in model._meta.concrete_fields:
+                if not (field.is_relation and _in_tenant_schema(field.related_model)):
+                    continue
+                related = field.related_model
+                key = qn(related._meta.get_field(natural_keys()[related._meta.label]).column)
+                cursor.execute(
+                    f'SELECT DISTINCT rel.{key} FROM {_table(model, source_schema, qn)} src '
+                    f'JOIN {_table(related, source_schema, qn)} rel '
+                    f'ON rel.{qn(related._meta.pk.column)} = src.{qn(field.column)} '
+                    f'WHERE NOT EXISTS (SELECT 1 FROM {_table(related, target_schema, qn)} dst '
+                    f'WHERE dst.{key} = rel.{key})'
+                )
+                keys = [row[0] for row in cursor.fetchall()]
+                if keys:
+                    missing.setdefault(related._meta.label, []).extend(keys)
+    return missing
+
+
+def clone_site(source, target):
+    """
+    Replace `target`'s site content with a copy of `source`'s. Returns
+    {'rows': {model label: rows copied}, 'seconds': ..., 'rows_per_second': ...}.
+    """
+    from apps.pages.models import Page
+
+    check_tenancy()  # Without tenancy, "the target's pages" would be every page
+    shard = get_tenant_shard(source)
+    if get_tenant_shard(target) != shard:
+        raise ValueError(f'Cannot clone across shards ({shard} -> {get_tenant_shard(target)})')
+    check_writes_allowed(target.pk)
+    connection = connections[shard]
+    now = timezone.now()
+    rows = {}
+
+    started = time.perf_counter()
+    with tenant_scope(target), transaction.atomic(using=shard):
+        # A retried job starts over: drop what an earlier attempt copied
+        for model in reversed(clone_models()):
+            model.objects.all().delete()
+        with connection.cursor() as cursor:
+            if is_schema_tenancy():
+                for model in shared_models():
+                    cursor.execute(*copy_shared_sql(model, connection, source, target, now))
+                    rows[model._meta.label] = cursor.rowcount
+                missing = missing_shared_rows(connection, source, target)
+                if missing:
+                    raise ValueError('Cannot clone: the target schema has no match for ' + '; '.join(
+                        f'{label} {", ".join(sorted(keys))}' for label, keys in sorted(missing.items())
+                    ))
+            for model in clone_models():
+                cursor.execute(*copy_table_sql(model, connection, source, target, now))
+                rows[model._meta.label] = cursor.rowcount
+        # A move froze the target while copying: roll back rather than write behind it
+        check_writes_allowed(target.pk)
+        # Raw SQL sends no signals
+        tenant_cache.for_namespace(current_namespace()).invalidate()
+        platform_stats.adjust(
+            **platform_stats.count_content([Page.objects.all()]),
+            sections=rows.get('sections.Section', 0),
+            templates=rows.get('templates.Template', 0),
+        )
+    seconds = time.perf_counter() - started
+
+    total = sum(rows.values())
+    return {
+        'rows': rows,
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(total / seconds) if seconds else total,
+    }
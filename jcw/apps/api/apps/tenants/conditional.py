@@ -0,0 +1,118 @@
+"""
+Conditional GET support (ETag / Last-Modified) for public tenant endpoints.
+
+Validators are computed from a few indexed lookups - the tenant's updated_at,
+its latest routing change (domains/slug/active) and the theme's updated_at -
+so a 304 is answered without loading or serializing the tenant. The website
+endpoint uses its snapshot version instead, which also covers page changes.
+"""
+import hashlib
+
+from django.db.models import Max
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from .models import RoutingChange, Tenant
+from .negative_cache import unknown_slugs
+from .snapshots import get_fresh_snapshot
+
+
+def _tenant_versions(request, slug, active_only):
+    """
+    Return (tenant_id, updated_at, domain_version, domain_changed_at,
+    theme_updated_at) or None.
+    Memoized on the request because both ETag and Last-Modified need it.
+    """
+    memo = request.__dict__.setdefault('_tenant_versions', {})
+    if slug in memo:
+        return memo[slug]
+
+    versions = None
+    if not unknown_slugs.contains(slug):
+        row = Tenant.objects.filter(slug=slug).values('id', 'updated_at', 'is_active').first()
+        if row is not None and (row['is_active'] or not active_only):
+            versions = (
+                row['id'],
+                row['updated_at'],
+                *_domain_version(row['id']),
+                _theme_updated_at(Tenant(pk=row['id'], slug=slug)),
+            )
+    memo[slug] = versions
+    return versions
+
+
+def _domain_version(tenant_id):
+    """
+    (latest routing change id, its time): domain changes move both validators.
+    """
+    latest = RoutingChange.objects.filter(tenant_id=tenant_id).aggregate(
+        version=Max('id'), changed_at=Max('created_at'),
+    )
+    return latest['version'] or 0, latest['changed_at']
+
+
+def _theme_updated_at(tenant):
+    from apps.core.utils import tenant_scope
+    from apps.themes.models import SiteTheme
+
+    with tenant_scope(tenant):
+        return SiteTheme.objects.aggregate(updated_at=Max('updated_at'))['updated_at']
+
+
+def tenant_conditional(resource, active_only=False):
+    """
+    Decorator adding strong ETags, Last-Modified and revalidation headers to a
+    view that takes a tenant `slug` kwarg. `resource` namespaces the ETag so
+    endpoints with different bodies never share one.
+    """
+    def etag(request, *args, slug=None, **kwargs):
+        versions = _tenant_versions(request, slug, active_only)
+        if versions is None:
+            return None
+        tenant_id, updated_at, domain_version, _, theme_updated_at = versions
+        raw = f'{resource}:{tenant_id}:{updated_at.isoformat()}:{domain_version}:'
+        raw += theme_updated_at.isoformat() if theme_updated_at else '-'
+        return '"%s"' % hashlib.sha1(raw.encode()).hexdigest()
+
+    def last_modified(request, *args, slug=None, **kwargs):
+        versions = _tenant_versions(request, slug, active_only)
+        if versions is None:
+            return None
+        return max(timestamp for timestamp in (versions[1], versions[3], versions[4]) if timestamp)
+
+    def decorator(view_func):
+        view = condition(etag_func=etag, last_modified_func=last_modified)(view_func)
+        # Clients may reuse the body but must revalidate; revalidation is a cheap 304
+        return cache_control(public=True, max_age=0, must_revalidate=True)(view)
+    return decorator
+
+
+def get_request_snapshot(request, slug):
+    """
+    Fresh website snapshot for the slug, fetched once per request.
+    """
+    request = getattr(request, '_request', request)  # Unwrap DRF requests
+    memo = request.__dict__.setdefault('_website_snapshots', {})
+    if slug not in memo:
+        memo[slug] = None if unknown_slugs.contains(slug) else get_fresh_snapshot(slug)
+        if memo[slug] is None:
+            unknown_slugs.add(slug)
+    return memo[slug]
+
+
+def _snapshot_etag(request, *args, slug=None, **kwargs):
+    snapshot = get_request_snapshot(request, slug)
+    return f'"{snapshot.tenant_id}-{snapshot.version}"' if snapshot else None
+
+
+def _snapshot_last_modified(request, *args, slug=None, **kwargs):
+    snapshot = get_request_snapshot(request, slug)
+    return snapshot.built_at if snapshot else None
+
+
+def website_conditional(view_func):
+    """
+    Conditional responses for views serving a tenant's website snapshot.
+    """
+    view = condition(etag_func=_snapshot_etag, last_modified_func=_snapshot_last_modified)(view_func)
+    return cache_control(public=True, max_age=0, must_revalidate=True)(view)
@@ -0,0 +1,263 @@
+"""
+Background tenant jobs.
+
+Slow tenant work (creating and migrating a schema, purging a deleted
+tenant, ...) is queued as a
+TenantJob and run by `manage.py run_tenant_jobs`. Workers claim jobs with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of them can poll the same
+table. A failed job goes back to pending with an exponential backoff until
+max_attempts; handlers are written to be safely re-run from the start.
+"""
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from apps.core.utils import get_tenant_schema_name, is_schema_tenancy
+
+from . import platform_stats
+from .models import Tenant, TenantJob
+from .cloning import clone_site
+from .publishing import publish_tenant
+from .provisioning import bootstrap_site, build_schema, migrate_schema, schema_exists, seed_tenant_content
+from .purging import delete_tenant_rows, drop_schema_tables
+from .schema_pool import claim_schema, get_pool_size
+from .sharding import check_writes_allowed, get_tenant_shard
+from .snapshots import rebuild_snapshot
+
+
+def enqueue_job(tenant, kind, payload=None):
+    return TenantJob.objects.create(tenant=tenant, kind=kind, payload=payload or {})
+
+
+def enqueue_publish(tenant_id):
+    """
+    Queue a static publish of the tenant's site, unless one is already
+    waiting or the tenant is inactive. It runs PUBLISH_DELAY seconds after
+    the first change, so a burst of page edits is published once. Returns
+    the new job, or None.
+    """
+    if TenantJob.objects.filter(tenant_id=tenant_id, kind='publish', status='pending').exists():
+        return None
+    if not Tenant.objects.filter(pk=tenant_id, is_active=True, deleted_at__isnull=True).exists():
+        return None
+    return TenantJob.objects.create(
+        tenant_id=tenant_id,
+        kind='publish',
+        run_after=timezone.now() + timedelta(seconds=getattr(settings, 'PUBLISH_DELAY', 5)),
+    )
+
+
+def report_progress(job, step, progress):
+    job.step = step
+    job.progress = progress
+    job.locked_at = timezone.now()  # A job reporting progress is not stale
+    job.save(update_fields=['step', 'progress', 'locked_at', 'updated_at'])
+
+
+def start_job(job):
+    job.status = 'running'
+    job.attempts += 1
+    job.locked_at = timezone.now()
+    job.error = ''
+    job.save(update_fields=['status', 'attempts', 'locked_at', 'error', 'updated_at'])
+
+
+def claim_next_job(kinds=None):
+    """
+    Mark the oldest due pending job as running and return it, or None.
+    """
+    with transaction.atomic():
+        queryset = TenantJob.objects.select_for_update(skip_locked=True).filter(
+            status='pending', run_after__lte=timezone.now(),
+        )
+        if kinds:
+            queryset = queryset.filter(kind__in=kinds)
+        job = queryset.order_by('run_after', 'created_at').first()
+        if job is not None:
+            start_job(job)
+    return job
+
+
+def claim_job(job_id):
+    """
+    Claim a specific pending job (ignoring run_after). Returns the job, or
+    None when another worker has it or it already finished.
+    """
+    claimed = TenantJob.objects.filter(pk=job_id, status='pending').update(
+        status='running', attempts=F('attempts') + 1, locked_at=timezone.now(), error='', updated_at=timezone.now(),
+    )
+    if not claimed:
+        return None
+    return TenantJob.objects.select_related('tenant').get(pk=job_id)
+
+
+def run_job(job):
+    """
+    Run a claimed job; on failure schedule a retry or mark it failed.
+    """
+    try:
+        JOB_HANDLERS[job.kind](job)
+    except Exception:
+        job.error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = 'failed'
+            job.finished_at = timezone.now()
+        else:
+            job.status = 'pending'
+            delay = getattr(settings, 'TENANT_JOB_RETRY_DELAY', 30) * 2 ** (job.attempts - 1)
+            job.run_after = timezone.now() + timedelta(seconds=delay)
+        job.locked_at = None
+        job.save(update_fields=['error', 'status', 'finished_at', 'run_after', 'locked_at', 'updated_at'])
+        return job
+
+    job.status = 'succeeded'
+    job.step = 'done'
+    job.progress = 100
+    job.locked_at = None
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'step', 'progress', 'locked_at', 'finished_at', 'updated_at'])
+    return job
+
+
+def release_stale_jobs(timeout):
+    """
+    Requeue running jobs whose worker died (locked longer than `timeout` seconds).
+    """
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    stale = TenantJob.objects.filter(status='running', locked_at__lt=cutoff)
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', locked_at=None, finished_at=timezone.now(), error='Worker stopped responding',
+    )
+    requeued = stale.update(status='pending', locked_at=None, run_after=timezone.now())
+    return requeued, failed
+
+
+def job_stats():
+    return dict(TenantJob.objects.order_by().values_list('status').annotate(count=Count('id')))
+
+
+# Handlers
+
+def build_tenant_schema(job, tenant):
+    """
+    Schema tenancy only: claim a ready schema from the warm pool, else clone
+    or migrate one. Brings an existing schema (a retried job) up to date.
+    """
+    schema_name = get_tenant_schema_name(tenant)
+    shard = get_tenant_shard(tenant)
+
+    report_progress(job, 'schema', 10)
+    if schema_exists(schema_name, shard):
+        # Retry after a failure further on: bring it up to date
+        migrate_schema(schema_name, shard)
+    elif not (get_pool_size() and claim_schema(schema_name, shard)):
+        report_progress(job, 'migrate', 30)
+        build_schema(schema_name, shard)
+
+
+def activate_tenant(tenant):
+    # Either way the public snapshot is built now, so the first visitor is served from it
+    if not tenant.is_active:
+        tenant.is_active = True
+        tenant.save(update_fields=['is_active', 'updated_at'])  # Signals rebuild the snapshot
+    else:
+        rebuild_snapshot(tenant)
+
+
+def provision_tenant(job):
+    """
+    Build the tenant's schema (schema tenancy only), seed starter content,
+    bootstrap the home page from the default template, activate the tenant
+    and warm its website snapshot. Every step is a no-op when already done.
+    """
+    tenant = job.tenant
+    if is_schema_tenancy():
+        build_tenant_schema(job, tenant)
+
+    if getattr(settings, 'TENANT_SEED_CONTENT', False):
+        report_progress(job, 'seed', 70)
+        seed_tenant_content(tenant)
+
+    if getattr(settings, 'TENANT_BOOTSTRAP_SITE', False):
+        report_progress(job, 'bootstrap', 80)
+        bootstrap_site(tenant)
+
+    report_progress(job, 'activate', 90)
+    activate_tenant(tenant)
+
+
+def clone_tenant(job):
+    """
+    Build the new tenant's schema like provisioning, then copy the site of
+    the tenant in payload['source'] with set-based SQL and activate it.
+    Copy statistics (rows per model, rows per second) go to payload['stats'].
+    """
+    tenant = job.tenant
+    source = Tenant.objects.get(pk=job.payload['source'])
+    if is_schema_tenancy():
+        build_tenant_schema(job, tenant)
+
+    report_progress(job, 'copy', 50)
+    job.payload['stats'] = clone_site(source, tenant)
+    job.save(update_fields=['payload', 'updated_at'])
+
+    report_progress(job, 'activate', 90)
+    activate_tenant(tenant)
+
+
+def purge_tenant(job):
+    """
+    Remove a soft-deleted tenant's data in bounded, paced steps, then the
+    tenant row itself. Nothing to do when an earlier attempt got that far.
+    """
+    tenant = job.tenant
+    if tenant is None or tenant.deleted_at is None or tenant.is_active:
+        return  # Already purged, or restored (or reactivated) since the delete
+    check_writes_allowed(tenant.pk)
+    shard = get_tenant_shard(tenant)  # Not the payload's: the tenant may have moved since the delete
+    if is_schema_tenancy():
+        if not job.payload.get('uncounted') and schema_exists(job.payload['schema_name'], shard):
+            # Dropped tables send no delete signals: take the content off the platform stats first, once
+            platform_stats.adjust(**{
+                counter: -count for counter, count in platform_stats.tenant_content_counts(tenant).items()
+            })
+            job.payload['uncounted'] = True
+            job.save(update_fields=['payload', 'updated_at'])
+        steps = drop_schema_tables(job.payload['schema_name'], shard)
+    else:
+        steps = delete_tenant_rows(tenant)
+    pause = getattr(settings, 'TENANT_PURGE_PAUSE', 0.5)
+    for done, total in steps:
+        report_progress(job, 'purge', 90 * done // total)
+        time.sleep(pause)  # Leave the database to live traffic in between
+        check_writes_allowed(tenant.pk)  # Don't purge behind a shard move; the job retries later
+
+    report_progress(job, 'delete', 95)
+    tenant.delete()
+    job.tenant = None  # The delete set the column to NULL; drop the deleted instance too
+
+
+def publish_site(job):
+    """
+    Re-render the tenant's static site; a no-op when the live release
+    already matches its snapshot.
+    """
+    tenant = job.tenant
+    if tenant is None or not tenant.is_active or tenant.deleted_at is not None:
+        return
+    report_progress(job, 'render', 10)
+    job.payload['release'], job.payload['changed'] = publish_tenant(tenant)
+    job.save(update_fields=['payload', 'updated_at'])
+
+
+JOB_HANDLERS = {
+    'provision': provision_tenant,
+    'purge': purge_tenant,
+    'clone': clone_tenant,
+    'publish': publish_site,
+}
@@ -0,0 +1,60 @@
+"""
+Management command to compare cloning the golden schema against migrate_schemas
+"""
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.benchmarks import percentiles, write_report
+from apps.core.utils import is_schema_tenancy
+from apps.tenants.provisioning import (
+    clone_schema, drop_schema, get_golden_schema_name, golden_is_current, migrate_schema, schema_exists,
+)
+
+
+class Command(BaseCommand):
+    help = 'Time provisioning of throwaway schemas by golden schema clone and by migrate_schemas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--samples', type=int, default=10, help='Schemas provisioned per method')
+        parser.add_argument('--prefix', default='_bench_provision', help='Prefix of the throwaway schemas')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        if not is_schema_tenancy():
+            raise CommandError('Schema provisioning benchmarks require schema tenancy (PostgreSQL)')
+        if not golden_is_current():
+            raise CommandError('The golden schema is missing or outdated; run refresh_golden_schema first')
+
+        golden = get_golden_schema_name()
+        methods = {
+            'clone': lambda schema: clone_schema(golden, schema),
+            'migrate': migrate_schema,
+        }
+        report = {'samples': options['samples']}
+        for method, provision in methods.items():
+            samples = []
+            for index in range(options['samples']):
+                schema = f"{options['prefix']}_{method}_{index}"
+                if schema_exists(schema):
+                    raise CommandError(f'Schema "{schema}" already exists; drop it first')
+                try:
+                    started = time.perf_counter()
+                    provision(schema)
+                    samples.append(time.perf_counter() - started)
+                finally:
+                    drop_schema(schema)
+            report[method] = percentiles(samples)
+            self.stdout.write(
+                f"{method}: mean {report[method]['mean_ms']}ms, p50 {report[method]['p50_ms']}ms, "
+                f"p95 {report[method]['p95_ms']}ms"
+            )
+
+        if report['clone']['mean_ms']:
+            report['speedup'] = round(report['migrate']['mean_ms'] / report['clone']['mean_ms'], 2)
+            self.stdout.write(f"Clone is {report['speedup']}x faster than migrate_schemas")
+        if options['output']:
+            write_report(options['output'], report)
+            self.stdout.write(f"Report written to {options['output']}")
+        self.stdout.write(json.dumps(report, indent=2))
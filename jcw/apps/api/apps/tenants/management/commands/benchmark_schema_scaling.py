@@ -0,0 +1,210 @@
+"""
+Management command to benchmark how schema-per-tenant scales with the tenant count
+"""
+import json
+import random
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from apps.core.benchmarks import percentiles, timed, write_report
+from apps.core.utils import get_tenant_schema_name, is_schema_tenancy
+from apps.tenants.jobs import enqueue_job, run_job, start_job
+from apps.tenants.models import Domain, Tenant
+from apps.tenants.provisioning import drop_schema, migrate_schema
+from apps.tenants.resolver import tenant_resolver
+from apps.tenants.sharding import get_tenant_shard
+
+
+# name -> (path, tenant host?, authenticated?); {slug} is a random benchmark tenant
+ENDPOINTS = {
+    'website': ('/api/websites/{slug}/', False, False),
+    'tenant_by_slug': ('/api/tenants/by-slug/{slug}/', False, False),
+    'tenant_api_root': ('/api/', True, False),
+    'pages': ('/api/pages/', True, True),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Provision real tenants (the provisioning job, actual apps.* models) in steps up to each '
+        '--sizes count and measure, at every step: provisioning time, per-schema migrate_schemas time, '
+        'hostname resolution, search_path switch cost and latency of the main endpoints. '
+        'Writes JSON for regression tracking. Run it against a scratch database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 5000],
+                          help='Tenant counts to measure at')
+        parser.add_argument('--samples', type=int, default=200, help='Samples per latency measurement')
+        parser.add_argument('--migrate-samples', type=int, default=20,
+                          help='Schemas re-migrated per step; the full migrate time is extrapolated')
+        parser.add_argument('--prefix', default='bench', help='Slug prefix of the benchmark tenants')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+        parser.add_argument('--keep', action='store_true', help='Keep the benchmark tenants and schemas')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql' or not is_schema_tenancy():
+            raise CommandError('The scaling benchmark requires PostgreSQL with schema tenancy')
+        self.options = options
+        self.prefix = f'{options["prefix"]}-'
+        if Tenant.objects.filter(slug__startswith=self.prefix).exists():
+            raise CommandError(f'Tenants starting with "{self.prefix}" already exist; remove them first')
+
+        self.suffix = getattr(settings, 'TENANT_SUBDOMAIN_SUFFIX', '.lvh.me')
+        self.user, _ = get_user_model().objects.get_or_create(
+            username=f'{options["prefix"]}-user', defaults={'email': 'bench@example.com'},
+        )
+        self.tenants = []
+        report = {
+            'options': {key: options[key] for key in ('sizes', 'samples', 'migrate_samples')},
+            'settings': {
+                'provision_method': getattr(settings, 'TENANT_PROVISION_METHOD', 'migrate'),
+                'schema_pool_size': getattr(settings, 'TENANT_SCHEMA_POOL_SIZE', 0),
+                'slim_schemas': getattr(settings, 'TENANT_SLIM_SCHEMAS', False),
+            },
+            'sizes': {},
+        }
+        try:
+            with override_settings(ALLOWED_HOSTS=['*']):
+                for size in sorted(set(options['sizes'])):
+                    self.stdout.write(f'{size} tenants...')
+                    result = {'tenants': size}
+                    result.update(self.provision(size - len(self.tenants)))
+                    result['migrate_schemas'] = self.measure_migrate()
+                    result['resolution'] = self.measure_resolution()
+                    result['search_path'] = self.measure_search_path()
+                    result['endpoints'] = self.measure_endpoints()
+                    report['sizes'][str(size)] = result
+                    self.stdout.write(self.format_result(result))
+        finally:
+            connection.set_schema_to_public()
+            if not options['keep']:
+                self.cleanup()
+
+        if options['output']:
+            write_report(options['output'], report)
+            self.stdout.write(f"Report written to {options['output']}")
+        self.stdout.write(self.style.SUCCESS('Benchmark complete'))
+        self.stdout.write(json.dumps(report, indent=2, default=str))
+
+    # Steps
+
+    def provision(self, count):
+        """
+        Create `count` more tenants and run their provisioning jobs inline.
+        """
+        samples, result = [], {}
+        with timed(result, 'provision_seconds'):
+            for _ in range(count):
+                index = len(self.tenants)
+                tenant = Tenant.objects.create(
+                    slug=f'{self.prefix}{index:05d}', business_name=f'Bench {index}',
+                    contact_email='bench@example.com', is_active=False,
+                )
+                Domain.objects.create(domain=f'{tenant.slug}{self.suffix}', tenant=tenant, is_primary=True)
+                job = enqueue_job(tenant, 'provision')
+                started = time.perf_counter()
+                start_job(job)
+                run_job(job)
+                samples.append(time.perf_counter() - started)
+                if job.status != 'succeeded':
+                    raise CommandError(f'Provisioning {tenant.slug} failed:\n{job.error}')
+                self.tenants.append(tenant)
+        result['provision'] = percentiles(samples)
+        return result
+
+    def measure_migrate(self):
+        """
+        migrate_schemas on already migrated schemas: the fixed per-schema
+        cost every deploy pays for every tenant.
+        """
+        sample = random.sample(self.tenants, min(len(self.tenants), self.options['migrate_samples']))
+        samples = []
+        for tenant in sample:
+            started = time.perf_counter()
+            migrate_schema(get_tenant_schema_name(tenant), get_tenant_shard(tenant))
+            samples.append(time.perf_counter() - started)
+        result = percentiles(samples)
+        if samples:
+            result['estimated_total_seconds'] = round(sum(samples) / len(samples) * len(self.tenants), 1)
+        return result
+
+    def measure_resolution(self):
+        cold, warm = [], []
+        for _ in range(self.options['samples']):
+            hostname = f'{random.choice(self.tenants).slug}{self.suffix}'
+            tenant_resolver.invalidate()
+            started = time.perf_counter()
+            tenant_resolver.resolve(hostname)
+            cold.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            tenant_resolver.resolve(hostname)
+            warm.append(time.perf_counter() - started)
+        return {'cold': percentiles(cold), 'warm': percentiles(warm)}
+
+    def measure_search_path(self):
+        """
+        A trivial query with and without switching to another tenant first.
+        """
+        baseline, switched = [], []
+        with connection.cursor() as cursor:
+            for _ in range(self.options['samples']):
+                started = time.perf_counter()
+                cursor.execute('SELECT 1')
+                baseline.append(time.perf_counter() - started)
+        for _ in range(self.options['samples']):
+            tenant = random.choice(self.tenants)
+            tenant.schema_name = get_tenant_schema_name(tenant)
+            started = time.perf_counter()
+            connection.set_tenant(tenant)
+            with connection.cursor() as cursor:  # SET search_path happens here
+                cursor.execute('SELECT 1')
+            switched.append(time.perf_counter() - started)
+        connection.set_schema_to_public()
+        return {'baseline': percentiles(baseline), 'switch': percentiles(switched)}
+
+    def measure_endpoints(self):
+        client = APIClient()
+        results = {}
+        for name, (path, tenant_host, authenticated) in ENDPOINTS.items():
+            client.force_authenticate(self.user if authenticated else None)
+            samples, errors = [], 0
+            for _ in range(self.options['samples']):
+                slug = random.choice(self.tenants).slug
+                host = f'{slug}{self.suffix}' if tenant_host else 'localhost'
+                started = time.perf_counter()
+                response = client.get(path.format(slug=slug), HTTP_HOST=host)
+                samples.append(time.perf_counter() - started)
+                errors += response.status_code >= 400
+            connection.set_schema_to_public()
+            results[name] = {**percentiles(samples), 'errors': errors}
+        return results
+
+    # Output and cleanup
+
+    def format_result(self, result):
+        endpoints = ', '.join(
+            f"{name} p50 {stats.get('p50_ms')}ms p99 {stats.get('p99_ms')}ms"
+            for name, stats in result['endpoints'].items()
+        )
+        return (
+            f"  provision p50 {result['provision'].get('p50_ms')}ms, "
+            f"migrate/schema p50 {result['migrate_schemas'].get('p50_ms')}ms "
+            f"(all: ~{result['migrate_schemas'].get('estimated_total_seconds')}s), "
+            f"resolve cold p99 {result['resolution']['cold'].get('p99_ms')}ms, "
+            f"search_path switch p50 {result['search_path']['switch'].get('p50_ms')}ms\n"
+            f'  {endpoints}'
+        )
+
+    def cleanup(self):
+        self.stdout.write('Dropping benchmark tenants...')
+        for tenant in Tenant.objects.filter(slug__startswith=self.prefix).iterator():
+            drop_schema(get_tenant_schema_name(tenant), get_tenant_shard(tenant))
+        Tenant.objects.filter(slug__startswith=self.prefix).delete()
+        self.user.delete()
@@ -0,0 +1,244 @@
+"""
+Management command to benchmark schema-per-tenant against row-level tenancy
+"""
+import json
+import random
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.core.benchmarks import percentiles, timed, write_report
+
+
+# Representative layout of the tenant-scoped tables (theme, pages, page
+# sections, activity). {tenant} becomes a leading tenant_id column in row
+# mode and disappears in schema mode, as do the tenant-leading index columns.
+TABLES = [
+    ('theme', 'id uuid PRIMARY KEY, {tenant}primary_color varchar(7) NOT NULL, '
+              'custom_css text NOT NULL, theme_options jsonb NOT NULL, updated_at timestamptz NOT NULL'),
+    ('page', 'id uuid PRIMARY KEY, {tenant}slug varchar(50) NOT NULL, title varchar(100) NOT NULL, '
+             'status varchar(20) NOT NULL, updated_at timestamptz NOT NULL'),
+    ('page_section', 'id uuid PRIMARY KEY, {tenant}page_id uuid NOT NULL REFERENCES {schema}.page (id) '
+                     'ON DELETE CASCADE, order_index integer NOT NULL, props_data jsonb NOT NULL'),
+    ('activity', 'id uuid PRIMARY KEY, {tenant}action_type varchar(20) NOT NULL, '
+                 'description text NOT NULL, created_at timestamptz NOT NULL'),
+]
+INDEXES = [
+    ('theme', 'UNIQUE', '{tenant}'),
+    ('page', 'UNIQUE', '{tenant}slug'),
+    ('page', '', '{tenant}status'),
+    ('page_section', 'UNIQUE', 'page_id, order_index'),
+    ('page_section', '', '{tenant}page_id'),
+    ('activity', '', '{tenant}created_at DESC'),
+]
+CATALOG_TABLES = ['pg_class', 'pg_attribute', 'pg_index', 'pg_depend', 'pg_type', 'pg_constraint']
+
+READ_SQL = (
+    'SELECT p.title, s.order_index, s.props_data FROM {prefix}page p '
+    'JOIN {prefix}page_section s ON s.page_id = p.id '
+    "WHERE {tenant_filter}p.slug = 'home' ORDER BY s.order_index"
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare schema-per-tenant and row-level tenancy layouts at several tenant counts: '
+        'provisioning time, catalog growth, read latency and DDL (migration) time. '
+        'Creates and drops many schemas - run it against a scratch database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000],
+                          help='Tenant counts to benchmark')
+        parser.add_argument('--modes', nargs='+', choices=['row', 'schema'], default=['row', 'schema'],
+                          help='Layouts to benchmark')
+        parser.add_argument('--pages', type=int, default=3, help='Pages per tenant')
+        parser.add_argument('--sections', type=int, default=4, help='Sections per page')
+        parser.add_argument('--samples', type=int, default=500, help='Read queries per measurement')
+        parser.add_argument('--prefix', default='bench', help='Prefix of the scratch schemas')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+        parser.add_argument('--keep', action='store_true', help='Keep the scratch schemas of the last run')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('The tenancy benchmark requires PostgreSQL')
+
+        self.options = options
+        self.prefix = options['prefix']
+        # A dedicated autocommit connection: search_path changes here must not
+        # leak into Django's (possibly pooled) connections
+        params = connection.get_connection_params()
+        self.conn = connection.Database.connect(**params)
+        self.conn.autocommit = True
+
+        report = {'options': {key: options[key] for key in ('sizes', 'modes', 'pages', 'sections', 'samples')}}
+        try:
+            if self.scratch_schemas():
+                raise CommandError(f'Schemas starting with "{self.prefix}_" already exist; drop them first')
+            for size in options['sizes']:
+                report[str(size)] = {}
+                for mode in options['modes']:
+                    self.stdout.write(f'{mode} layout, {size} tenants...')
+                    result = self.run_mode(mode, size)
+                    report[str(size)][mode] = result
+                    self.stdout.write(self.format_result(result))
+                    last = size == options['sizes'][-1] and mode == options['modes'][-1]
+                    if not (options['keep'] and last):
+                        self.cleanup()
+        finally:
+            self.conn.close()
+
+        if options['output']:
+            write_report(options['output'], report)
+            self.stdout.write(f"Report written to {options['output']}")
+        self.stdout.write(self.style.SUCCESS('Benchmark complete'))
+        self.stdout.write(json.dumps(report, indent=2, default=str))
+
+    # Layout
+
+    def run_sql(self, sql, params=None):
+        with self.conn.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def create_layout(self, schema, row_mode):
+        tenant = 'tenant_id integer NOT NULL, ' if row_mode else ''
+        self.run_sql(f'CREATE SCHEMA {schema}')
+        for table, columns in TABLES:
+            self.run_sql(f'CREATE TABLE {schema}.{table} ({columns.format(tenant=tenant, schema=schema)})')
+        for table, kind, columns in INDEXES:
+            columns = columns.format(tenant='tenant_id, ' if row_mode else '').rstrip(', ')
+            if columns:
+                self.run_sql(f'CREATE {kind} INDEX ON {schema}.{table} ({columns})')
+
+    def seed_rows(self, schema, tenant_ids):
+        """
+        Insert the content of the given tenants; tenant_ids is None in schema mode.
+        """
+        pages_per_tenant, sections_per_page = self.options['pages'], self.options['sections']
+        themes, pages, sections, activity = [], [], [], []
+        for tenant_id in tenant_ids or [None]:
+            tenant = (tenant_id,) if tenant_id is not None else ()
+            themes.append((uuid.uuid4(), *tenant, '#3b82f6', '', '{}'))
+            for index in range(pages_per_tenant):
+                page_id = uuid.uuid4()
+                slug = 'home' if index == 0 else f'page-{index}'
+                pages.append((page_id, *tenant, slug, slug.title(), 'published'))
+                for order_index in range(sections_per_page):
+                    sections.append((uuid.uuid4(), *tenant, page_id, order_index, '{"title": "Section"}'))
+            for _ in range(pages_per_tenant):
+                activity.append((uuid.uuid4(), *tenant, 'update', 'Updated page'))
+
+        tenant_column = 'tenant_id, ' if tenant_ids else ''
+        tenant_param = '%s, ' if tenant_ids else ''
+        with self.conn.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {schema}.theme (id, {tenant_column}primary_color, custom_css, theme_options, updated_at) '
+                f'VALUES (%s, {tenant_param}%s, %s, %s, now())', themes)
+            cursor.executemany(
+                f'INSERT INTO {schema}.page (id, {tenant_column}slug, title, status, updated_at) '
+                f'VALUES (%s, {tenant_param}%s, %s, %s, now())', pages)
+            cursor.executemany(
+                f'INSERT INTO {schema}.page_section (id, {tenant_column}page_id, order_index, props_data) '
+                f'VALUES (%s, {tenant_param}%s, %s, %s)', sections)
+            cursor.executemany(
+                f'INSERT INTO {schema}.activity (id, {tenant_column}action_type, description, created_at) '
+                f'VALUES (%s, {tenant_param}%s, %s, now())', activity)
+
+    def tenant_schema(self, index):
+        return f'{self.prefix}_t_{index:06d}'
+
+    # Measurements
+
+    def run_mode(self, mode, size):
+        result = {}
+        catalog_before = self.catalog_bytes()
+        row_schema = f'{self.prefix}_row'
+
+        with timed(result, 'provision_seconds'):
+            if mode == 'row':
+                self.create_layout(row_schema, row_mode=True)
+                batch = 1000
+                for start in range(0, size, batch):
+                    self.seed_rows(row_schema, list(range(start, min(size, start + batch))))
+            else:
+                for index in range(size):
+                    schema = self.tenant_schema(index)
+                    self.create_layout(schema, row_mode=False)
+                    self.seed_rows(schema, None)
+        self.run_sql('ANALYZE')
+
+        result['relations'] = self.scratch_relation_count()
+        result['catalog_growth_bytes'] = self.catalog_bytes() - catalog_before
+        result['data_bytes'] = self.scratch_data_bytes()
+
+        samples = []
+        with self.conn.cursor() as cursor:
+            for _ in range(self.options['samples']):
+                tenant_index = random.randrange(size)
+                started = time.perf_counter()
+                if mode == 'row':
+                    cursor.execute(
+                        READ_SQL.format(prefix=f'{row_schema}.', tenant_filter='p.tenant_id = %s AND '),
+                        [tenant_index],
+                    )
+                else:
+                    # Schema mode pays a search_path switch per request
+                    cursor.execute(f'SET search_path = {self.tenant_schema(tenant_index)}')
+                    cursor.execute(READ_SQL.format(prefix='', tenant_filter=''))
+                cursor.fetchall()
+                samples.append(time.perf_counter() - started)
+            cursor.execute('SET search_path = public')
+        result['read'] = percentiles(samples)
+
+        with timed(result, 'ddl_seconds'):
+            schemas = [row_schema] if mode == 'row' else [self.tenant_schema(index) for index in range(size)]
+            for schema in schemas:
+                self.run_sql(f'ALTER TABLE {schema}.page ADD COLUMN bench_note text')
+        return result
+
+    def scratch_schemas(self):
+        with self.conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT nspname FROM pg_namespace WHERE nspname LIKE %s", [f'{self.prefix}\\_%']
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def scratch_relation_count(self):
+        with self.conn.cursor() as cursor:
+            cursor.execute(
+                'SELECT COUNT(*) FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace '
+                'WHERE n.nspname LIKE %s', [f'{self.prefix}\\_%']
+            )
+            return cursor.fetchone()[0]
+
+    def scratch_data_bytes(self):
+        with self.conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT COALESCE(SUM(pg_total_relation_size(c.oid)), 0) FROM pg_class c "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace WHERE n.nspname LIKE %s AND c.relkind = 'r'",
+                [f'{self.prefix}\\_%'],
+            )
+            return int(cursor.fetchone()[0])
+
+    def catalog_bytes(self):
+        sizes = ' + '.join(f"pg_total_relation_size('pg_catalog.{table}')" for table in CATALOG_TABLES)
+        with self.conn.cursor() as cursor:
+            cursor.execute(f'SELECT {sizes}')
+            return int(cursor.fetchone()[0])
+
+    def cleanup(self):
+        # One schema per statement: a single DROP of thousands of schemas
+        # would exhaust max_locks_per_transaction
+        for schema in self.scratch_schemas():
+            self.run_sql(f'DROP SCHEMA {schema} CASCADE')
+
+    def format_result(self, result):
+        read = result['read']
+        return (
+            f"  provision {result['provision_seconds']}s, relations {result['relations']}, "
+            f"catalog +{result['catalog_growth_bytes'] // 1024} KiB, data {result['data_bytes'] // 1024} KiB, "
+            f"read p50 {read.get('p50_ms')}ms p95 {read.get('p95_ms')}ms p99 {read.get('p99_ms')}ms, "
+            f"DDL {result['ddl_seconds']}s"
+        )
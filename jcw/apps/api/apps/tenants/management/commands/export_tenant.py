@@ -0,0 +1,41 @@
+"""
+Management command to export a tenant's content to a zip archive
+"""
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.tenants.archive import ArchiveError, iter_archive
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream a tenant\'s pages, sections, theme and activity (JSONL per model) plus referenced '
+        'media into a zip archive, for backups or for import_tenant in another environment.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('slug', help='Tenant to export')
+        parser.add_argument('-o', '--output', help='Archive path (default: <slug>-<date>.zip; "-" for stdout)')
+
+    def handle(self, *args, **options):
+        tenant = Tenant.objects.filter(slug=options['slug']).first()
+        if tenant is None:
+            raise CommandError(f'Tenant "{options["slug"]}" not found')
+        output = options['output'] or f'{tenant.slug}-{timezone.now():%Y%m%d-%H%M%S}.zip'
+
+        size = 0
+        archive_file = sys.stdout.buffer if output == '-' else open(output, 'wb')
+        try:
+            for chunk in iter_archive(tenant):
+                archive_file.write(chunk)
+                size += len(chunk)
+        except ArchiveError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if archive_file is not sys.stdout.buffer:
+                archive_file.close()
+        if output != '-':
+            self.stdout.write(self.style.SUCCESS(f'Exported {tenant.slug} to {output} ({size / 1024:.1f} KiB)'))
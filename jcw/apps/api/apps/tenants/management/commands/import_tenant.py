@@ -0,0 +1,37 @@
+"""
+Management command to import a tenant archive made by export_tenant
+"""
+import os
+import zipfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tenants.archive import ArchiveError, import_archive
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    help = (
+        'Replace a tenant\'s content with an export_tenant archive. The tenant must exist '
+        '(onboard or create it first when moving a site to another environment).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Archive made by export_tenant')
+        parser.add_argument('slug', help='Tenant to import into')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options['path']):
+            raise CommandError(f'File "{options["path"]}" not found')
+        tenant = Tenant.objects.filter(slug=options['slug']).first()
+        if tenant is None:
+            raise CommandError(f'Tenant "{options["slug"]}" not found')
+
+        try:
+            counts = import_archive(options['path'], tenant, batch_size=options['batch_size'])
+        except (ArchiveError, zipfile.BadZipFile) as exc:
+            raise CommandError(str(exc))
+        for label, count in counts.items():
+            self.stdout.write(f'  {label}: {count}')
+        self.stdout.write(self.style.SUCCESS(f'Imported {sum(counts.values())} rows into {tenant.slug}'))
@@ -0,0 +1,243 @@
+"""
+Management command to bulk import tenants from a CSV or JSONL file
+"""
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.cache import close_caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, close_old_connections, connections, transaction
+
+from apps.core.utils import ensure_unique_tenant_slug, generate_tenant_slug
+from apps.onboarding.serializers import OnboardingSerializer
+from apps.tenants import platform_stats
+from apps.tenants.jobs import claim_job, run_job
+from apps.tenants.models import Domain, Tenant, TenantJob
+from apps.tenants.negative_cache import unknown_hosts
+from apps.tenants.resolver import tenant_resolver
+from apps.tenants.sharding import choose_shards
+from apps.tenants.slug_index import SlugIndex
+
+
+TENANT_FIELDS = [
+    'business_name', 'contact_email', 'contact_phone', 'website_url',
+    'industry_category', 'city', 'country', 'plan', 'website_type',
+]
+
+
+def provision(job_id):
+    """
+    Run one provisioning job in a pool process.
+    """
+    close_old_connections()
+    job = claim_job(job_id)
+    if job is None:
+        status = TenantJob.objects.filter(pk=job_id).values_list('status', flat=True).first()
+        return job_id, status or 'missing', ''
+    run_job(job)
+    lines = job.error.strip().splitlines()
+    return job_id, job.status, lines[-1] if lines else ''
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk import tenants from CSV or JSONL (onboarding fields per row): slugs are allocated in memory, '
+        'tenants, domains and provisioning jobs are bulk inserted, and schemas are provisioned across a '
+        'process pool. Progress is saved to a checkpoint file; re-run the same command to resume.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV (with a header row) or JSONL file')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Input format (default: from the extension)')
+        parser.add_argument('--checkpoint', help='Checkpoint file (default: <path>.checkpoint.json)')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows per bulk insert')
+        parser.add_argument('--workers', type=int, default=4, help='Provisioning processes')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and show the slugs, write nothing')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'File "{path}" not found')
+        self.checkpoint_path = options['checkpoint'] or f'{path}.checkpoint.json'
+        self.checkpoint = self.load_checkpoint(path)
+
+        rows, errors = self.read_rows(path, options['format'] or os.path.splitext(path)[1].lstrip('.').lower())
+        for line, error in errors:
+            self.stdout.write(self.style.WARNING(f'  row {line}: {error}'))
+        pending = [(line, data) for line, data in rows if str(line) not in self.checkpoint['created']]
+        self.stdout.write(
+            f'{len(rows)} valid rows, {len(errors)} invalid, {len(rows) - len(pending)} already imported'
+        )
+
+        if options['dry_run']:
+            index = SlugIndex()
+            for line, data in pending:
+                self.stdout.write(f'  row {line}: {index.allocate(generate_tenant_slug(data["business_name"]))}')
+            return
+
+        started = time.perf_counter()
+        for start in range(0, len(pending), options['batch_size']):
+            self.create_batch(pending[start:start + options['batch_size']])
+            self.stdout.write(f'  created {min(start + options["batch_size"], len(pending))}/{len(pending)} tenants')
+        self.stdout.write(f'Created tenants in {time.perf_counter() - started:.1f}s')
+
+        self.provision_all(options['workers'])
+
+    # Input
+
+    def read_rows(self, path, file_format):
+        if file_format not in ('csv', 'jsonl'):
+            raise CommandError('Unknown input format; pass --format csv or --format jsonl')
+        rows, errors = [], []
+        with open(path, newline='', encoding='utf-8') as input_file:
+            if file_format == 'csv':
+                records = ((reader.line_num, record) for reader in [csv.DictReader(input_file)] for record in reader)
+            else:
+                records = (
+                    (line, self.parse_json(text)) for line, text in enumerate(input_file, start=1) if text.strip()
+                )
+            for line, record in records:
+                if record is None:
+                    errors.append((line, 'invalid JSON'))
+                    continue
+                serializer = OnboardingSerializer(data=record)
+                if serializer.is_valid():
+                    rows.append((line, serializer.validated_data))
+                else:
+                    errors.append((line, '; '.join(
+                        f'{field}: {" ".join(str(message) for message in messages)}'
+                        for field, messages in serializer.errors.items()
+                    )))
+        return rows, errors
+
+    def parse_json(self, text):
+        try:
+            return json.loads(text)
+        except ValueError:
+            return None
+
+    # Checkpoint
+
+    def load_checkpoint(self, path):
+        with open(path, 'rb') as input_file:
+            digest = hashlib.sha1(input_file.read()).hexdigest()
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+            if checkpoint.get('source') != digest:
+                raise CommandError(
+                    f'{self.checkpoint_path} belongs to a different version of the input; move it away to start over'
+                )
+            self.stdout.write(f'Resuming from {self.checkpoint_path}')
+            return checkpoint
+        return {'source': digest, 'created': {}, 'jobs': {}, 'finished': []}
+
+    def save_checkpoint(self):
+        # Write and rename, so an interrupted run never leaves a truncated file
+        temp_path = f'{self.checkpoint_path}.tmp'
+        with open(temp_path, 'w') as checkpoint_file:
+            json.dump(self.checkpoint, checkpoint_file)
+        os.replace(temp_path, self.checkpoint_path)
+
+    # Creation
+
+    def create_batch(self, batch):
+        suffix = getattr(settings, 'TENANT_SUBDOMAIN_SUFFIX', '.lvh.me')
+        index = SlugIndex()
+        tenants = [
+            Tenant(
+                slug=index.allocate(generate_tenant_slug(data['business_name'])),
+                is_active=False,  # Activated by provisioning
+                **{field: data.get(field) or Tenant._meta.get_field(field).get_default() for field in TENANT_FIELDS},
+            )
+            for _, data in batch
+        ]
+        for tenant, shard in zip(tenants, choose_shards(tenants)):
+            tenant.shard = shard
+
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    Tenant.objects.bulk_create(tenants)
+            except IntegrityError:
+                # A signup took one of the slugs meanwhile: insert this batch row by row
+                for (_, data), tenant in zip(batch, tenants):
+                    self.insert_with_free_slug(tenant, generate_tenant_slug(data['business_name']))
+            self.bulk_create_related(tenants, suffix)
+            # No signals from bulk_create: count the new tenants here, whichever way they were inserted
+            platform_stats.adjust(
+                tenants=len(tenants),
+                active_tenants=sum(1 for tenant in tenants if tenant.is_active),
+            )
+
+        # bulk_create sends no signals: forget cached misses for the new hosts
+        tenant_resolver.invalidate()
+        for tenant in tenants:
+            unknown_hosts.purge(f'{tenant.slug}{suffix}')
+
+        for (line, _), tenant in zip(batch, tenants):
+            self.checkpoint['created'][str(line)] = str(tenant.pk)
+            self.checkpoint['jobs'][str(tenant.pk)] = str(tenant.import_job_id)
+        self.save_checkpoint()
+
+    def insert_with_free_slug(self, tenant, base_slug, attempts=5):
+        """
+        Insert one prepared tenant (shard already chosen) under the first
+        free slug derived from base_slug, retrying when a signup takes it.
+        """
+        for attempt in range(attempts):
+            tenant.slug = ensure_unique_tenant_slug(base_slug)
+            try:
+                with transaction.atomic():
+                    Tenant.objects.bulk_create([tenant])
+                return
+            except IntegrityError:
+                if attempt == attempts - 1 or not Tenant.objects.filter(slug=tenant.slug).exists():
+                    raise
+
+    def bulk_create_related(self, tenants, suffix):
+        Domain.objects.bulk_create([
+            Domain(tenant=tenant, domain=f'{tenant.slug}{suffix}', is_primary=True) for tenant in tenants
+        ])
+        jobs = TenantJob.objects.bulk_create([TenantJob(tenant=tenant, kind='provision') for tenant in tenants])
+        for tenant, job in zip(tenants, jobs):
+            tenant.import_job_id = job.pk
+
+    # Provisioning
+
+    def provision_all(self, workers):
+        finished = set(self.checkpoint['finished'])
+        job_ids = [job_id for job_id in self.checkpoint['jobs'].values() if job_id not in finished]
+        if not job_ids:
+            self.stdout.write(self.style.SUCCESS('Nothing left to provision'))
+            return
+
+        # Forked workers must open their own database and cache connections
+        connections.close_all()
+        close_caches()
+        started = time.perf_counter()
+        statuses = {}
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as pool:
+            futures = [pool.submit(provision, job_id) for job_id in job_ids]
+            for done, future in enumerate(as_completed(futures), start=1):
+                job_id, status, error = future.result()
+                statuses[status] = statuses.get(status, 0) + 1
+                if status in ('succeeded', 'failed'):
+                    self.checkpoint['finished'].append(job_id)
+                if status != 'succeeded':
+                    self.stdout.write(self.style.WARNING(f'  job {job_id}: {status} {error}'))
+                if done % 50 == 0 or done == len(futures):
+                    self.save_checkpoint()
+                    rate = done / (time.perf_counter() - started)
+                    self.stdout.write(f'  provisioned {done}/{len(futures)} ({rate:.1f}/s)')
+
+        summary = ', '.join(f'{count} {status}' for status, count in sorted(statuses.items()))
+        self.stdout.write(self.style.SUCCESS(f'Provisioning finished: {summary}'))
+        if statuses.get('pending'):
+            self.stdout.write('Pending jobs are retried by run_tenant_jobs, or by re-running this command')
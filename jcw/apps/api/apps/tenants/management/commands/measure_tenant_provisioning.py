@@ -0,0 +1,81 @@
+"""
+Management command to measure tenant schema provisioning, full vs slim layout
+"""
+import json
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from apps.core.benchmarks import percentiles, write_report
+
+
+class Command(BaseCommand):
+    help = (
+        'Provision throwaway tenant schemas with the full TENANT_APPS (contrib apps included) '
+        'and with the slim content-only layout, and report migrate time and tables per schema.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--schemas', type=int, default=5, help='Schemas to provision per layout')
+        parser.add_argument('--layouts', nargs='+', choices=['full', 'slim'], default=['full', 'slim'])
+        parser.add_argument('--prefix', default='provbench', help='Prefix of the throwaway schemas')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Measuring schema provisioning requires PostgreSQL')
+
+        layouts = {
+            'full': getattr(settings, 'FULL_TENANT_APPS', settings.TENANT_APPS),
+            'slim': settings.TENANT_CONTENT_APPS,
+        }
+        report = {'options': {'schemas': options['schemas']}}
+        for layout in options['layouts']:
+            self.stdout.write(f'{layout} layout ({len(layouts[layout])} apps)...')
+            with override_settings(TENANT_APPS=list(layouts[layout])):
+                result = self.measure(f'{options["prefix"]}_{layout}', options['schemas'])
+            report[layout] = result
+            provision = result['provision']
+            self.stdout.write(
+                f"  tables/schema {result['tables_per_schema']}, migrate mean {provision['mean_ms']}ms "
+                f"p50 {provision['p50_ms']}ms p95 {provision['p95_ms']}ms"
+            )
+
+        if options['output']:
+            write_report(options['output'], report)
+            self.stdout.write(f"Report written to {options['output']}")
+        self.stdout.write(self.style.SUCCESS('Measurement complete'))
+        self.stdout.write(json.dumps(report, indent=2, default=str))
+
+    def measure(self, prefix, count):
+        schemas = [f'{prefix}_{index:03d}' for index in range(count)]
+        samples, table_counts = [], []
+        try:
+            for schema in schemas:
+                started = time.perf_counter()
+                with connection.cursor() as cursor:
+                    cursor.execute(f'CREATE SCHEMA {connection.ops.quote_name(schema)}')
+                call_command('migrate_schemas', schema_name=schema, interactive=False, verbosity=0)
+                samples.append(time.perf_counter() - started)
+                table_counts.append(self.table_count(schema))
+        finally:
+            connection.set_schema_to_public()
+            with connection.cursor() as cursor:
+                for schema in schemas:
+                    cursor.execute(f'DROP SCHEMA IF EXISTS {connection.ops.quote_name(schema)} CASCADE')
+        return {
+            'provision': percentiles(samples),
+            'tables_per_schema': max(table_counts, default=0),
+        }
+
+    def table_count(self, schema):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = %s AND table_type = 'BASE TABLE'",
+                [schema],
+            )
+            return cursor.fetchone()[0]
@@ -0,0 +1,172 @@
+"""
+Management command to migrate every tenant schema in parallel, resumably
+"""
+import multiprocessing
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.cache import close_caches
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.core.benchmarks import percentiles, write_report
+from apps.core.utils import get_tenant_schema_name, is_schema_tenancy
+from apps.tenants.models import SchemaMigrationRun, SchemaMigrationStatus, Tenant
+from apps.tenants.provisioning import migration_fingerprint, schema_exists
+from apps.tenants.sharding import get_shard_aliases, get_tenant_shard
+
+
+# Lower migrates first: live sites before inactive ones, paying plans first
+PLAN_PRIORITY = {'pro': 0, 'premium': 1, 'starter': 2, 'basic': 3}
+
+
+def migrate_schema_status(status_id):
+    """
+    Migrate one schema in a pool process and record the outcome.
+    """
+    close_old_connections()
+    status = SchemaMigrationStatus.objects.get(pk=status_id)
+    status.status = 'running'
+    status.attempts += 1
+    status.started_at = timezone.now()
+    status.save(update_fields=['status', 'attempts', 'started_at'])
+
+    started = time.perf_counter()
+    try:
+        if not schema_exists(status.schema_name, status.shard):
+            # Not provisioned yet: provisioning migrates it to the current state
+            status.status = 'skipped'
+        else:
+            call_command(
+                'migrate_schemas', schema_name=status.schema_name, database=status.shard,
+                interactive=False, verbosity=0,
+            )
+            status.status = 'succeeded'
+        status.error = ''
+    except Exception:
+        status.status = 'failed'
+        status.error = traceback.format_exc()
+    finally:
+        connections[status.shard].set_schema_to_public()
+    status.duration = time.perf_counter() - started
+    status.finished_at = timezone.now()
+    status.save(update_fields=['status', 'error', 'duration', 'finished_at'])
+    return status.schema_name, status.status, status.duration
+
+
+class Command(BaseCommand):
+    help = (
+        'Migrate all tenant schemas with a bounded process pool, highest priority first '
+        '(active, then by plan). Per-schema progress is stored, so an interrupted run resumes '
+        'where it stopped; the report includes timing percentiles.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int,
+                          default=getattr(settings, 'TENANT_MULTIPROCESSING_MAX_PROCESSES', 4),
+                          help='Schemas migrated concurrently')
+        parser.add_argument('--restart', action='store_true', help='Start a new run instead of resuming')
+        parser.add_argument('--retry-failed', action='store_true', help='Also retry schemas that failed before')
+        parser.add_argument('--skip-shared', action='store_true',
+                          help='Do not run the shared (public schema) migrations first')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        if not is_schema_tenancy():
+            raise CommandError('Schema migrations only apply to schema tenancy')
+
+        if not options['skip_shared']:
+            for shard in get_shard_aliases():
+                self.stdout.write(f'Migrating shared apps on {shard}...')
+                call_command('migrate_schemas', shared=True, database=shard, interactive=False, verbosity=0)
+
+        run = self.get_run(options['restart'])
+        retry = ['pending', 'running'] + (['failed'] if options['retry_failed'] else [])
+        status_ids = list(
+            run.schemas.filter(status__in=retry).order_by('priority', 'id').values_list('id', flat=True)
+        )
+        total = run.schemas.count()
+        self.stdout.write(f'Run {run.pk}: {len(status_ids)} of {total} schemas to migrate')
+
+        started = time.perf_counter()
+        if status_ids:
+            # Forked workers must open their own database and cache connections
+            connections.close_all()
+            close_caches()
+            context = multiprocessing.get_context('fork')
+            with ProcessPoolExecutor(max_workers=options['workers'], mp_context=context) as pool:
+                futures = [pool.submit(migrate_schema_status, status_id) for status_id in status_ids]
+                for done, future in enumerate(as_completed(futures), start=1):
+                    schema_name, status, duration = future.result()
+                    if status == 'failed':
+                        self.stdout.write(self.style.ERROR(f'  {schema_name} failed'))
+                    if done % 25 == 0 or done == len(futures):
+                        self.stdout.write(f'  {done}/{len(futures)} ({time.perf_counter() - started:.1f}s)')
+        wall_seconds = round(time.perf_counter() - started, 2)
+
+        report = self.build_report(run, wall_seconds)
+        if not report['statuses'].get('failed') and not report['statuses'].get('pending'):
+            run.finished_at = timezone.now()
+            run.save(update_fields=['finished_at'])
+
+        if options['output']:
+            write_report(options['output'], report)
+        durations = report['durations']
+        summary = ', '.join(f'{count} {status}' for status, count in sorted(report['statuses'].items()))
+        self.stdout.write(
+            f"{summary}; p50 {durations.get('p50_ms')}ms p95 {durations.get('p95_ms')}ms "
+            f"p99 {durations.get('p99_ms')}ms, wall {wall_seconds}s"
+        )
+        if report['statuses'].get('failed'):
+            raise CommandError('Some schemas failed; fix the cause and re-run with --retry-failed')
+        self.stdout.write(self.style.SUCCESS('All tenant schemas migrated'))
+
+    def get_run(self, restart):
+        fingerprint = migration_fingerprint()
+        run = SchemaMigrationRun.objects.filter(fingerprint=fingerprint, finished_at__isnull=True).first()
+        if run is not None and not restart:
+            self.stdout.write(f'Resuming run {run.pk} from {run.started_at:%Y-%m-%d %H:%M}')
+            return run
+        if run is not None:
+            # Abandoned: close it so it is never resumed
+            run.finished_at = timezone.now()
+            run.save(update_fields=['finished_at'])
+
+        run = SchemaMigrationRun.objects.create(fingerprint=fingerprint)
+        SchemaMigrationStatus.objects.bulk_create([
+            SchemaMigrationStatus(
+                run=run,
+                tenant=tenant,
+                schema_name=get_tenant_schema_name(tenant),
+                shard=get_tenant_shard(tenant),
+                priority=(0 if tenant.is_active else 10) + PLAN_PRIORITY.get(tenant.plan, len(PLAN_PRIORITY)),
+            )
+            for tenant in Tenant.objects.order_by('created_at').iterator()
+        ], batch_size=1000)
+        return run
+
+    def build_report(self, run, wall_seconds):
+        statuses = {}
+        for status, count in run.schemas.order_by().values_list('status').annotate(count=Count('id')):
+            statuses[status] = count
+        durations = list(
+            run.schemas.filter(status='succeeded', duration__isnull=False).values_list('duration', flat=True)
+        )
+        slowest = list(
+            run.schemas.filter(status='succeeded', duration__isnull=False)
+            .order_by('-duration').values_list('schema_name', 'duration')[:10]
+        )
+        return {
+            'run': run.pk,
+            'fingerprint': run.fingerprint,
+            'wall_seconds': wall_seconds,
+            'statuses': statuses,
+            'durations': percentiles(durations),
+            'slowest': [{'schema': schema, 'seconds': round(duration, 3)} for schema, duration in slowest],
+            'failed': list(run.schemas.filter(status='failed').values_list('schema_name', flat=True)),
+        }
@@ -0,0 +1,165 @@
+"""
+Management command to copy tenant schemas into row-level tenancy tables
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connection, transaction
+
+from apps.core.cache import row_tenant_namespace, tenant_cache
+from apps.core.utils import get_tenant_schema_name, is_row_tenancy
+from apps.tenants.models import Tenant
+from apps.tenants.snapshots import mark_stale
+
+
+# Copied once from every schema. Each schema has its own copy of these rows,
+# possibly under other primary keys: they are matched on their natural key
+# and references to them are remapped to the public row
+SHARED_MODELS = {
+    'sections.Section': ['slug'],
+    'templates.Template': ['slug'],
+    'templates.TemplateSection': ['template', 'order_index'],
+}
+
+# Copied per tenant with tenant_id filled in; parents before children
+TENANT_MODELS = ['themes.SiteTheme', 'pages.Page', 'pages.PageSection', 'activity.ActivityLog']
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy tenant content from schema-per-tenant schemas into the shared row-level tables. '
+        'Run with TENANCY_MODE=row after migrating the public schema; the old schemas are left in place.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('slugs', nargs='*', help='Tenant slugs to migrate (default: all tenants)')
+        parser.add_argument('--dry-run', action='store_true',
+                          help='Only count the rows that would be copied')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Schema to row migration requires PostgreSQL')
+        if not is_row_tenancy():
+            raise CommandError('Set TENANCY_MODE=row and migrate the public schema first')
+
+        tenants = Tenant.objects.all().order_by('slug')
+        if options['slugs']:
+            tenants = tenants.filter(slug__in=options['slugs'])
+
+        existing_schemas = self.get_schemas()
+        migrated = []
+        totals = {}
+        for tenant in tenants.iterator():
+            schema_name = get_tenant_schema_name(tenant)
+            if schema_name not in existing_schemas:
+                self.stdout.write(self.style.WARNING(f'  - {tenant.slug}: no schema "{schema_name}", skipped'))
+                continue
+
+            if self.has_rows(tenant):
+                self.stdout.write(self.style.WARNING(f'  - {tenant.slug}: already has rows in the shared tables, skipped'))
+                continue
+
+            try:
+                with transaction.atomic():
+                    counts = self.copy_tenant(tenant, schema_name, options['dry_run'])
+            except IntegrityError as e:
+                raise CommandError(f'{tenant.slug}: conflicting rows, nothing copied for this tenant:\n{e}')
+            migrated.append(tenant.pk)
+            for table, count in counts.items():
+                totals[table] = totals.get(table, 0) + count
+            summary = ', '.join(f'{table}: {count}' for table, count in counts.items())
+            self.stdout.write(f'  - {tenant.slug}: {summary}')
+
+        if migrated and not options['dry_run']:
+            mark_stale(migrated)
+            for tenant_id in migrated:
+                tenant_cache.for_namespace(row_tenant_namespace(tenant_id)).invalidate()
+
+        verb = 'Would copy' if options['dry_run'] else 'Copied'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {sum(totals.values())} rows from {len(migrated)} tenant schemas"
+        ))
+        for table, count in totals.items():
+            self.stdout.write(f'  {table}: {count}')
+
+    def get_schemas(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT schema_name FROM information_schema.schemata')
+            return {row[0] for row in cursor.fetchall()}
+
+    def get_columns(self, schema_name, table):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT column_name FROM information_schema.columns WHERE table_schema = %s AND table_name = %s',
+                [schema_name, table],
+            )
+            return {row[0] for row in cursor.fetchall()}
+
+    def has_rows(self, tenant):
+        return any(apps.get_model(label).unscoped.filter(tenant=tenant).exists() for label in TENANT_MODELS)
+
+    def copy_tenant(self, tenant, schema_name, dry_run):
+        """
+        Copy one schema's rows into the public tables. Shared rows whose
+        natural key exists already are reused, not copied; tenant rows must
+        not exist yet, a conflict raises IntegrityError.
+        """
+        qn = connection.ops.quote_name
+        counts = {}
+        for label in list(SHARED_MODELS) + TENANT_MODELS:
+            model = apps.get_model(label)
+            table = model._meta.db_table
+            source_columns = self.get_columns(schema_name, table)
+            if not source_columns:
+                continue
+            source = f'{qn(schema_name)}.{qn(table)}'
+
+            columns, values = [], []
+            for field in model._meta.local_concrete_fields:
+                if field.name == 'tenant' or field.column not in source_columns:
+                    continue
+                columns.append(qn(field.column))
+                values.append(self.remapped(field, schema_name))
+            params = []
+            if label in TENANT_MODELS:
+                columns.append(qn('tenant_id'))
+                values.append('%s')
+                params.append(tenant.pk)
+
+            sql = (
+                f'INSERT INTO public.{qn(table)} ({", ".join(columns)}) '
+                f'SELECT {", ".join(values)} FROM {source} src'
+            )
+            if label in SHARED_MODELS:
+                match = ' AND '.join(
+                    f'dst.{qn(model._meta.get_field(name).column)} = '
+                    f'{self.remapped(model._meta.get_field(name), schema_name)}'
+                    for name in SHARED_MODELS[label]
+                )
+                sql += f' WHERE NOT EXISTS (SELECT 1 FROM public.{qn(table)} dst WHERE {match})'
+
+            with connection.cursor() as cursor:
+                if dry_run:
+                    cursor.execute(f'SELECT COUNT(*) FROM {source}')
+                    counts[table] = cursor.fetchone()[0]
+                else:
+                    cursor.execute(sql, params)
+                    counts[table] = cursor.rowcount
+        return counts
+
+    def remapped(self, field, schema_name):
+        """
+        SQL for a source column; a reference to a shared row becomes the
+        public row with the same natural key.
+        """
+        qn = connection.ops.quote_name
+        column = f'src.{qn(field.column)}'
+        related = field.related_model if field.is_relation else None
+        if related is None or related._meta.label not in SHARED_MODELS:
+            return column
+        key = qn(related._meta.get_field(SHARED_MODELS[related._meta.label][0]).column)
+        related_table, related_pk = qn(related._meta.db_table), qn(related._meta.pk.column)
+        return (
+            f'(SELECT dst.{related_pk} FROM public.{related_table} dst '
+            f'JOIN {qn(schema_name)}.{related_table} rel ON rel.{key} = dst.{key} '
+            f'WHERE rel.{related_pk} = {column})'
+        )
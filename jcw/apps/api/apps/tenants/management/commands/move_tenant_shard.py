@@ -0,0 +1,170 @@
+"""
+Management command to move a tenant schema to another database shard
+"""
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers import sort_dependencies
+from django.db import connections, transaction
+from django.utils import timezone
+
+from apps.core.utils import get_tenant_schema_name
+from apps.tenants.models import Tenant
+from apps.tenants.routers import get_tenant_only_apps
+from apps.tenants.sharding import (
+    freeze_writes, get_shard_aliases, get_tenant_shard, mirror_to_shards, unfreeze_writes,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Move a tenant schema to another shard online: bulk copy while the site stays writable, '
+        'then a short write freeze for the final sync and the switch. '
+        'The target shard must have its public schema migrated (migrate_schemas --shared --database <shard>).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('slug', type=str, help='Tenant to move')
+        parser.add_argument('target', type=str, help='Target shard (DATABASES alias)')
+        parser.add_argument('--grace', type=float, default=2.0,
+                          help='Seconds to let in-flight writes finish after freezing')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk upsert')
+        parser.add_argument('--drop-source', action='store_true',
+                          help='Drop the schema on the source shard after the switch')
+
+    def handle(self, *args, **options):
+        try:
+            tenant = Tenant.objects.get(slug=options['slug'])
+        except Tenant.DoesNotExist:
+            raise CommandError(f'Tenant "{options["slug"]}" not found')
+
+        source, target = get_tenant_shard(tenant), options['target']
+        if target not in get_shard_aliases():
+            raise CommandError(f'Unknown shard "{target}"; configured shards: {", ".join(get_shard_aliases())}')
+        if target == source:
+            raise CommandError(f'Tenant "{tenant.slug}" is already on shard "{target}"')
+
+        tenant.schema_name = get_tenant_schema_name(tenant)
+        self.batch_size = options['batch_size']
+        self.models = self.get_tenant_models()
+
+        self.stdout.write(f'Moving {tenant.slug} ({tenant.schema_name}) from {source} to {target}')
+        self.prepare_target(tenant, target)
+        mirror_to_shards(tenant)  # Tenant and owner rows referenced on the target
+
+        copy_started = timezone.now()
+        copied = self.sync(tenant, source, target)
+        self.stdout.write(f'  initial copy: {copied} rows')
+
+        freeze_started = time.perf_counter()
+        freeze_writes(tenant.pk)
+        try:
+            time.sleep(options['grace'])
+            copied = self.sync(tenant, source, target, since=copy_started)
+            self.stdout.write(f'  final sync: {copied} rows')
+
+            tenant.shard = target
+            tenant.save(update_fields=['shard', 'updated_at'])  # Signals invalidate routing caches
+            # Workers trust their resolver LRU this long; keep writes frozen
+            # until none of them can still route to the old shard
+            time.sleep(getattr(settings, 'TENANT_RESOLVER_LOCAL_TTL', 5))
+        finally:
+            unfreeze_writes(tenant.pk)
+        freeze_seconds = time.perf_counter() - freeze_started
+
+        if options['drop_source']:
+            with connections[source].cursor() as cursor:
+                cursor.execute(f'DROP SCHEMA {connections[source].ops.quote_name(tenant.schema_name)} CASCADE')
+            self.stdout.write(f'  dropped schema on {source}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Moved {tenant.slug} to {target}; writes were frozen for {freeze_seconds:.2f}s'
+        ))
+
+    def get_tenant_models(self):
+        """
+        Tenant-only models, parents before children.
+        """
+        app_list = [
+            (app_config, None) for app_config in apps.get_app_configs()
+            if app_config.name in get_tenant_only_apps()
+        ]
+        return [model for model in sort_dependencies(app_list, allow_cycles=True) if model._meta.managed]
+
+    def prepare_target(self, tenant, target):
+        connection = connections[target]
+        with connection.cursor() as cursor:
+            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS {connection.ops.quote_name(tenant.schema_name)}')
+        call_command(
+            'migrate_schemas', schema_name=tenant.schema_name, database=target,
+            interactive=False, verbosity=0,
+        )
+
+    def sync(self, tenant, source, target, since=None):
+        """
+        Make the target schema match the source. With `since`, only rows
+        updated after it are re-copied for models that track updated_at.
+        """
+        source_connection, target_connection = connections[source], connections[target]
+        source_connection.set_tenant(tenant)
+        target_connection.set_tenant(tenant)
+        copied = 0
+        try:
+            self.mirror_references(source)
+            with transaction.atomic(using=target):
+                # Deletions first (children before parents), so re-created
+                # rows can't collide with stale ones on unique fields
+                for model in reversed(self.models):
+                    source_ids = set(model._base_manager.using(source).values_list('pk', flat=True))
+                    stale = model._base_manager.using(target).exclude(pk__in=source_ids)
+                    stale._raw_delete(target)
+
+                for model in self.models:
+                    copied += self.copy_model(model, source, target, since)
+        finally:
+            source_connection.set_schema_to_public()
+            target_connection.set_schema_to_public()
+        return copied
+
+    def mirror_references(self, source):
+        """
+        Mirror the shared rows (users, ...) that the tenant's rows point at.
+        """
+        tenant_only_apps = get_tenant_only_apps()
+        for model in self.models:
+            for field in model._meta.concrete_fields:
+                if not field.is_relation or field.related_model._meta.app_config.name in tenant_only_apps:
+                    continue
+                ids = (
+                    model._base_manager.using(source).exclude(**{f'{field.attname}__isnull': True})
+                    .values_list(field.attname, flat=True).distinct()
+                )
+                for obj in field.related_model._base_manager.filter(pk__in=list(ids)):
+                    mirror_to_shards(obj)
+
+    def copy_model(self, model, source, target, since):
+        queryset = model._base_manager.using(source).order_by('pk')
+        field_names = {field.name for field in model._meta.concrete_fields}
+        if since is not None and 'updated_at' in field_names:
+            queryset = queryset.filter(updated_at__gte=since)
+
+        update_fields = [field.name for field in model._meta.concrete_fields if not field.primary_key]
+        copied = 0
+        batch = []
+        for obj in queryset.iterator(chunk_size=self.batch_size):
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                copied += self._upsert(model, target, batch, update_fields)
+                batch = []
+        if batch:
+            copied += self._upsert(model, target, batch, update_fields)
+        return copied
+
+    def _upsert(self, model, target, batch, update_fields):
+        model._base_manager.using(target).bulk_create(
+            batch, update_conflicts=True, unique_fields=[model._meta.pk.name], update_fields=update_fields,
+        )
+        return len(batch)
@@ -0,0 +1,30 @@
+"""
+Management command to trim the routing manifest change log
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.tenants.models import RoutingChange
+
+
+class Command(BaseCommand):
+    help = 'Delete routing manifest changes older than --keep-days (clients behind that get a full manifest)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-days', type=int, default=7, help='Days of changes to keep')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['keep_days'])
+        latest = RoutingChange.objects.aggregate(version=Max('id'))['version']
+        if latest is None:
+            self.stdout.write('Routing change log is empty')
+            return
+        
+        # Never delete the newest row: it carries the current manifest version
+        deleted, _ = RoutingChange.objects.filter(created_at__lt=cutoff).exclude(id=latest).delete()
+        self.stdout.write(
+            self.style.SUCCESS(f'Deleted {deleted} routing changes older than {options["keep_days"]} days')
+        )
@@ -0,0 +1,57 @@
+"""
+Management command to publish tenant websites as static files
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.tenants.models import Tenant
+from apps.tenants.publishing import get_publish_root, publish_tenant
+
+
+class Command(BaseCommand):
+    help = 'Render tenant websites to static HTML/CSS and switch them live atomically'
+
+    def add_arguments(self, parser):
+        parser.add_argument('slugs', nargs='*', help='Tenant slugs to publish (default: all active tenants)')
+        parser.add_argument('--workers', type=int, default=4, help='Number of tenants published in parallel')
+        parser.add_argument('--force', action='store_true',
+                          help='Publish even if the live release matches the current snapshot')
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.filter(is_active=True, deleted_at__isnull=True).order_by('slug')
+        if options['slugs']:
+            tenants = tenants.filter(slug__in=options['slugs'])
+        tenants = list(tenants)
+        if not tenants:
+            raise CommandError('No matching active tenants')
+        
+        self.stdout.write(f'Publishing {len(tenants)} sites to {get_publish_root()}')
+        
+        def publish(tenant):
+            try:
+                return publish_tenant(tenant, force=options['force'])
+            finally:
+                # Each worker thread has its own connection
+                connection.close()
+        
+        published = unchanged = failed = 0
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as executor:
+            futures = {executor.submit(publish, tenant): tenant for tenant in tenants}
+            for future in as_completed(futures):
+                tenant = futures[future]
+                try:
+                    release, changed = future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f'  - {tenant.slug}: {e}'))
+                    continue
+                if changed:
+                    published += 1
+                    self.stdout.write(f'  - {tenant.slug}: {release}')
+                else:
+                    unchanged += 1
+        
+        summary = f'Published {published}, unchanged {unchanged}, failed {failed}'
+        self.stdout.write(self.style.ERROR(summary) if failed else self.style.SUCCESS(summary))
@@ -0,0 +1,42 @@
+"""
+Management command to rebuild precomputed tenant website snapshots
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from apps.tenants.models import Tenant
+from apps.tenants.snapshots import rebuild_snapshot, snapshot_staleness
+
+
+class Command(BaseCommand):
+    help = 'Rebuild website snapshots (all, one tenant, or only stale/missing ones)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--slug', type=str, help='Rebuild a single tenant')
+        parser.add_argument('--stale-only', action='store_true',
+                          help='Only rebuild snapshots that are stale or missing')
+
+    def handle(self, *args, **options):
+        tenants = Tenant.objects.filter(deleted_at__isnull=True).order_by('slug')
+        if options['slug']:
+            tenants = tenants.filter(slug=options['slug'])
+            if not tenants.exists():
+                raise CommandError(f'Tenant "{options["slug"]}" not found')
+        if options['stale_only']:
+            tenants = tenants.filter(
+                Q(website_snapshot__isnull=True) | Q(website_snapshot__stale_since__isnull=False)
+            )
+        
+        rebuilt = 0
+        for tenant in tenants.iterator():
+            snapshot = rebuild_snapshot(tenant)
+            rebuilt += 1
+            self.stdout.write(f'  - {tenant.slug}: v{snapshot.version}')
+        
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rebuilt} website snapshots'))
+        
+        staleness = snapshot_staleness()
+        self.stdout.write(
+            f"Snapshots: {staleness['snapshots']}, stale: {staleness['stale']}, "
+            f"missing: {staleness['missing']}, oldest pending change: {staleness['max_stale_seconds']}s"
+        )
@@ -0,0 +1,40 @@
+"""
+Management command to keep the warm pool of pre-migrated tenant schemas full
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from apps.core.utils import is_schema_tenancy
+from apps.tenants.schema_pool import get_pool_size, refill
+from apps.tenants.sharding import get_shard_aliases
+
+
+class Command(BaseCommand):
+    help = (
+        'Top up the pool of empty, migrated tenant schemas to TENANT_SCHEMA_POOL_SIZE per shard '
+        'and rebuild entries left behind by new migrations. Loops unless --once.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Refill once, then exit')
+        parser.add_argument('--size', type=int, help='Pool size per shard (default: TENANT_SCHEMA_POOL_SIZE)')
+        parser.add_argument('--interval', type=float, default=10.0, help='Seconds between refills')
+
+    def handle(self, *args, **options):
+        if not is_schema_tenancy():
+            raise CommandError('The schema pool is only used with schema tenancy')
+        size = get_pool_size() if options['size'] is None else options['size']
+
+        while True:
+            close_old_connections()
+            for shard in get_shard_aliases():
+                created, dropped = refill(shard, size)
+                if created or dropped:
+                    self.stdout.write(f'{shard}: created {created}, dropped {dropped} outdated pool schemas')
+
+            if options['once']:
+                self.stdout.write(self.style.SUCCESS('Schema pool refilled'))
+                return
+            time.sleep(options['interval'])
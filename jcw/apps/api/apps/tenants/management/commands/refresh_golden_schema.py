@@ -0,0 +1,36 @@
+"""
+Management command to migrate the golden schema that new tenant schemas are cloned from
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.utils import is_schema_tenancy
+from apps.tenants.provisioning import (
+    drop_schema, get_golden_schema_name, golden_fingerprint, migration_fingerprint, refresh_golden_schema,
+)
+from apps.tenants.sharding import get_shard_aliases
+
+
+class Command(BaseCommand):
+    help = (
+        'Migrate the golden schema (TENANT_BASE_SCHEMA) on every shard and mark it current. '
+        'Run after migrate_schemas on each deploy; until then provisioning falls back to migrating.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='Drop and recreate the golden schema')
+
+    def handle(self, *args, **options):
+        if not is_schema_tenancy():
+            raise CommandError('The golden schema is only used with schema tenancy')
+
+        schema_name = get_golden_schema_name()
+        for shard in get_shard_aliases():
+            if golden_fingerprint(shard) == migration_fingerprint() and not options['rebuild']:
+                self.stdout.write(f'{shard}: {schema_name} is current')
+                continue
+            if options['rebuild']:
+                drop_schema(schema_name, shard)
+            refresh_golden_schema(shard)
+            self.stdout.write(f'{shard}: {schema_name} migrated')
+
+        self.stdout.write(self.style.SUCCESS(f'Golden schema at {migration_fingerprint()[:12]}'))
@@ -0,0 +1,45 @@
+"""
+Management command to run queued tenant jobs (provisioning, ...)
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.tenants.jobs import claim_next_job, release_stale_jobs, run_job
+from apps.tenants.models import TenantJob
+
+
+class Command(BaseCommand):
+    help = 'Poll the tenant job queue and run due jobs; run several workers for more throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run the due jobs, then exit')
+        parser.add_argument('--kind', action='append', choices=[kind for kind, _ in TenantJob.KIND_CHOICES],
+                          help='Only run jobs of this kind (repeatable)')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds between polls when idle')
+        parser.add_argument('--stale-after', type=int, default=900,
+                          help='Requeue running jobs locked for longer than this many seconds')
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            requeued, failed = release_stale_jobs(options['stale_after'])
+            if requeued or failed:
+                self.stdout.write(self.style.WARNING(f'Requeued {requeued} and failed {failed} abandoned jobs'))
+
+            ran = 0
+            while True:
+                job = claim_next_job(options['kind'])
+                if job is None:
+                    break
+                self.stdout.write(f'{job.kind} {job.tenant_id} (attempt {job.attempts}/{job.max_attempts})...')
+                run_job(job)
+                ran += 1
+                style = self.style.SUCCESS if job.status == 'succeeded' else self.style.ERROR
+                self.stdout.write(style(f'  {job.status}'))
+
+            if options['once']:
+                self.stdout.write(f'Ran {ran} jobs')
+                return
+            time.sleep(options['poll_interval'])
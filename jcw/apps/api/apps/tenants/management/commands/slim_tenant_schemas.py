@@ -0,0 +1,95 @@
+"""
+Management command to drop shared-app tables from existing tenant schemas
+"""
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from apps.core.utils import get_tenant_schema_name
+from apps.tenants.models import Tenant
+from apps.tenants.sharding import get_tenant_shard
+
+
+class Command(BaseCommand):
+    help = (
+        'Migrate existing tenant schemas to the slim layout (TENANT_SLIM_SCHEMAS=True): drop the '
+        'tables of apps that are no longer in TENANT_APPS (auth, admin, sessions, contenttypes) and '
+        'forget their migrations. Tenant-local copies of those tables are lost; the public ones are used instead.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('slugs', nargs='*', help='Tenant slugs to slim (default: all tenants)')
+        parser.add_argument('--dry-run', action='store_true', help='Only list the tables that would be dropped')
+
+    def handle(self, *args, **options):
+        if not getattr(settings, 'TENANT_SLIM_SCHEMAS', False):
+            raise CommandError('Enable TENANT_SLIM_SCHEMAS first, so new migrations stop recreating these tables')
+
+        shared_apps = self.get_removed_apps()
+        tables = self.get_tables(shared_apps)
+        app_labels = [app_config.label for app_config in shared_apps]
+
+        tenants = Tenant.objects.all().order_by('slug')
+        if options['slugs']:
+            tenants = tenants.filter(slug__in=options['slugs'])
+
+        slimmed = dropped_total = 0
+        for tenant in tenants.iterator():
+            schema_name = get_tenant_schema_name(tenant)
+            connection = connections[get_tenant_shard(tenant)]
+            existing = self.get_schema_tables(connection, schema_name)
+            if existing is None:
+                self.stdout.write(self.style.WARNING(f'  - {tenant.slug}: no schema "{schema_name}", skipped'))
+                continue
+
+            to_drop = [table for table in tables if table in existing]
+            if not options['dry_run'] and to_drop:
+                self.drop_tables(connection, schema_name, to_drop, app_labels, 'django_migrations' in existing)
+            slimmed += 1
+            dropped_total += len(to_drop)
+            self.stdout.write(f'  - {tenant.slug}: {len(to_drop)} tables' + (f' ({", ".join(to_drop)})' if options['dry_run'] else ''))
+
+        verb = 'Would drop' if options['dry_run'] else 'Dropped'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {dropped_total} tables from {slimmed} tenant schemas'))
+
+    def get_removed_apps(self):
+        """
+        Installed apps whose tables full tenant schemas have but slim ones don't.
+        """
+        full_apps = getattr(settings, 'FULL_TENANT_APPS', settings.TENANT_APPS)
+        return [
+            app_config for app_config in apps.get_app_configs()
+            if app_config.name in full_apps and app_config.name not in settings.TENANT_APPS
+        ]
+
+    def get_tables(self, app_configs):
+        tables = []
+        for app_config in app_configs:
+            for model in app_config.get_models(include_auto_created=True):
+                if model._meta.managed and model._meta.db_table not in tables:
+                    tables.append(model._meta.db_table)
+        return tables
+
+    def get_schema_tables(self, connection, schema_name):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1 FROM information_schema.schemata WHERE schema_name = %s', [schema_name])
+            if cursor.fetchone() is None:
+                return None
+            cursor.execute(
+                "SELECT table_name FROM information_schema.tables WHERE table_schema = %s AND table_type = 'BASE TABLE'",
+                [schema_name],
+            )
+            return {row[0] for row in cursor.fetchall()}
+
+    def drop_tables(self, connection, schema_name, tables, app_labels, has_migrations_table):
+        quote = connection.ops.quote_name
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute('DROP TABLE {} CASCADE'.format(
+                ', '.join(f'{quote(schema_name)}.{quote(table)}' for table in tables)
+            ))
+            if has_migrations_table:
+                # Otherwise a later switch back to full schemas would skip recreating them
+                cursor.execute(
+                    f'DELETE FROM {quote(schema_name)}.django_migrations WHERE app = ANY(%s)', [app_labels]
+                )
@@ -0,0 +1,153 @@
+"""
+Tenant routing middleware.
+
+Requests are classified before any tenant lookup. Public routes (path
+prefixes or hostnames listed in settings) only touch shared tables, so they
+are served from the public schema without resolving the hostname at all; the
+hostname is kept as a pending tenant and LazyTenantRouter activates it on the
+first query against a tenant-scoped model. Every other request goes through
+the cached hostname resolver as before.
+
+RowTenantMiddleware replaces all of this in row-level tenancy mode, where
+every tenant shares the public schema and is selected by row instead.
+"""
+import threading
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import DisallowedHost
+from django.db import connection
+from django.http import Http404, HttpResponseNotFound
+from django.urls import set_urlconf
+from django_tenants.middleware.main import TenantMainMiddleware
+from django_tenants.utils import remove_www
+
+from apps.core.utils import reset_current_tenant, set_current_tenant
+
+from .resolver import tenant_resolver
+from .sharding import activate_tenant
+
+
+# Hostname whose tenant is activated on first tenant-scoped query, if any
+pending_tenant_host = ContextVar('pending_tenant_host', default=None)
+
+_stats_lock = threading.Lock()
+_stats = {'public_routes': 0, 'tenant_routes': 0, 'lazy_activations': 0}
+
+
+def _count(key):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def routing_stats():
+    with _stats_lock:
+        return dict(_stats)
+
+
+def is_public_route(request, hostname):
+    """
+    True if the request is served by the public urlconf and only needs shared tables.
+    """
+    if not getattr(settings, 'TENANT_LAZY_ROUTING', False):
+        return False
+    if hostname in getattr(settings, 'PUBLIC_ROUTE_HOSTS', []):
+        return True
+    path = request.path_info
+    if path.startswith(tuple(getattr(settings, 'TENANT_ROUTE_PREFIXES', []))):
+        return False
+    return path.startswith(tuple(getattr(settings, 'PUBLIC_ROUTE_PREFIXES', [])))
+
+
+def activate_pending_tenant():
+    """
+    Resolve the pending hostname and switch the connection to its schema.
+    Called by LazyTenantRouter; a hostname with no tenant is a 404, exactly
+    as it would have been without lazy routing.
+    """
+    hostname = pending_tenant_host.get()
+    if hostname is None:
+        return None
+    pending_tenant_host.set(None)
+
+    resolved = tenant_resolver.resolve(hostname)
+    if resolved is None:
+        raise Http404(f'No tenant for hostname "{hostname}"')
+    tenant = tenant_resolver.as_tenant(resolved)
+    tenant.domain_url = hostname
+    activate_tenant(tenant)
+    _count('lazy_activations')
+    return tenant
+
+
+class CachedTenantMiddleware(TenantMainMiddleware):
+    """
+    TenantMainMiddleware that routes through the tenant resolver cache
+    instead of querying the Domain and Tenant tables on every request,
+    and skips resolution entirely for public routes.
+    """
+
+    def get_tenant(self, domain_model, hostname):
+        resolved = tenant_resolver.resolve(hostname)
+        if resolved is None:
+            raise domain_model.DoesNotExist(f'No domain for hostname "{hostname}"')
+        return tenant_resolver.as_tenant(resolved)
+
+    def process_request(self, request):
+        pending_tenant_host.set(None)
+        try:
+            hostname = self.hostname_from_request(request)
+        except DisallowedHost:
+            return HttpResponseNotFound()
+
+        if not is_public_route(request, hostname):
+            _count('tenant_routes')
+            response = super().process_request(request)
+            if getattr(request, 'tenant', None) is not None:
+                activate_tenant(request.tenant)  # Its shard connection too
+            return response
+
+        _count('public_routes')
+        connection.set_schema_to_public()
+        if hostname not in getattr(settings, 'PUBLIC_ROUTE_HOSTS', []):
+            pending_tenant_host.set(hostname)
+        self.setup_url_routing(request, force_public=True)
+
+    def process_response(self, request, response):
+        pending_tenant_host.set(None)
+        return response
+
+
+class RowTenantMiddleware:
+    """
+    Row-level tenancy: resolve the hostname to a tenant and scope
+    tenant-scoped models to it for the duration of the request. Unknown
+    hosts (and PUBLIC_ROUTE_HOSTS) run without a tenant.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            hostname = remove_www(request.get_host().split(':')[0])
+        except DisallowedHost:
+            return HttpResponseNotFound()
+
+        tenant = None
+        if hostname not in getattr(settings, 'PUBLIC_ROUTE_HOSTS', []):
+            resolved = tenant_resolver.resolve(hostname)
+            if resolved is not None:
+                tenant = tenant_resolver.as_tenant(resolved)
+                tenant.domain_url = hostname
+        request.tenant = tenant
+        public = tenant is None or is_public_route(request, hostname)
+        if public and hasattr(settings, 'PUBLIC_SCHEMA_URLCONF'):
+            request.urlconf = settings.PUBLIC_SCHEMA_URLCONF
+            set_urlconf(request.urlconf)
+
+        token = set_current_tenant(tenant)
+        try:
+            return self.get_response(request)
+        finally:
+            reset_current_tenant(token)
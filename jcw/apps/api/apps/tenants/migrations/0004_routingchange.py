@@ -0,0 +1,29 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0003_tenant_plan_tenant_website_url_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoutingChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('tenant_id', models.UUIDField(db_index=True)),
+                ('slug', models.CharField(max_length=30)),
+                ('domains', models.JSONField(default=list)),
+                ('is_active', models.BooleanField(default=False)),
+                ('is_deleted', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'tenants_routing_change',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0004_routingchange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebsiteSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(max_length=30)),
+                ('document', models.JSONField(default=dict)),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('built_at', models.DateTimeField(blank=True, null=True)),
+                ('stale_since', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('tenant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='website_snapshot', to='tenants.tenant')),
+            ],
+            options={
+                'db_table': 'tenants_website_snapshot',
+            },
+        ),
+    ]
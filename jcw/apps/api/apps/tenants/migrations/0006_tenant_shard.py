@@ -0,0 +1,25 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:31
+
+from django.db import migrations, models
+
+
+def place_existing_tenants(apps, schema_editor):
+    # Every existing schema lives on the default database
+    Tenant = apps.get_model('tenants', 'Tenant')
+    Tenant.objects.filter(shard='').update(shard='default')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0005_websitesnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tenant',
+            name='shard',
+            field=models.CharField(blank=True, db_index=True, max_length=50),
+        ),
+        migrations.RunPython(place_existing_tenants, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0007_tenantjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchemaPoolEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('schema_name', models.CharField(max_length=63, unique=True)),
+                ('shard', models.CharField(db_index=True, max_length=50)),
+                ('fingerprint', models.CharField(max_length=40)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'tenants_schema_pool',
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
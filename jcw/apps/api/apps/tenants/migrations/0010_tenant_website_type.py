@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0009_schema_migration_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tenant',
+            name='website_type',
+            field=models.CharField(choices=[('one_page', 'One Page'), ('multi_page', 'Multi Page'), ('ecommerce', 'eCommerce')], default='one_page', max_length=20),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0010_tenant_website_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tenant',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='tenantjob',
+            name='kind',
+            field=models.CharField(choices=[('provision', 'Provision'), ('purge', 'Purge')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='tenantjob',
+            name='tenant',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='tenants.tenant'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.14 on 2026-10-18 18:03
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0012_tenantjob_clone_kind'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStats',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(default=1, editable=False, primary_key=True, serialize=False)),
+                ('tenants', models.IntegerField(default=0)),
+                ('active_tenants', models.IntegerField(default=0)),
+                ('users', models.IntegerField(default=0)),
+                ('pages_draft', models.IntegerField(default=0)),
+                ('pages_published', models.IntegerField(default=0)),
+                ('templates', models.IntegerField(default=0)),
+                ('sections', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('reconciled_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'platform stats',
+                'db_table': 'tenants_platform_stats',
+            },
+        ),
+    ]
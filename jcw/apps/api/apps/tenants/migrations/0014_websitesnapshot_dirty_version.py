@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 18:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0013_platformstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='websitesnapshot',
+            name='dirty_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
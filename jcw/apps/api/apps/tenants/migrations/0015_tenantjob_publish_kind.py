@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-18 18:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0014_websitesnapshot_dirty_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tenantjob',
+            name='kind',
+            field=models.CharField(choices=[('provision', 'Provision'), ('purge', 'Purge'), ('clone', 'Clone'), ('publish', 'Publish')], max_length=20),
+        ),
+    ]
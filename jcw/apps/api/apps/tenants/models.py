@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.core.validators import RegexValidator
 import uuid
@@ -53,11 +54,24 @@ class Tenant(models.Model):
     ]
     plan = models.CharField(max_length=20, choices=PLAN_CHOICES, default='basic')
     
+    # Kind of site; picks the default template the site is bootstrapped from
+    WEBSITE_TYPE_CHOICES = [
+        ('one_page', 'One Page'),
+        ('multi_page', 'Multi Page'),
+        ('ecommerce', 'eCommerce'),
+    ]
+    website_type = models.CharField(max_length=20, choices=WEBSITE_TYPE_CHOICES, default='one_page')
+    
+    # Database shard holding the tenant schema (a DATABASES alias)
+    shard = models.CharField(max_length=50, blank=True, db_index=True)
+    
     # Tenant owner
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='owned_tenants', null=True, blank=True)
     
     # Status
     is_active = models.BooleanField(default=True)
+    # Soft delete: set when an admin deletes the tenant; its 'purge' job removes the data later
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -79,6 +93,9 @@ class Tenant(models.Model):
         if not self.slug:
             from apps.core.utils import generate_tenant_slug
             self.slug = generate_tenant_slug(self.business_name)
+        if not self.shard:
+            from .sharding import choose_shard
+            self.shard = choose_shard(self)
         super().save(*args, **kwargs)
 
 
@@ -94,4 +111,196 @@ class Domain(models.Model):
         db_table = 'tenants_domain'
     
     def __str__(self):
-        return self.domain
\ No newline at end of file
+        return self.domain
+
+
+class RoutingChange(models.Model):
+    """
+    Append-only log of tenant routing state (slug, domains, active flag).
+    The id doubles as the routing manifest version handed to the frontend.
+    """
+    id = models.BigAutoField(primary_key=True)
+    # Not a foreign key: deletions must stay in the log after the tenant is gone
+    tenant_id = models.UUIDField(db_index=True)
+    slug = models.CharField(max_length=30)
+    domains = models.JSONField(default=list)
+    is_active = models.BooleanField(default=False)
+    is_deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'tenants_routing_change'
+        ordering = ['id']
+    
+    def __str__(self):
+        return f"v{self.id} {self.slug}"
+
+
+class WebsiteSnapshot(models.Model):
+    """
+    Precomputed public website document for a tenant, so a public read is a
+    single keyed fetch instead of assembling tenant, pages and theme.
+    """
+    tenant = models.OneToOneField(Tenant, related_name='website_snapshot', on_delete=models.CASCADE)
+    slug = models.SlugField(max_length=30, db_index=True)  # Public lookup key
+    document = models.JSONField(default=dict)
+    version = models.PositiveIntegerField(default=0)
+    built_at = models.DateTimeField(null=True, blank=True)
+    # Set when an input changes; cleared by the rebuild that picks the change up
+    stale_since = models.DateTimeField(null=True, blank=True, db_index=True)
+    # Bumped by every change, so a rebuild can tell whether it missed one
+    dirty_version = models.PositiveBigIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'tenants_website_snapshot'
+    
+    def __str__(self):
+        return f"{self.slug} v{self.version}"
+
+
+class TenantJob(models.Model):
+    """
+    Background work on a tenant (provisioning its schema, ...), claimed and
+    run by the `run_tenant_jobs` worker. Handlers must be idempotent: a job
+    is retried from the start after a failure or a worker crash.
+    """
+    KIND_CHOICES = [
+        ('provision', 'Provision'),
+        ('purge', 'Purge'),
+        ('clone', 'Clone'),
+        ('publish', 'Publish'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Kept after a purge deletes the tenant, as the record of that purge
+    tenant = models.ForeignKey(Tenant, related_name='jobs', on_delete=models.SET_NULL, null=True, blank=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    
+    # Progress reported to the status endpoint
+    step = models.CharField(max_length=50, blank=True)
+    progress = models.PositiveSmallIntegerField(default=0)  # percent
+    
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    error = models.TextField(blank=True)
+    run_after = models.DateTimeField(default=timezone.now)  # Retry backoff
+    locked_at = models.DateTimeField(null=True, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'tenants_job'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='tenants_job_queue_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} {self.tenant_id} ({self.status})"
+
+
+class SchemaPoolEntry(models.Model):
+    """
+    An empty, fully migrated tenant schema waiting to be claimed by a new
+    tenant (see apps.tenants.schema_pool). The row is deleted on claim.
+    """
+    schema_name = models.CharField(max_length=63, unique=True)
+    shard = models.CharField(max_length=50, db_index=True)
+    # Tenant migration state the schema was built with; stale entries are rebuilt
+    fingerprint = models.CharField(max_length=40)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'tenants_schema_pool'
+        ordering = ['created_at']
+    
+    def __str__(self):
+        return f"{self.schema_name} ({self.shard})"
+
+
+class SchemaMigrationRun(models.Model):
+    """
+    One `migrate_tenant_schemas` rollout to a migration state (fingerprint).
+    An unfinished run for the current state is resumed by the next invocation.
+    """
+    fingerprint = models.CharField(max_length=40, db_index=True)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'tenants_schema_migration_run'
+        ordering = ['-started_at']
+    
+    def __str__(self):
+        return f"{self.fingerprint[:12]} ({self.started_at:%Y-%m-%d %H:%M})"
+
+
+class SchemaMigrationStatus(models.Model):
+    """
+    Progress of one tenant schema within a SchemaMigrationRun.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+        ('skipped', 'Skipped'),
+    ]
+    
+    run = models.ForeignKey(SchemaMigrationRun, related_name='schemas', on_delete=models.CASCADE)
+    tenant = models.ForeignKey(Tenant, null=True, on_delete=models.SET_NULL, related_name='+')
+    schema_name = models.CharField(max_length=63)
+    shard = models.CharField(max_length=50)
+    priority = models.PositiveSmallIntegerField(default=0)  # Lower runs first
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    duration = models.FloatField(null=True, blank=True)  # seconds
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'tenants_schema_migration_status'
+        ordering = ['priority', 'id']
+        constraints = [
+            models.UniqueConstraint(fields=['run', 'schema_name'], name='tenants_schema_migration_uniq'),
+        ]
+    
+    def __str__(self):
+        return f"{self.schema_name}: {self.status}"
+
+
+class PlatformStats(models.Model):
+    """
+    Single-row rollup of platform counters for the admin dashboard, kept
+    current by model signals and corrected by `reconcile_platform_stats`
+    (see platform_stats.py).
+    """
+    id = models.PositiveSmallIntegerField(primary_key=True, default=1, editable=False)
+    tenants = models.IntegerField(default=0)
+    active_tenants = models.IntegerField(default=0)
+    users = models.IntegerField(default=0)
+    pages_draft = models.IntegerField(default=0)
+    pages_published = models.IntegerField(default=0)
+    templates = models.IntegerField(default=0)
+    sections = models.IntegerField(default=0)
+    
+    updated_at = models.DateTimeField(default=timezone.now)
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'tenants_platform_stats'
+        verbose_name_plural = 'platform stats'
+    
+    def __str__(self):
+        return f"Platform stats ({self.updated_at:%Y-%m-%d %H:%M})"
@@ -0,0 +1,105 @@
+"""
+Negative cache for hostnames and slugs that do not belong to any tenant.
+
+Scanners hitting random subdomains would otherwise cost a database query per
+request. Misses are remembered in a bounded per-worker map and in the shared
+cache; the local copy is only trusted for TENANT_RESOLVER_LOCAL_TTL seconds so
+a purge in one worker reaches the others quickly.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class NegativeCache:
+    """
+    Bounded, TTL-limited set of keys known to have no matching tenant.
+    """
+    key_prefix = 'tenant-negative'
+
+    def __init__(self, kind):
+        self.kind = kind
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.purges = 0
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'TENANT_NEGATIVE_CACHE_SIZE', 10000)
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'TENANT_NEGATIVE_CACHE_TTL', 60)
+
+    @property
+    def local_ttl(self):
+        return min(self.ttl, getattr(settings, 'TENANT_RESOLVER_LOCAL_TTL', 5))
+
+    def _cache_key(self, key):
+        return f'{self.key_prefix}:{self.kind}:{key}'
+
+    def contains(self, key):
+        """
+        Return True if the key is a known miss.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is not None:
+                if expires_at > now:
+                    self.hits += 1
+                    return True
+                del self._entries[key]
+
+        if cache.get(self._cache_key(key)):
+            self._remember(key, now)
+            with self._lock:
+                self.hits += 1
+            return True
+
+        with self._lock:
+            self.misses += 1
+        return False
+
+    def add(self, key):
+        cache.set(self._cache_key(key), True, self.ttl)
+        self._remember(key, time.monotonic())
+        with self._lock:
+            self.stores += 1
+
+    def purge(self, key):
+        cache.delete(self._cache_key(key))
+        with self._lock:
+            self._entries.pop(key, None)
+            self.purges += 1
+
+    def _remember(self, key, now):
+        with self._lock:
+            self._entries[key] = now + self.local_ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'stores': self.stores,
+                'purges': self.purges,
+            }
+
+
+unknown_hosts = NegativeCache('host')
+unknown_slugs = NegativeCache('slug')
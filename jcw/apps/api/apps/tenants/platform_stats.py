@@ -0,0 +1,130 @@
+"""
+Platform-wide counters for the admin dashboard.
+
+Counting pages, templates and sections in schema tenancy means querying
+every tenant schema, far too slow for a dashboard poll. PlatformStats is
+one row of counters instead: model signals apply +1/-1 with F() updates
+after commit, code that inserts or drops rows without signals (set-based
+copies, bulk imports, schema drops) calls adjust() itself, and
+`manage.py reconcile_platform_stats` periodically recounts everything to
+correct any drift.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from apps.core.utils import get_tenant_schema_name, is_schema_tenancy, tenant_scope
+
+from .models import PlatformStats, Tenant
+from .provisioning import schema_exists
+from .routers import get_tenant_only_apps
+from .sharding import get_tenant_shard
+
+
+COUNTERS = ['tenants', 'active_tenants', 'users', 'pages_draft', 'pages_published', 'templates', 'sections']
+
+
+def adjust(**deltas):
+    """
+    Add the deltas to the counters once the current transaction commits.
+    """
+    deltas = {counter: delta for counter, delta in deltas.items() if delta and counter in COUNTERS}
+    if not deltas:
+        return
+
+    def apply():
+        updated = PlatformStats.objects.filter(pk=1).update(
+            updated_at=timezone.now(), **{counter: F(counter) + delta for counter, delta in deltas.items()},
+        )
+        if not updated:
+            reconcile()  # First change ever: start from the real counts
+
+    transaction.on_commit(apply)
+
+
+def get_platform_stats():
+    stats = PlatformStats.objects.filter(pk=1).first()
+    return stats if stats is not None else reconcile()
+
+
+# Counting
+
+def content_models():
+    from apps.pages.models import Page
+    from apps.sections.models import Section
+    from apps.templates.models import Template
+
+    return [Page, Template, Section]
+
+
+def per_schema_models():
+    """
+    Content models stored in every tenant schema (none outside schema tenancy).
+    """
+    if not is_schema_tenancy():
+        return []
+    tenant_only_apps = get_tenant_only_apps()
+    return [model for model in content_models() if model._meta.app_config.name in tenant_only_apps]
+
+
+def count_content(querysets):
+    """
+    Counters for the rows of the given page/template/section querysets.
+    """
+    counts = {}
+    for queryset in querysets:
+        if queryset.model._meta.label == 'pages.Page':
+            for status, count in queryset.order_by().values_list('status').annotate(count=Count('pk')):
+                counts[f'pages_{status}'] = counts.get(f'pages_{status}', 0) + count
+        else:
+            counter = f'{queryset.model._meta.model_name}s'
+            counts[counter] = counts.get(counter, 0) + queryset.count()
+    return counts
+
+
+def tenant_content_counts(tenant):
+    """
+    Counters for the content in the tenant's schema (schema tenancy), e.g.
+    to subtract before the schema is dropped.
+    """
+    with tenant_scope(tenant):
+        return count_content([model.objects.all() for model in per_schema_models()])
+
+
+def count_all():
+    counts = dict.fromkeys(COUNTERS, 0)
+    tenants = Tenant.objects.filter(deleted_at__isnull=True)  # Soft-deleted tenants are on their way out
+    counts['tenants'] = tenants.count()
+    counts['active_tenants'] = tenants.filter(is_active=True).count()
+    counts['users'] = get_user_model().objects.count()
+
+    per_schema = per_schema_models()
+    shared = [model._base_manager.all() for model in content_models() if model not in per_schema]
+    partials = [count_content(shared)]
+    if per_schema:
+        for tenant in Tenant.objects.order_by('created_at').iterator():
+            if schema_exists(get_tenant_schema_name(tenant), get_tenant_shard(tenant)):
+                partials.append(tenant_content_counts(tenant))
+    for partial in partials:
+        for counter, count in partial.items():
+            if counter in counts:
+                counts[counter] += count
+    return counts
+
+
+def reconcile():
+    """
+    Recount everything and store it. Returns the stats row; the counts it
+    replaced are available as `previous` (None for a new row) to report drift.
+    """
+    counts = count_all()
+    now = timezone.now()
+    with transaction.atomic():
+        stats = PlatformStats.objects.select_for_update().filter(pk=1).first()
+        previous = {counter: getattr(stats, counter) for counter in COUNTERS} if stats else None
+        stats, _ = PlatformStats.objects.update_or_create(
+            pk=1, defaults={**counts, 'updated_at': now, 'reconciled_at': now},
+        )
+    stats.previous = previous
+    return stats
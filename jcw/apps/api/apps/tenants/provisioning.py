@@ -0,0 +1,272 @@
+"""
+Building tenant schemas.
+
+A schema is either migrated from scratch (CREATE SCHEMA + migrate_schemas,
+replaying every tenant migration) or, with TENANT_PROVISION_METHOD='clone',
+copied in one pass from a maintained golden schema (TENANT_BASE_SCHEMA) with
+django-tenants' clone_schema() SQL function. `manage.py refresh_golden_schema`
+migrates the golden schema after a deploy and stamps it with the migration
+fingerprint; a golden schema with an older stamp is not cloned from.
+
+The golden schema holds no content rows, only migration state: cloned seed
+rows would share primary keys across tenants and collide when tenants are
+merged (row tenancy) or moved. Starter content is created per tenant by
+seed_tenant_content() instead.
+"""
+import hashlib
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import F
+from django.db.migrations.loader import MigrationLoader
+from django_tenants.clone import CLONE_SCHEMA_FUNCTION
+from django_tenants.utils import schema_context
+
+from apps.core.utils import is_schema_tenancy, tenant_scope
+
+
+@lru_cache(maxsize=None)
+def migration_fingerprint():
+    """
+    Hash of the latest migration of every tenant app. Computed once per
+    process: migrations only change with a deploy, which restarts workers.
+    """
+    from django.apps import apps
+
+    labels = {
+        app_config.label for app_config in apps.get_app_configs()
+        if app_config.name in getattr(settings, 'TENANT_APPS', [])
+    }
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    leaves = sorted(node for node in loader.graph.leaf_nodes() if node[0] in labels)
+    return hashlib.sha1(repr(leaves).encode()).hexdigest()
+
+
+def schema_exists(schema_name, using=DEFAULT_DB_ALIAS):
+    with connections[using].cursor() as cursor:
+        cursor.execute('SELECT 1 FROM pg_namespace WHERE nspname = %s', [schema_name])
+        return cursor.fetchone() is not None
+
+
+def drop_schema(schema_name, shard=DEFAULT_DB_ALIAS):
+    connection = connections[shard]
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP SCHEMA IF EXISTS {connection.ops.quote_name(schema_name)} CASCADE')
+
+
+def migrate_schema(schema_name, shard=DEFAULT_DB_ALIAS):
+    """
+    Create the schema if needed and apply the tenant migrations to it.
+    """
+    connection = connections[shard]
+    with connection.cursor() as cursor:
+        cursor.execute(f'CREATE SCHEMA IF NOT EXISTS {connection.ops.quote_name(schema_name)}')
+    try:
+        call_command('migrate_schemas', schema_name=schema_name, database=shard, interactive=False, verbosity=0)
+    finally:
+        connection.set_schema_to_public()
+
+
+def build_schema(schema_name, shard=DEFAULT_DB_ALIAS):
+    """
+    Create a fully migrated tenant schema, cloning the golden schema when
+    that is enabled and current. Returns 'clone' or 'migrate'.
+    """
+    if getattr(settings, 'TENANT_PROVISION_METHOD', 'migrate') == 'clone' and golden_is_current(shard):
+        clone_schema(get_golden_schema_name(), schema_name, shard)
+        return 'clone'
+    migrate_schema(schema_name, shard)
+    return 'migrate'
+
+
+# Golden schema
+
+def get_golden_schema_name():
+    return getattr(settings, 'TENANT_BASE_SCHEMA', '_golden')
+
+
+def golden_fingerprint(shard=DEFAULT_DB_ALIAS):
+    """
+    Migration fingerprint stamped on the golden schema, None if it is missing.
+    """
+    with connections[shard].cursor() as cursor:
+        cursor.execute(
+            "SELECT obj_description(oid, 'pg_namespace') FROM pg_namespace WHERE nspname = %s",
+            [get_golden_schema_name()],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def golden_is_current(shard=DEFAULT_DB_ALIAS):
+    return golden_fingerprint(shard) == migration_fingerprint()
+
+
+def refresh_golden_schema(shard=DEFAULT_DB_ALIAS):
+    """
+    Migrate the golden schema on `shard` and stamp it as current.
+    """
+    schema_name = get_golden_schema_name()
+    migrate_schema(schema_name, shard)
+    connection = connections[shard]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'COMMENT ON SCHEMA {connection.ops.quote_name(schema_name)} IS %s', [migration_fingerprint()]
+        )
+        install_clone_function(cursor, connection)
+
+
+def install_clone_function(cursor, connection):
+    cursor.execute("SELECT to_regproc('public.clone_schema')")
+    if cursor.fetchone()[0] is None:
+        db_user = connection.settings_dict.get('USER') or 'postgres'
+        cursor.execute(CLONE_SCHEMA_FUNCTION.format(db_user=db_user))
+
+
+def clone_schema(source, schema_name, shard=DEFAULT_DB_ALIAS):
+    """
+    Copy `source` (tables, sequences, indexes, constraints and rows) to a
+    new schema in one statement.
+    """
+    connection = connections[shard]
+    with connection.cursor() as cursor:
+        install_clone_function(cursor, connection)
+        cursor.execute('SELECT clone_schema(%s, %s, true, false)', [source, schema_name])
+
+
+# Starter content
+
+def seed_tenant_content(tenant):
+    """
+    Give a new tenant its default theme and the starter pages listed in
+    TENANT_STARTER_PAGES ((slug, title) pairs). Existing rows are kept, so
+    this is safe to re-run.
+    """
+    from apps.pages.models import Page
+    from apps.themes.models import SiteTheme
+
+    with tenant_scope(tenant):
+        if not SiteTheme.objects.exists():
+            SiteTheme.objects.create()
+        existing = set(Page.objects.values_list('slug', flat=True))
+        for slug, title in getattr(settings, 'TENANT_STARTER_PAGES', []):
+            if slug not in existing:
+                Page.objects.create(slug=slug, title=title)
+
+
+def onboarding_props(section, tenant):
+    """
+    Props for a section prefilled from onboarding data, limited to the
+    props the section declares in its json_schema.
+    """
+    values = {
+        'logo': tenant.business_name,
+        'title': tenant.business_name,
+        'business_name': tenant.business_name,
+        'subtitle': tenant.city,
+        'city': tenant.city,
+        'phone': tenant.contact_phone,
+        'contact_phone': tenant.contact_phone,
+        'contact_info': {'name': tenant.business_name, 'city': tenant.city, 'phone': tenant.contact_phone},
+    }
+    schema = section.json_schema if isinstance(section.json_schema, dict) else {}
+    return {key: value for key, value in values.items() if key in schema and value}
+
+
+def _template_source(tenant):
+    """
+    Where the template catalogue lives: the schema named by
+    TENANT_TEMPLATE_SCHEMA in schema tenancy (new schemas have no
+    templates), the shared tables otherwise.
+    """
+    if not is_schema_tenancy():
+        return tenant_scope(tenant)
+    source = getattr(settings, 'TENANT_TEMPLATE_SCHEMA', '')
+    if not source:
+        raise ImproperlyConfigured(
+            'TENANT_BOOTSTRAP_SITE needs TENANT_TEMPLATE_SCHEMA in schema tenancy: '
+            'the schema holding the templates and sections to build sites from'
+        )
+    return schema_context(source)
+
+
+def _copy_template(template, template_sections):
+    """
+    Schema tenancy: make sure the template, its sections and template
+    sections exist in the active tenant schema (matched on slug) and return
+    the local template and template sections.
+    """
+    from apps.sections.models import Section
+    from apps.templates.models import Template, TemplateSection
+
+    Section.objects.bulk_create([item.section for item in template_sections], ignore_conflicts=True)
+    Template.objects.bulk_create([template], ignore_conflicts=True)
+    local = Template.objects.get(slug=template.slug)
+    sections = Section.objects.in_bulk([item.section.slug for item in template_sections], field_name='slug')
+    TemplateSection.objects.bulk_create([
+        TemplateSection(
+            template=local,
+            section=sections[item.section.slug],
+            order_index=item.order_index,
+            is_required=item.is_required,
+            placement_constraints=item.placement_constraints,
+        )
+        for item in template_sections
+    ], ignore_conflicts=True)
+    return local, list(local.template_sections.select_related('section').order_by('order_index'))
+
+
+def bootstrap_site(tenant):
+    """
+    Build the home page from the default Template for the tenant's website
+    type: all its sections in one bulk insert, prefilled with onboarding
+    data. Skipped when there is no default template or the home page
+    already has sections. Returns the home page, or None.
+    """
+    from apps.core.cache import current_namespace, tenant_cache
+    from apps.pages.models import Page, PageSection
+    from apps.templates.models import Template
+
+    with _template_source(tenant):
+        template = Template.objects.filter(
+            website_type=tenant.website_type, is_default=True, is_active=True,
+        ).first()
+        if template is None:
+            return None
+        template_sections = list(template.template_sections.select_related('section').order_by('order_index'))
+
+    with tenant_scope(tenant):
+        home = Page.objects.filter(slug='home').first()
+        if home is not None and home.page_sections.exists():
+            return None
+        if is_schema_tenancy():
+            template, template_sections = _copy_template(template, template_sections)
+
+        if home is None:
+            home = Page.objects.create(
+                slug='home', title=tenant.business_name, status='published', template=template,
+            )
+        else:
+            # The seeded starter page
+            home.title, home.status, home.template = tenant.business_name, 'published', template
+            home.save(update_fields=['title', 'status', 'template', 'updated_at'])
+
+        PageSection.objects.bulk_create([
+            PageSection(
+                page=home,
+                tenant_id=home.tenant_id,  # bulk_create skips PageSection.save()
+                section=template_section.section,
+                order_index=template_section.order_index,
+                props_data=onboarding_props(template_section.section, tenant),
+            )
+            for template_section in template_sections
+        ])
+        # No signals from bulk_create: drop whatever was cached for the empty site
+        tenant_cache.for_namespace(current_namespace()).invalidate()
+
+    with _template_source(tenant):
+        Template.objects.filter(slug=template.slug).update(used_by_count=F('used_by_count') + 1)
+    return home
@@ -0,0 +1,169 @@
+"""
+Static publishing of tenant websites.
+
+A tenant's website snapshot is rendered to plain HTML/CSS under
+
+    PUBLISH_ROOT/<slug>/releases/<release>/   index.html, <page>/index.html, theme.css
+    PUBLISH_ROOT/<slug>/current               symlink to the live release
+    PUBLISH_ROOT/<slug>/CURRENT               name of the live release
+
+Each release is written to a temporary directory and renamed into place, then
+`current` and `CURRENT` are swapped with os.replace(), so a web server never
+sees a half-written site. Where symlinks are unavailable (Windows without
+developer mode) only the CURRENT pointer file is maintained.
+"""
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .snapshots import get_fresh_snapshot
+
+
+def get_publish_root():
+    return Path(getattr(settings, 'PUBLISH_ROOT', settings.BASE_DIR / 'published'))
+
+
+def render_theme_css(document):
+    theme = document.get('theme') or {}
+    lines = [
+        ':root {',
+        f"  --jcw-primary: {theme.get('primary_color', '#3b82f6')};",
+        f"  --jcw-secondary: {theme.get('secondary_color', '#64748b')};",
+        f"  --jcw-font-heading: '{theme.get('font_family_heading', 'Inter')}', sans-serif;",
+        f"  --jcw-font-body: '{theme.get('font_family_body', 'Inter')}', sans-serif;",
+        '}',
+        'body { font-family: var(--jcw-font-body); margin: 0; }',
+        'h1, h2, h3 { font-family: var(--jcw-font-heading); }',
+        'a { color: var(--jcw-primary); }',
+    ]
+    for css in (document.get('template_css'), theme.get('custom_css')):
+        if css:
+            lines.append(css)
+    return '\n'.join(lines) + '\n'
+
+
+def render_site(document):
+    """
+    Return {relative_path: content} for every file of the published site.
+    """
+    pages = document.get('pages', [])
+    home = next((page for page in pages if page['slug'] == 'home'), pages[0] if pages else None)
+    nav = [
+        {'slug': page['slug'], 'title': page['title'], 'path': '' if page is home else f"{page['slug']}/"}
+        for page in pages
+    ]
+
+    files = {'theme.css': render_theme_css(document)}
+    files['index.html'] = render_to_string('tenants/published/page.html', {
+        'site': document, 'page': home, 'nav': nav, 'prefix': './', 'is_home': True,
+    })
+    for page in pages:
+        if page is home:
+            continue
+        files[f"{page['slug']}/index.html"] = render_to_string('tenants/published/page.html', {
+            'site': document, 'page': page, 'nav': nav, 'prefix': '../', 'is_home': False,
+        })
+    return files
+
+
+def current_release(slug):
+    pointer = get_publish_root() / slug / 'CURRENT'
+    try:
+        return pointer.read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _switch_current(site_dir, release):
+    """
+    Atomically point `current` (symlink) and `CURRENT` (pointer file) at a release.
+    """
+    token = uuid.uuid4().hex[:8]
+    tmp_link = site_dir / f'.current-{token}'
+    try:
+        os.symlink(Path('releases') / release, tmp_link, target_is_directory=True)
+        os.replace(tmp_link, site_dir / 'current')
+    except OSError:
+        if os.path.lexists(tmp_link):
+            os.unlink(tmp_link)
+
+    tmp_pointer = site_dir / f'.CURRENT-{token}'
+    tmp_pointer.write_text(release + '\n')
+    os.replace(tmp_pointer, site_dir / 'CURRENT')
+
+
+def _prune_releases(site_dir, keep):
+    releases_dir = site_dir / 'releases'
+    live = (site_dir / 'CURRENT').read_text().strip()
+    releases = sorted(
+        (path for path in releases_dir.iterdir() if path.is_dir() and not path.name.startswith('.')),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for path in releases[keep:]:
+        if path.name != live:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def publish_tenant(tenant, force=False):
+    """
+    Render a tenant's site into a new release and switch it live.
+    Returns (release_name, published) - published is False when the live
+    release already matches the current snapshot and force is not set.
+    """
+    snapshot = get_fresh_snapshot(tenant.slug)
+    site_dir = get_publish_root() / tenant.slug
+    releases_dir = site_dir / 'releases'
+
+    live = current_release(tenant.slug)
+    if live and not force:
+        try:
+            manifest = json.loads((releases_dir / live / 'manifest.json').read_text())
+        except (FileNotFoundError, ValueError):
+            manifest = {}
+        if manifest.get('snapshot_version') == snapshot.version and manifest.get('tenant_id') == str(tenant.pk):
+            return live, False
+
+    release = f"v{snapshot.version}-{timezone.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    releases_dir.mkdir(parents=True, exist_ok=True)
+    tmp_dir = releases_dir / f'.tmp-{release}'
+    try:
+        for relative_path, content in render_site(snapshot.document).items():
+            path = tmp_dir / relative_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding='utf-8')
+        (tmp_dir / 'manifest.json').write_text(json.dumps({
+            'tenant_id': str(tenant.pk),
+            'slug': tenant.slug,
+            'snapshot_version': snapshot.version,
+            'published_at': timezone.now().isoformat(),
+        }, indent=2))
+        os.rename(tmp_dir, releases_dir / release)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    _switch_current(site_dir, release)
+    _prune_releases(site_dir, getattr(settings, 'PUBLISH_KEEP_RELEASES', 3))
+    return release, True
+
+
+def unpublish_tenant(slug):
+    """
+    Take a tenant's static site offline: the site directory is renamed away
+    (atomic) and then removed. Returns False when nothing was published.
+    """
+    site_dir = get_publish_root() / slug
+    removed = site_dir.with_name(f'.removed-{slug}-{uuid.uuid4().hex[:8]}')
+    try:
+        os.rename(site_dir, removed)
+    except FileNotFoundError:
+        return False
+    shutil.rmtree(removed, ignore_errors=True)
+    return True
@@ -0,0 +1,119 @@
+"""
+Background tenant deletion.
+
+Deleting a tenant inside the request drops its schema (or, in row tenancy,
+deletes its rows from the shared tables) while holding locks that live
+traffic queues behind. Instead an admin delete only soft-deletes the tenant:
+it is deactivated, stamped with deleted_at and given a 'purge' job that runs
+TENANT_PURGE_DELAY seconds later, so it can be restored until then.
+
+The purge removes the data in bounded steps, one table (schema tenancy) or
+TENANT_PURGE_CHUNK_SIZE rows (row tenancy) at a time, pausing
+TENANT_PURGE_PAUSE seconds between steps, and deletes the tenant row last.
+A DROP TABLE that waits longer than TENANT_PURGE_LOCK_TIMEOUT milliseconds
+for its lock gives up, and the job retries later instead of blocking reads.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from apps.core.utils import get_tenant_schema_name
+
+from .models import TenantJob, WebsiteSnapshot
+from .provisioning import drop_schema
+from .publishing import unpublish_tenant
+from .sharding import get_tenant_shard
+
+
+def soft_delete_tenant(tenant):
+    """
+    Deactivate the tenant, take its site offline (snapshot and static
+    release) and schedule its purge. Returns the purge job.
+    """
+    with transaction.atomic():
+        job = TenantJob.objects.filter(tenant=tenant, kind='purge', status__in=['pending', 'running']).first()
+        if job is not None:
+            return job
+        tenant.is_active = False
+        tenant.deleted_at = timezone.now()
+        tenant.save(update_fields=['is_active', 'deleted_at', 'updated_at'])
+        WebsiteSnapshot.objects.filter(tenant=tenant).delete()
+        slug = tenant.slug
+        transaction.on_commit(lambda: unpublish_tenant(slug), robust=True)
+        return TenantJob.objects.create(
+            tenant=tenant,
+            kind='purge',
+            payload={
+                'slug': tenant.slug,
+                'schema_name': get_tenant_schema_name(tenant),
+                'shard': get_tenant_shard(tenant),
+            },
+            run_after=tenant.deleted_at + timedelta(seconds=getattr(settings, 'TENANT_PURGE_DELAY', 86400)),
+        )
+
+
+def restore_tenant(tenant):
+    """
+    Cancel a scheduled purge and reactivate the tenant. Returns False when
+    the purge has already started. The snapshot is rebuilt by the save's
+    signals; the static site comes back with the next publish.
+    """
+    with transaction.atomic():
+        jobs = TenantJob.objects.select_for_update().filter(
+            tenant=tenant, kind='purge', status__in=['pending', 'running'],
+        )
+        if any(job.status == 'running' for job in jobs):
+            return False
+        TenantJob.objects.filter(pk__in=[job.pk for job in jobs]).delete()
+        tenant.is_active = True
+        tenant.deleted_at = None
+        tenant.save(update_fields=['is_active', 'deleted_at', 'updated_at'])
+    return True
+
+
+def drop_schema_tables(schema_name, shard=DEFAULT_DB_ALIAS):
+    """
+    Drop the tables of a schema one per transaction, then the schema.
+    Yields (done, total) after each table.
+    """
+    connection = connections[shard]
+    lock_timeout = int(getattr(settings, 'TENANT_PURGE_LOCK_TIMEOUT', 5000))
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT tablename FROM pg_tables WHERE schemaname = %s', [schema_name])
+        tables = [row[0] for row in cursor.fetchall()]
+
+    for done, table in enumerate(tables, start=1):
+        with transaction.atomic(using=shard), connection.cursor() as cursor:
+            cursor.execute(f'SET LOCAL lock_timeout = {lock_timeout}')
+            cursor.execute('DROP TABLE IF EXISTS {}.{} CASCADE'.format(
+                connection.ops.quote_name(schema_name), connection.ops.quote_name(table),
+            ))
+        yield done, len(tables)
+    drop_schema(schema_name, shard)  # Only sequences and functions are left
+
+
+def delete_tenant_rows(tenant):
+    """
+    Delete the tenant's rows from the shared tables (row tenancy) in chunks
+    of TENANT_PURGE_CHUNK_SIZE. Yields (done, total) rows after each chunk.
+    """
+    from apps.core.models import tenant_scoped_models
+
+    chunk_size = getattr(settings, 'TENANT_PURGE_CHUNK_SIZE', 1000)
+    models = tenant_scoped_models()
+    # Children first, so a chunk never cascades into a whole subtree
+    models.sort(key=lambda model: -sum(
+        1 for field in model._meta.concrete_fields if field.is_relation and field.related_model in models
+    ))
+    total = sum(model.unscoped.filter(tenant=tenant).count() for model in models)
+    done = 0
+    for model in models:
+        while True:
+            pks = list(model.unscoped.filter(tenant=tenant).values_list('pk', flat=True)[:chunk_size])
+            if not pks:
+                break
+            model.unscoped.filter(pk__in=pks).delete()
+            done = min(done + len(pks), total)
+            yield done, total
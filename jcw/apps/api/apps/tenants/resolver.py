@@ -0,0 +1,144 @@
+"""
+Hostname -> tenant resolution for request routing.
+
+Lookups go through a per-worker LRU, then the shared cache, and only hit the
+database when neither knows the hostname. Any write to Tenant or Domain bumps
+a shared generation number; cache keys embed the generation, so a bump
+invalidates every worker at once without having to enumerate hostnames.
+"""
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .negative_cache import unknown_hosts
+
+
+ResolvedTenant = namedtuple('ResolvedTenant', ['id', 'schema_name', 'is_active', 'shard'])
+
+
+class TenantResolver:
+    """
+    Per-worker LRU of hostname -> ResolvedTenant backed by the shared cache.
+    """
+    key_prefix = 'tenant-resolver:v2'  # Bumped when ResolvedTenant changes shape
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._generation = None
+        self._generation_checked_at = 0.0
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'TENANT_RESOLVER_LRU_SIZE', 1024)
+
+    @property
+    def local_ttl(self):
+        # How long a worker trusts its LRU before re-reading the shared generation
+        return getattr(settings, 'TENANT_RESOLVER_LOCAL_TTL', 5)
+
+    @property
+    def cache_ttl(self):
+        return getattr(settings, 'TENANT_RESOLVER_CACHE_TTL', 3600)
+
+    def _generation_key(self):
+        return f'{self.key_prefix}:generation'
+
+    def _host_key(self, generation, hostname):
+        return f'{self.key_prefix}:{generation}:host:{hostname}'
+
+    def _current_generation(self):
+        now = time.monotonic()
+        if self._generation is None or now - self._generation_checked_at >= self.local_ttl:
+            generation = cache.get(self._generation_key(), 0)
+            with self._lock:
+                if generation != self._generation:
+                    self._entries.clear()
+                    self._generation = generation
+                self._generation_checked_at = now
+        return self._generation
+
+    def resolve(self, hostname):
+        """
+        Return a ResolvedTenant for the hostname, or None if no Domain matches.
+        Unknown hostnames are remembered in the negative cache.
+        """
+        generation = self._current_generation()
+
+        with self._lock:
+            resolved = self._entries.get(hostname)
+            if resolved is not None:
+                self._entries.move_to_end(hostname)
+                return resolved
+
+        key = self._host_key(generation, hostname)
+        resolved = cache.get(key)
+        if resolved is None:
+            if unknown_hosts.contains(hostname):
+                return None
+            resolved = self.load(hostname)
+            if resolved is None:
+                unknown_hosts.add(hostname)
+                return None
+            cache.set(key, tuple(resolved), self.cache_ttl)
+        else:
+            resolved = ResolvedTenant(*resolved)
+
+        self._remember(hostname, resolved)
+        return resolved
+
+    def load(self, hostname):
+        """
+        Resolve a hostname straight from the database.
+        """
+        from apps.core.utils import get_tenant_schema_name
+        from .models import Domain
+
+        domain = Domain.objects.select_related('tenant').filter(domain=hostname).first()
+        if domain is None:
+            return None
+        tenant = domain.tenant
+        return ResolvedTenant(tenant.pk, get_tenant_schema_name(tenant), tenant.is_active, tenant.shard)
+
+    def _remember(self, hostname, resolved):
+        with self._lock:
+            self._entries[hostname] = resolved
+            self._entries.move_to_end(hostname)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def as_tenant(self, resolved):
+        """
+        Build a Tenant instance from a resolved entry without a query.
+        Fields other than id/is_active/shard are deferred and load on first access.
+        """
+        from .models import Tenant
+
+        # from_db() takes values in model field order
+        loaded = {'id': resolved.id, 'shard': resolved.shard, 'is_active': resolved.is_active}
+        fields = [field.attname for field in Tenant._meta.concrete_fields if field.attname in loaded]
+        tenant = Tenant.from_db('default', fields, [loaded[name] for name in fields])
+        tenant.schema_name = resolved.schema_name
+        return tenant
+
+    def invalidate(self):
+        """
+        Drop every cached hostname, in this worker and (via the generation) in all others.
+        """
+        key = self._generation_key()
+        try:
+            generation = cache.incr(key)
+        except ValueError:
+            # Key missing (first write or evicted): start a fresh generation
+            generation = int(time.time())
+            cache.set(key, generation, None)
+        with self._lock:
+            self._entries.clear()
+            self._generation = generation
+            self._generation_checked_at = time.monotonic()
+
+
+tenant_resolver = TenantResolver()
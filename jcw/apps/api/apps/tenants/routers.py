@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django_tenants.routers import TenantSyncRouter
+from django_tenants.utils import get_public_schema_name
+
+from apps.core.utils import get_current_tenant, is_schema_tenancy
+
+from .sharding import check_writes_allowed, get_shard_aliases, get_tenant_shard
+
+
+def get_tenant_only_apps():
+    shared_apps = set(settings.SHARED_APPS)
+    return {app for app in settings.TENANT_APPS if app not in shared_apps}
+
+
+class LazyTenantRouter:
+    """
+    Activates the pending tenant of a public route the first time a
+    tenant-scoped model is queried. Never chooses a database itself.
+    """
+
+    def __init__(self):
+        self.tenant_only_apps = get_tenant_only_apps()
+
+    def _activate_for(self, model):
+        if model._meta.app_config.name not in self.tenant_only_apps:
+            return
+        # Explicit schema switches (tenant_scope, schema_context) take precedence
+        if connection.schema_name != get_public_schema_name():
+            return
+        from .middleware import activate_pending_tenant
+        activate_pending_tenant()
+
+    def db_for_read(self, model, **hints):
+        self._activate_for(model)
+        return None
+
+    def db_for_write(self, model, **hints):
+        self._activate_for(model)
+        return None
+
+
+class ShardRouter:
+    """
+    Sends tenant-scoped queries to the shard holding the active tenant's
+    schema, rejects them while the tenant is frozen for a move, and lets
+    every shard migrate its public and tenant schemas.
+    """
+
+    def __init__(self):
+        self.tenant_only_apps = get_tenant_only_apps()
+        self.shards = get_shard_aliases()
+
+    def _shard_for(self, model):
+        if len(self.shards) == 1 or model._meta.app_config.name not in self.tenant_only_apps:
+            return None, None
+        if not is_schema_tenancy():
+            return None, None
+        tenant = get_current_tenant()
+        if tenant is None:
+            return None, None
+        return get_tenant_shard(tenant), tenant
+
+    def db_for_read(self, model, **hints):
+        return self._shard_for(model)[0]
+
+    def db_for_write(self, model, **hints):
+        alias, tenant = self._shard_for(model)
+        if alias is not None:
+            check_writes_allowed(tenant.pk)
+        return alias
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Shared rows referenced by tenant rows are mirrored on every shard
+        if obj1._state.db in self.shards and obj2._state.db in self.shards:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == DEFAULT_DB_ALIAS or db not in self.shards:
+            return None  # TenantSyncRouter decides for the default database
+        if connections[db].schema_name == get_public_schema_name():
+            installed_apps = settings.SHARED_APPS
+        else:
+            installed_apps = settings.TENANT_APPS
+        return TenantSyncRouter().app_in_list(app_label, installed_apps)
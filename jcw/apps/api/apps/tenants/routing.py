@@ -0,0 +1,94 @@
+"""
+Routing manifest for the frontend edge.
+
+The Next.js middleware keeps every active slug/domain in memory and refreshes
+it with ?since=<version>, instead of calling /api/tenants/by-slug/ per request.
+Versions are RoutingChange ids; changes are recorded after commit and the log
+table is locked while inserting, so ids become visible in increasing order and
+a client never skips a change by syncing past an uncommitted one.
+"""
+from django.db import connection, transaction
+from django.db.models import Max, Min
+
+from .models import Domain, RoutingChange, Tenant
+
+
+def current_version():
+    return RoutingChange.objects.aggregate(version=Max('id'))['version'] or 0
+
+
+def _routing_state(tenant_id):
+    tenant = Tenant.objects.filter(pk=tenant_id).only('slug', 'is_active').first()
+    if tenant is None:
+        return None
+    domains = sorted(Domain.objects.filter(tenant_id=tenant_id).values_list('domain', flat=True))
+    return {'slug': tenant.slug, 'domains': domains, 'is_active': tenant.is_active}
+
+
+def record_routing_change(tenant_id):
+    """
+    Append the tenant's current routing state to the log, unless it matches
+    the last recorded state (e.g. a save that only touched business_name).
+    """
+    state = _routing_state(tenant_id)
+    last = RoutingChange.objects.filter(tenant_id=tenant_id).order_by('-id').first()
+
+    if state is None:
+        if last is None or last.is_deleted:
+            return None
+        state = {'slug': last.slug, 'domains': [], 'is_active': False, 'is_deleted': True}
+    elif last is not None and not last.is_deleted and (
+        last.slug, last.domains, last.is_active
+    ) == (state['slug'], state['domains'], state['is_active']):
+        return None
+
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            # Serialize writers so versions commit in id order
+            with connection.cursor() as cursor:
+                cursor.execute(f'LOCK TABLE {RoutingChange._meta.db_table} IN EXCLUSIVE MODE')
+        return RoutingChange.objects.create(tenant_id=tenant_id, **state)
+
+
+def _entry(tenant_id, slug, domains):
+    return {'id': str(tenant_id), 'slug': slug, 'domains': domains}
+
+
+def build_full_manifest():
+    # Read the version first: anything committed after it is replayed by the next delta
+    version = current_version()
+    domains = {}
+    for tenant_id, domain in Domain.objects.filter(tenant__is_active=True).values_list('tenant_id', 'domain'):
+        domains.setdefault(tenant_id, []).append(domain)
+
+    tenants = [
+        _entry(tenant_id, slug, sorted(domains.get(tenant_id, [])))
+        for tenant_id, slug in Tenant.objects.filter(is_active=True).order_by('slug').values_list('id', 'slug')
+    ]
+    return {'version': version, 'full': True, 'tenants': tenants, 'removed': []}
+
+
+def build_manifest(since=None):
+    """
+    Return the full routing table, or only what changed after `since`.
+    Falls back to the full table when `since` predates the retained log.
+    """
+    if since is None:
+        return build_full_manifest()
+
+    bounds = RoutingChange.objects.aggregate(oldest=Min('id'), version=Max('id'))
+    version = bounds['version'] or 0
+    if since > version or (bounds['oldest'] is not None and since < bounds['oldest'] - 1):
+        return build_full_manifest()
+
+    latest = {}
+    for change in RoutingChange.objects.filter(id__gt=since, id__lte=version).order_by('id'):
+        latest[change.tenant_id] = change
+
+    tenants, removed = [], []
+    for tenant_id, change in latest.items():
+        if change.is_active and not change.is_deleted:
+            tenants.append(_entry(tenant_id, change.slug, change.domains))
+        else:
+            removed.append(str(tenant_id))
+    return {'version': version, 'full': False, 'tenants': tenants, 'removed': removed}
@@ -0,0 +1,139 @@
+"""
+Warm pool of pre-migrated tenant schemas.
+
+`manage.py refill_schema_pool` keeps TENANT_SCHEMA_POOL_SIZE empty schemas
+per shard, fully migrated for the current TENANT_APPS. Provisioning claims
+one with ALTER SCHEMA ... RENAME instead of running every tenant migration.
+Pool schemas are named "_pool_<hex>": tenant schema names come from slugs,
+which never start with an underscore, so they cannot collide.
+
+Each entry is stored on the shard holding its schema, so a claim renames
+the schema and deletes the entry in one transaction on that database.
+
+Entries carry a fingerprint of the tenant migration state; after a deploy
+with new migrations old entries are no longer claimed and the refill loop
+replaces them. Claim counters live in the shared cache, since claims happen
+in job workers and the metrics are read from the web process.
+"""
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from apps.core.benchmarks import percentiles
+
+from .models import SchemaPoolEntry
+from .provisioning import build_schema, drop_schema, migration_fingerprint
+from .sharding import get_shard_aliases
+
+
+STATS_KEY = 'schema-pool:stats'
+LATENCY_KEY = 'schema-pool:latency'
+LATENCY_SAMPLES = 200
+
+
+def get_pool_size():
+    return getattr(settings, 'TENANT_SCHEMA_POOL_SIZE', 0)
+
+
+def claim_schema(schema_name, shard=DEFAULT_DB_ALIAS):
+    """
+    Rename a pooled schema on `shard` to `schema_name`. Returns False when
+    the pool has no current entry, and the caller builds the schema itself.
+    """
+    started = time.perf_counter()
+    connection = connections[shard]
+    with transaction.atomic(using=shard):
+        entry = (
+            SchemaPoolEntry.objects.using(shard).select_for_update(skip_locked=True)
+            .filter(shard=shard, fingerprint=migration_fingerprint())
+            .first()
+        )
+        if entry is None:
+            _record_claim(None)
+            return False
+        # Entry and schema are on the same database: the rename commits with the delete
+        with connection.cursor() as cursor:
+            cursor.execute('ALTER SCHEMA {} RENAME TO {}'.format(
+                connection.ops.quote_name(entry.schema_name), connection.ops.quote_name(schema_name),
+            ))
+        entry.delete()
+    _record_claim(time.perf_counter() - started)
+    return True
+
+
+def create_pool_schema(shard=DEFAULT_DB_ALIAS):
+    """
+    Build one pool schema, then register it as claimable.
+    """
+    schema_name = f'_pool_{uuid.uuid4().hex[:12]}'
+    try:
+        build_schema(schema_name, shard)
+    except Exception:
+        drop_schema(schema_name, shard)
+        raise
+    return SchemaPoolEntry.objects.using(shard).create(
+        schema_name=schema_name, shard=shard, fingerprint=migration_fingerprint(),
+    )
+
+
+def refill(shard=DEFAULT_DB_ALIAS, size=None):
+    """
+    Drop entries built for older migrations and top the shard's pool up to
+    `size`. Returns (created, dropped).
+    """
+    size = get_pool_size() if size is None else size
+    entries = SchemaPoolEntry.objects.using(shard).filter(shard=shard)
+    stale = [(entries, entries.exclude(fingerprint=migration_fingerprint()))]
+    if shard != DEFAULT_DB_ALIAS:
+        # Entries registered on 'default' by earlier versions
+        legacy = SchemaPoolEntry.objects.using(DEFAULT_DB_ALIAS).filter(shard=shard)
+        stale.append((legacy, legacy))
+    dropped = 0
+    for queryset, outdated in stale:
+        for entry in outdated:
+            # Delete the row first, so a claim can never pick a schema being dropped
+            if queryset.filter(pk=entry.pk).delete()[0]:
+                drop_schema(entry.schema_name, shard)
+                dropped += 1
+
+    created = 0
+    missing = size - entries.count()
+    for _ in range(max(0, missing)):
+        create_pool_schema(shard)
+        created += 1
+    return created, dropped
+
+
+# Metrics
+
+def _record_claim(seconds):
+    stats = cache.get(STATS_KEY) or {'claims': 0, 'empty': 0}
+    if seconds is None:
+        stats['empty'] += 1
+    else:
+        stats['claims'] += 1
+        samples = cache.get(LATENCY_KEY) or []
+        cache.set(LATENCY_KEY, (samples + [seconds])[-LATENCY_SAMPLES:], None)
+    # Read-modify-write: concurrent claims may drop a count, fine for metrics
+    cache.set(STATS_KEY, stats, None)
+
+
+def pool_stats():
+    stats = cache.get(STATS_KEY) or {'claims': 0, 'empty': 0}
+    attempts = stats['claims'] + stats['empty']
+    fingerprint = migration_fingerprint()
+    ready = {
+        alias: SchemaPoolEntry.objects.using(alias).filter(shard=alias, fingerprint=fingerprint).count()
+        for alias in get_shard_aliases()
+    }
+    return {
+        'target_size': get_pool_size(),
+        'ready': ready,
+        'claims': stats['claims'],
+        'empty': stats['empty'],
+        'empty_rate': round(stats['empty'] / attempts, 4) if attempts else 0.0,
+        'claim_latency': percentiles(cache.get(LATENCY_KEY) or []),
+    }
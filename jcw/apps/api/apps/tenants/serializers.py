@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Tenant, Domain
+from .models import Tenant, Domain, TenantJob
 
 
 class DomainSerializer(serializers.ModelSerializer):
@@ -16,7 +16,48 @@ class TenantSerializer(serializers.ModelSerializer):
         model = Tenant
         fields = [
             'id', 'slug', 'business_name', 'industry_category', 'city', 'country',
-            'contact_email', 'contact_phone', 'website_url', 'plan', 'is_active', 
-            'dev_url', 'domains', 'created_at', 'updated_at'
+            'contact_email', 'contact_phone', 'website_url', 'plan', 'website_type', 'is_active', 
+            'dev_url', 'domains', 'deleted_at', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
\ No newline at end of file
+        read_only_fields = ['id', 'deleted_at', 'created_at', 'updated_at']
+
+
+class TenantJobSerializer(serializers.ModelSerializer):
+    slug = serializers.ReadOnlyField(source='tenant.slug')
+    dev_url = serializers.ReadOnlyField(source='tenant.dev_url')
+    error = serializers.SerializerMethodField()
+    stats = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = TenantJob
+        fields = [
+            'id', 'kind', 'status', 'step', 'progress', 'attempts', 'max_attempts',
+            'error', 'stats', 'slug', 'dev_url', 'created_at', 'updated_at', 'finished_at'
+        ]
+        read_only_fields = fields
+    
+    def get_error(self, obj):
+        # Only the last line of the traceback; the full text stays in the database
+        lines = obj.error.strip().splitlines()
+        return lines[-1] if lines else ''
+    
+    def get_stats(self, obj):
+        # Written by handlers that measure their work (clone: rows per second)
+        return obj.payload.get('stats')
+
+
+class TenantCloneSerializer(serializers.Serializer):
+    business_name = serializers.CharField(max_length=100)
+    contact_email = serializers.EmailField(required=False)
+
+
+class TenantPurgeSerializer(TenantJobSerializer):
+    # The tenant row is gone once purged; the job payload keeps its slug
+    slug = serializers.ReadOnlyField(source='payload.slug')
+    
+    class Meta(TenantJobSerializer.Meta):
+        fields = [
+            'id', 'tenant', 'slug', 'status', 'step', 'progress', 'attempts', 'max_attempts',
+            'error', 'run_after', 'created_at', 'updated_at', 'finished_at'
+        ]
+        read_only_fields = fields
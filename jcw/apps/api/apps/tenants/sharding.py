@@ -0,0 +1,209 @@
+"""
+Placement of tenant schemas on database shards.
+
+Each tenant lives on one shard (`Tenant.shard`, a DATABASES alias listed in
+TENANT_SHARDS); shared apps always stay on 'default'. A pluggable placement
+policy (TENANT_SHARD_POLICY) picks the shard when a tenant is created, and
+ShardRouter sends tenant-scoped queries to the owning shard.
+
+While a tenant is being moved its writes are frozen: the flag lives in the
+shared cache so every worker sees it at once.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Count
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class TenantWriteFrozen(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'This site is being moved, please retry in a few seconds.'
+    default_code = 'tenant_write_frozen'
+
+
+def get_shard_aliases():
+    return list(getattr(settings, 'TENANT_SHARDS', [DEFAULT_DB_ALIAS]))
+
+
+def get_tenant_shard(tenant):
+    """
+    Database alias holding a tenant's schema.
+    """
+    return getattr(tenant, 'shard', None) or DEFAULT_DB_ALIAS
+
+
+def tenant_connections(tenant):
+    """
+    Connections that must point at the tenant's schema: 'default' (shared
+    apps, search_path) and the tenant's shard when it is elsewhere.
+    """
+    aliases = [DEFAULT_DB_ALIAS]
+    shard = get_tenant_shard(tenant)
+    if shard != DEFAULT_DB_ALIAS:
+        aliases.append(shard)
+    return [connections[alias] for alias in aliases]
+
+
+def activate_tenant(tenant):
+    """
+    Point every connection the tenant needs at its schema.
+    """
+    for conn in tenant_connections(tenant):
+        conn.set_tenant(tenant)
+
+
+def mirror_to_shards(instance):
+    """
+    Upsert a shared row (tenant, user) on every other shard, together with
+    the shared rows it references, so tenant rows there keep valid foreign
+    keys. Deletions are not mirrored: stale copies are only FK targets.
+    """
+    model = type(instance)
+    for field in model._meta.concrete_fields:
+        if field.is_relation and getattr(instance, field.attname) is not None:
+            mirror_to_shards(getattr(instance, field.name))
+
+    fields = model._meta.concrete_fields
+    for alias in get_shard_aliases():
+        if alias == DEFAULT_DB_ALIAS:
+            continue
+        # A detached copy, bulk_create would otherwise rebind instance to the shard
+        copy = model(**{field.attname: getattr(instance, field.attname) for field in fields})
+        model._base_manager.using(alias).bulk_create(
+            [copy],
+            update_conflicts=True,
+            unique_fields=[model._meta.pk.name],
+            update_fields=[field.name for field in fields if not field.primary_key],
+        )
+
+
+class PlacementPolicy:
+    """
+    Chooses the shard of a new tenant. Subclasses implement choose().
+    """
+
+    def choose(self, tenant, shards):
+        raise NotImplementedError
+
+    def choose_many(self, tenants, shards):
+        """
+        Shards for a batch of new tenants (bulk imports), in order.
+        """
+        return [self.choose(tenant, shards) for tenant in tenants]
+
+
+class LeastLoadedPolicy(PlacementPolicy):
+    """
+    Place on the shard with the fewest tenants (first listed shard on ties).
+
+    Counts live in the shared cache: the tenants table is counted once per
+    TENANT_SHARD_COUNT_TTL, and every placement increments its shard right
+    away, so a signup runs no query and concurrent signups spread out. A
+    placement whose tenant is never saved is corrected by the next recount.
+    """
+
+    def _key(self, alias):
+        return f'tenant-shard-load:{alias}'
+
+    def shard_counts(self, shards):
+        keys = {alias: self._key(alias) for alias in shards}
+        cached = cache.get_many(list(keys.values()))
+        if len(cached) == len(keys):
+            return {alias: cached[key] for alias, key in keys.items()}
+
+        from .models import Tenant
+
+        counts = {
+            row['shard'] or DEFAULT_DB_ALIAS: row['count']
+            for row in Tenant.objects.order_by().values('shard').annotate(count=Count('id'))
+        }
+        cache.set_many(
+            {key: counts.get(alias, 0) for alias, key in keys.items()},
+            getattr(settings, 'TENANT_SHARD_COUNT_TTL', 300),
+        )
+        return counts
+
+    def reserve(self, alias, count=1):
+        try:
+            cache.incr(self._key(alias), count)
+        except ValueError:
+            pass  # Expired: the next placement recounts
+
+    def choose(self, tenant, shards):
+        return self.choose_many([tenant], shards)[0]
+
+    def choose_many(self, tenants, shards):
+        # One count lookup for the batch, then balance in memory
+        counts = self.shard_counts(shards)
+        chosen = []
+        for _ in tenants:
+            alias = min(shards, key=lambda alias: (counts.get(alias, 0), shards.index(alias)))
+            counts[alias] = counts.get(alias, 0) + 1
+            chosen.append(alias)
+        for alias in set(chosen):
+            self.reserve(alias, chosen.count(alias))
+        return chosen
+
+
+class HashPolicy(PlacementPolicy):
+    """
+    Stable placement from the slug; needs no query but ignores load.
+    """
+
+    def choose(self, tenant, shards):
+        digest = hashlib.md5(tenant.slug.encode()).hexdigest()
+        return shards[int(digest, 16) % len(shards)]
+
+
+def get_placement_policy():
+    return import_string(getattr(settings, 'TENANT_SHARD_POLICY', 'apps.tenants.sharding.LeastLoadedPolicy'))()
+
+
+def choose_shard(tenant):
+    shards = get_shard_aliases()
+    if len(shards) == 1:
+        return shards[0]
+    return get_placement_policy().choose(tenant, shards)
+
+
+def choose_shards(tenants):
+    shards = get_shard_aliases()
+    if len(shards) == 1:
+        return [shards[0]] * len(tenants)
+    return get_placement_policy().choose_many(tenants, shards)
+
+
+# Write freeze
+
+def _freeze_key(tenant_id):
+    return f'tenant-shard-freeze:{tenant_id}'
+
+
+def freeze_writes(tenant_id, timeout=300):
+    """
+    Reject writes to the tenant's models until unfreeze_writes(); the timeout
+    is a safety net should the mover die.
+    """
+    cache.set(_freeze_key(tenant_id), True, timeout)
+
+
+def unfreeze_writes(tenant_id):
+    cache.delete(_freeze_key(tenant_id))
+
+
+def is_write_frozen(tenant_id):
+    return bool(cache.get(_freeze_key(tenant_id)))
+
+
+def check_writes_allowed(tenant_id):
+    """
+    Raise TenantWriteFrozen while the tenant is frozen. ShardRouter checks
+    ORM writes; code writing tenant data with raw SQL calls this itself.
+    """
+    if is_write_frozen(tenant_id):
+        raise TenantWriteFrozen()
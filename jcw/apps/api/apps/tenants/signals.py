@@ -0,0 +1,229 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import Domain, Tenant
+from . import platform_stats
+from .negative_cache import unknown_hosts, unknown_slugs
+from .resolver import tenant_resolver
+from .routing import record_routing_change
+from .sharding import get_shard_aliases, mirror_to_shards
+from .slug_index import slug_index
+from .snapshots import mark_stale, rebuild_snapshot, tenants_using
+
+
+@receiver(post_save, sender=Tenant)
+@receiver(post_delete, sender=Tenant)
+@receiver(post_save, sender=Domain)
+@receiver(post_delete, sender=Domain)
+def invalidate_tenant_routing(sender, instance, **kwargs):
+    """
+    Drop cached hostname routing once the change is committed, so no worker
+    can re-cache the old row in between.
+    """
+    transaction.on_commit(tenant_resolver.invalidate)
+
+
+@receiver(post_save, sender=Tenant)
+def purge_unknown_slug(sender, instance, **kwargs):
+    """
+    A slug that now exists (or was reactivated) must not keep answering 404.
+    """
+    transaction.on_commit(lambda: unknown_slugs.purge(instance.slug))
+
+
+@receiver(post_save, sender=Tenant)
+def index_tenant_slug(sender, instance, **kwargs):
+    """
+    Keep this worker's typeahead slug index current; other workers catch up
+    from the routing change log.
+    """
+    transaction.on_commit(lambda: slug_index.add(instance.pk, instance.slug))
+
+
+@receiver(post_delete, sender=Tenant)
+def unindex_tenant_slug(sender, instance, **kwargs):
+    tenant_id = instance.pk
+    transaction.on_commit(lambda: slug_index.discard(tenant_id))
+
+
+@receiver(post_save, sender=Domain)
+def purge_unknown_host(sender, instance, **kwargs):
+    transaction.on_commit(lambda: unknown_hosts.purge(instance.domain))
+
+
+@receiver(post_save, sender=Tenant)
+@receiver(post_delete, sender=Tenant)
+@receiver(post_save, sender=Domain)
+@receiver(post_delete, sender=Domain)
+def log_routing_change(sender, instance, **kwargs):
+    """
+    Append to the routing manifest log after commit, once the new state is readable.
+    """
+    tenant_id = instance.pk if sender is Tenant else instance.tenant_id
+    transaction.on_commit(lambda: record_routing_change(tenant_id))
+
+
+def _rebuild_snapshot_after_commit(tenant_id):
+    mark_stale([tenant_id])
+
+    def rebuild():
+        tenant = Tenant.objects.filter(pk=tenant_id, deleted_at__isnull=True).first()
+        if tenant is not None:
+            rebuild_snapshot(tenant)
+
+    transaction.on_commit(rebuild)
+
+
+@receiver(post_save, sender=Tenant)
+@receiver(post_save, sender=Domain)
+@receiver(post_delete, sender=Domain)
+def refresh_website_snapshot(sender, instance, **kwargs):
+    tenant_id = instance.pk if sender is Tenant else instance.tenant_id
+    _rebuild_snapshot_after_commit(tenant_id)
+
+
+@receiver(post_save, sender='pages.Page')
+@receiver(post_delete, sender='pages.Page')
+@receiver(post_save, sender='pages.PageSection')
+@receiver(post_delete, sender='pages.PageSection')
+@receiver(post_save, sender='themes.SiteTheme')
+@receiver(post_delete, sender='themes.SiteTheme')
+def refresh_tenant_content_snapshot(sender, instance, **kwargs):
+    """
+    Tenant content changed: rebuild that tenant's snapshot, or mark every
+    snapshot stale when the tenant is unknown (simple mode shares these tables).
+    """
+    from apps.core.utils import get_current_tenant
+
+    tenant_id = getattr(instance, 'tenant_id', None)  # Row-level tenancy
+    if tenant_id is None:
+        tenant = get_current_tenant()
+        tenant_id = tenant.pk if tenant is not None else None
+    if tenant_id is not None:
+        _rebuild_snapshot_after_commit(tenant_id)
+    else:
+        mark_stale()
+
+
+@receiver(post_save, sender='pages.Page')
+@receiver(post_delete, sender='pages.Page')
+def publish_static_site(sender, instance, **kwargs):
+    """
+    Publishing (or unpublishing) a page queues a 'publish' job that renders
+    the tenant's static site in the background; edits made while it waits
+    share it.
+    """
+    from apps.core.utils import get_current_tenant
+    from .jobs import enqueue_publish
+    from .publishing import current_release
+
+    if not getattr(settings, 'PUBLISH_ON_PAGE_PUBLISH', False):
+        return
+    tenant = None
+    tenant_id = getattr(instance, 'tenant_id', None)
+    if tenant_id is None:
+        tenant = get_current_tenant()
+        tenant_id = tenant.pk if tenant is not None else None
+    if tenant_id is None:
+        return
+    if instance.status != 'published':
+        # Drafts only matter to a site that is already live
+        tenant = tenant or Tenant.objects.filter(pk=tenant_id).first()
+        if tenant is None or not current_release(tenant.slug):
+            return
+    enqueue_publish(tenant_id)
+
+
+@receiver(post_save, sender='sections.Section')
+@receiver(pre_delete, sender='sections.Section')
+@receiver(post_save, sender='templates.Template')
+@receiver(pre_delete, sender='templates.Template')
+def stale_shared_content_snapshots(sender, instance, **kwargs):
+    """
+    Mark the sites showing a shared section/template stale; they are rebuilt
+    lazily on read. Deletes are handled before the rows referencing it go.
+    """
+    mark_stale(tenants_using(instance))
+
+
+@receiver(pre_delete, sender=Tenant)
+def delete_row_tenant_data(sender, instance, **kwargs):
+    """
+    Row-level tenancy keeps tenant content in shared tables; remove it with the tenant.
+    """
+    from apps.core.models import tenant_scoped_models
+    from apps.core.utils import is_row_tenancy
+
+    if not is_row_tenancy():
+        return
+    for model in tenant_scoped_models():
+        model.unscoped.filter(tenant=instance).delete()
+
+
+@receiver(post_save, sender=Tenant)
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def mirror_shared_row(sender, instance, using, **kwargs):
+    """
+    Tenant rows on other shards reference tenants and users; keep a copy there.
+    """
+    if using != DEFAULT_DB_ALIAS or len(get_shard_aliases()) == 1:
+        return
+    transaction.on_commit(lambda: mirror_to_shards(instance))
+
+
+# Platform stats counters
+
+def _counted(instance):
+    """
+    The counters a tenant or page row adds to, or None when a field they
+    depend on is deferred (unknown). Soft-deleted tenants are not counted.
+    """
+    if isinstance(instance, Tenant):
+        if 'is_active' not in instance.__dict__ or 'deleted_at' not in instance.__dict__:
+            return None
+        listed = instance.deleted_at is None
+        return {'tenants': int(listed), 'active_tenants': int(listed and instance.is_active)}
+    if 'status' not in instance.__dict__:
+        return None
+    return {f'pages_{instance.status}': 1}
+
+
+@receiver(post_init, sender=Tenant)
+@receiver(post_init, sender='pages.Page')
+def remember_counted_state(sender, instance, **kwargs):
+    """
+    Keep what the loaded row counts for, so a save can tell whether it
+    changed without querying.
+    """
+    instance._counted_state = _counted(instance)
+
+
+@receiver(post_save, sender=Tenant)
+@receiver(post_delete, sender=Tenant)
+@receiver(post_save, sender='pages.Page')
+@receiver(post_delete, sender='pages.Page')
+def count_tenant_or_page(sender, instance, created=False, **kwargs):
+    previous = {} if created else getattr(instance, '_counted_state', None)
+    current = {} if kwargs['signal'] is post_delete else _counted(instance)
+    instance._counted_state = current
+    if previous is None or current is None:
+        return  # Unknown before or after: assume unchanged
+    platform_stats.adjust(**{
+        counter: current.get(counter, 0) - previous.get(counter, 0) for counter in {*previous, *current}
+    })
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+@receiver(post_save, sender='templates.Template')
+@receiver(post_delete, sender='templates.Template')
+@receiver(post_save, sender='sections.Section')
+@receiver(post_delete, sender='sections.Section')
+def count_row(sender, instance, created=False, **kwargs):
+    counter = 'users' if sender._meta.label == settings.AUTH_USER_MODEL else f'{sender._meta.model_name}s'
+    if kwargs['signal'] is post_delete:
+        platform_stats.adjust(**{counter: -1})
+    elif created:
+        platform_stats.adjust(**{counter: 1})
@@ -0,0 +1,154 @@
+"""
+Per-worker index of taken tenant slugs for the onboarding typeahead.
+
+CheckSlugView is called on every keystroke; answering from a sorted list in
+memory avoids a query per call. The list holds every tenant slug (active or
+not) plus RESERVED_SLUGS. This worker's own creates/deletes are applied by
+signals after commit; other workers' changes are replayed from the routing
+change log every TENANT_RESOLVER_LOCAL_TTL seconds (a full reload if the log
+was pruned past our version). Suggestions can therefore be a few seconds
+stale, which is fine: the final submission allocates against the database.
+"""
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.db.models import Max, Min
+
+from apps.core.utils import RESERVED_SLUGS, next_free_slug
+
+
+class SlugIndex:
+    """
+    Sorted list of taken slugs, synced from the RoutingChange log.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._slugs = None  # Sorted; None until first use
+        self._tenant_slugs = {}  # tenant_id -> slug, to apply renames and deletes
+        self._version = 0
+        self._synced_at = 0.0
+        self.lookups = 0
+        self.reloads = 0
+        self.deltas = 0
+
+    @property
+    def sync_interval(self):
+        return getattr(settings, 'TENANT_RESOLVER_LOCAL_TTL', 5)
+
+    def is_available(self, slug):
+        self._sync()
+        with self._lock:
+            self.lookups += 1
+            return not self._contains(slug)
+
+    def suggest(self, base_slug, max_length=30):
+        """
+        The slug ensure_unique_tenant_slug() would currently pick, from memory.
+        """
+        self._sync()
+        with self._lock:
+            self.lookups += 1
+            return next_free_slug(base_slug, self._with_prefix, max_length)
+
+    def allocate(self, base_slug, max_length=30):
+        """
+        Suggest a slug and mark it taken right away, so repeated calls (bulk
+        imports) never hand out the same slug twice.
+        """
+        self._sync()
+        with self._lock:
+            slug = next_free_slug(base_slug, self._with_prefix, max_length)
+            insort(self._slugs, slug)
+            return slug
+
+    def _contains(self, slug):
+        index = bisect_left(self._slugs, slug)
+        return index < len(self._slugs) and self._slugs[index] == slug
+
+    def _with_prefix(self, stem):
+        # '-' sorts before [a-z0-9], so stem and "stem-..." are contiguous
+        index = bisect_left(self._slugs, stem)
+        prefix = f'{stem}-'
+        while index < len(self._slugs):
+            slug = self._slugs[index]
+            if slug != stem and not slug.startswith(prefix):
+                break
+            yield slug
+            index += 1
+
+    # Updates
+
+    def add(self, tenant_id, slug):
+        with self._lock:
+            if self._slugs is not None:
+                self._set(tenant_id, slug)
+
+    def discard(self, tenant_id):
+        with self._lock:
+            if self._slugs is not None:
+                self._set(tenant_id, None)
+
+    def _set(self, tenant_id, slug):
+        previous = self._tenant_slugs.pop(tenant_id, None)
+        if previous is not None and previous not in RESERVED_SLUGS and self._contains(previous):
+            self._slugs.pop(bisect_left(self._slugs, previous))
+        if slug is not None:
+            self._tenant_slugs[tenant_id] = slug
+            if not self._contains(slug):
+                insort(self._slugs, slug)
+
+    def _sync(self):
+        if self._slugs is not None and time.monotonic() - self._synced_at < self.sync_interval:
+            return
+        from .models import RoutingChange
+
+        bounds = RoutingChange.objects.aggregate(oldest=Min('id'), version=Max('id'))
+        version = bounds['version'] or 0
+        if self._slugs is None or version < self._version or (
+            bounds['oldest'] is not None and self._version < bounds['oldest'] - 1
+        ):
+            self._reload()
+            return
+
+        changes = list(
+            RoutingChange.objects.filter(id__gt=self._version, id__lte=version)
+            .order_by('id').values_list('tenant_id', 'slug', 'is_deleted')
+        )
+        with self._lock:
+            for tenant_id, slug, is_deleted in changes:
+                self._set(tenant_id, None if is_deleted else slug)
+            self._version = max(self._version, version)
+            self._synced_at = time.monotonic()
+            if changes:
+                self.deltas += 1
+
+    def _reload(self):
+        from .models import Tenant
+        from .routing import current_version
+
+        # Version first: changes committed while loading are replayed next sync
+        version = current_version()
+        tenant_slugs = dict(Tenant.objects.values_list('id', 'slug'))
+        slugs = sorted(set(tenant_slugs.values()) | set(RESERVED_SLUGS))
+        with self._lock:
+            self._tenant_slugs = tenant_slugs
+            self._slugs = slugs
+            self._version = version
+            self._synced_at = time.monotonic()
+            self.reloads += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._slugs) if self._slugs is not None else 0,
+                'version': self._version,
+                'lookups': self.lookups,
+                'reloads': self.reloads,
+                'deltas': self.deltas,
+            }
+
+
+slug_index = SlugIndex()
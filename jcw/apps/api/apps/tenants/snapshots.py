@@ -0,0 +1,171 @@
+"""
+Per-tenant website snapshots.
+
+WebsiteView serves one precomputed JSON document per tenant. Inputs (tenant,
+domains, pages, page sections, theme, shared sections/templates) mark the
+affected snapshots stale when they change; snapshots for a known tenant are
+rebuilt right after commit, anything else is rebuilt lazily on the next read.
+
+Every change bumps the snapshot's dirty_version; a rebuild only clears the
+stale flag if dirty_version is still the one it saw before reading its
+inputs, so a change landing mid-rebuild is never lost.
+"""
+from django.db.models import Case, F, Min, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.core.utils import get_current_tenant, is_row_tenancy, is_schema_tenancy, tenant_scope
+
+from .models import Tenant, WebsiteSnapshot
+
+
+def build_document(tenant):
+    """
+    Assemble the public website document for a tenant.
+    """
+    from apps.pages.models import Page
+    from apps.themes.models import SiteTheme
+
+    with tenant_scope(tenant):
+        theme = SiteTheme.objects.first()
+        pages = list(
+            Page.objects.filter(status='published')
+            .select_related('template')
+            .prefetch_related('page_sections__section')
+            .order_by('slug')
+        )
+
+    home = next((page for page in pages if page.slug == 'home'), pages[0] if pages else None)
+    theme_options = theme.theme_options if theme else {}
+
+    return {
+        'success': True,
+        'slug': tenant.slug,
+        'business_name': tenant.business_name,
+        'website_name': tenant.business_name,  # Fallback to business name
+        'description': f"Welcome to {tenant.business_name}",
+        'contact_email': tenant.contact_email,
+        'contact_phone': tenant.contact_phone,
+        'city': tenant.city,
+        'country': tenant.country,
+        'industry_category': tenant.industry_category,
+        'services': theme_options.get('services', []),
+        'logo_url': theme_options.get('logo_url'),
+        'template_html': home.template.html_content if home and home.template else None,
+        'template_css': home.template.css_content if home and home.template else None,
+        'dev_url': tenant.dev_url,
+        'domains': sorted(tenant.domains.values_list('domain', flat=True)),
+        'theme': {
+            'primary_color': theme.primary_color,
+            'secondary_color': theme.secondary_color,
+            'font_family_heading': theme.font_family_heading,
+            'font_family_body': theme.font_family_body,
+            'custom_css': theme.custom_css,
+            'theme_options': theme_options,
+        } if theme else None,
+        'pages': [
+            {
+                'slug': page.slug,
+                'title': page.title,
+                'sections': [
+                    {
+                        'slug': page_section.section.slug,
+                        'category': page_section.section.category,
+                        'order_index': page_section.order_index,
+                        'props': page_section.props_data,
+                    }
+                    for page_section in page.page_sections.all()
+                ],
+            }
+            for page in pages
+        ],
+    }
+
+
+def rebuild_snapshot(tenant):
+    """
+    Rebuild and store a tenant's snapshot. A change that lands while building
+    keeps the snapshot stale, so it is picked up by the next rebuild.
+    """
+    snapshot, _ = WebsiteSnapshot.objects.get_or_create(
+        tenant=tenant,
+        defaults={'slug': tenant.slug, 'stale_since': timezone.now()},
+    )
+    seen_version = snapshot.dirty_version  # Read before the inputs
+    document = build_document(tenant)
+
+    WebsiteSnapshot.objects.filter(pk=snapshot.pk).update(
+        slug=tenant.slug,
+        document=document,
+        version=F('version') + 1,
+        built_at=timezone.now(),
+        stale_since=Case(
+            When(dirty_version=seen_version, then=Value(None)),
+            default=F('stale_since'),
+        ),
+    )
+    snapshot.refresh_from_db()
+    return snapshot
+
+
+def mark_stale(tenant_ids=None):
+    """
+    Flag snapshots as stale (all of them when tenant_ids is None, which may
+    also be a queryset of ids), keeping the earliest stale_since for the
+    staleness metric.
+    """
+    queryset = WebsiteSnapshot.objects.all()
+    if tenant_ids is not None:
+        queryset = queryset.filter(tenant_id__in=tenant_ids)
+    return queryset.update(
+        dirty_version=F('dirty_version') + 1,
+        stale_since=Coalesce('stale_since', Value(timezone.now())),
+    )
+
+
+def tenants_using(instance):
+    """
+    Ids of the tenants whose sites show a shared section or template (a
+    queryset in row tenancy), or None when every site may.
+    """
+    from apps.pages.models import Page, PageSection
+
+    if is_row_tenancy():
+        if instance._meta.label == 'templates.Template':
+            return Page.unscoped.filter(template=instance).values('tenant_id')
+        return PageSection.unscoped.filter(section=instance).values('tenant_id')
+    if is_schema_tenancy():
+        # Each schema has its own rows: only the schema being edited is affected
+        tenant = get_current_tenant()
+        return [tenant.pk] if tenant is not None else []
+    return None
+
+
+def get_fresh_snapshot(slug):
+    """
+    Return an up-to-date snapshot for the slug, rebuilding it if missing or
+    stale, or None if there is no such tenant (or it was deleted).
+    """
+    snapshot = WebsiteSnapshot.objects.filter(slug=slug, tenant__deleted_at__isnull=True).first()
+    if snapshot is not None and snapshot.stale_since is None:
+        return snapshot
+
+    tenant = Tenant.objects.filter(slug=slug, deleted_at__isnull=True).first()
+    if tenant is None:
+        return None
+    return rebuild_snapshot(tenant)
+
+
+def snapshot_staleness():
+    """
+    Staleness metric for dashboards: how many snapshots are stale or missing
+    and how long the oldest pending change has been waiting.
+    """
+    now = timezone.now()
+    oldest = WebsiteSnapshot.objects.aggregate(oldest=Min('stale_since'))['oldest']
+    return {
+        'snapshots': WebsiteSnapshot.objects.count(),
+        'stale': WebsiteSnapshot.objects.filter(stale_since__isnull=False).count(),
+        'missing': Tenant.objects.filter(website_snapshot__isnull=True).count(),
+        'max_stale_seconds': round((now - oldest).total_seconds(), 3) if oldest else 0.0,
+    }
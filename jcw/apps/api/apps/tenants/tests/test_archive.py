@@ -0,0 +1,58 @@
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase
+
+from apps.core.utils import tenant_scope
+from apps.pages.models import Page, PageSection
+from apps.tenants.archive import DRAIN_SIZE, import_archive, iter_archive
+
+from .utils import create_pages, create_section, create_tenant
+
+
+class ArchiveTests(TestCase):
+
+    def setUp(self):
+        self.section = create_section()
+        self.source = create_tenant('source')
+        self.target = create_tenant('target')
+        create_pages(self.source, self.section, count=2)
+        # Random bytes do not compress: the file spans several drains
+        self.media_path = default_storage.save('uploads/photo.bin', ContentFile(os.urandom(4 * DRAIN_SIZE)))
+        with tenant_scope(self.source):
+            PageSection.objects.filter(order_index=0).update(
+                props_data={'image': settings.MEDIA_URL + self.media_path},
+            )
+
+    def tearDown(self):
+        default_storage.delete(self.media_path)
+
+    def test_media_is_streamed_in_bounded_chunks(self):
+        chunks = list(iter_archive(self.source))
+
+        self.assertGreater(len(chunks), 4)
+        self.assertLess(max(len(chunk) for chunk in chunks), 3 * DRAIN_SIZE)
+
+    def test_export_import_round_trip(self):
+        with default_storage.open(self.media_path, 'rb') as upload:
+            content = upload.read()
+        archive = io.BytesIO(b''.join(iter_archive(self.source)))
+        default_storage.delete(self.media_path)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            counts = import_archive(archive, self.target, batch_size=1)
+
+        self.assertEqual((counts['pages.Page'], counts['pages.PageSection']), (2, 2))
+        with tenant_scope(self.target):
+            self.assertEqual(sorted(Page.objects.values_list('slug', flat=True)), ['page-0', 'page-1'])
+            page_section = PageSection.objects.select_related('page').first()
+        self.assertEqual(page_section.section_id, self.section.pk)
+        self.assertEqual(page_section.page.tenant_id, self.target.pk)
+        self.assertEqual(page_section.props_data, {'image': settings.MEDIA_URL + self.media_path})
+        with default_storage.open(self.media_path, 'rb') as upload:
+            self.assertEqual(upload.read(), content)
+        # The source keeps its own rows
+        self.assertEqual(Page.unscoped.filter(tenant=self.source).count(), 2)
@@ -0,0 +1,126 @@
+from unittest import skipUnless
+
+from django.test import TestCase, TransactionTestCase, tag
+
+from apps.core.utils import get_tenant_schema_name, is_schema_tenancy, tenant_scope
+from apps.pages.models import Page, PageSection
+from apps.sections.models import Section
+from apps.templates.models import Template, TemplateSection
+from apps.tenants.cloning import clone_site
+from apps.tenants.jobs import enqueue_job, run_job, start_job
+from apps.tenants.platform_stats import COUNTERS, count_all, get_platform_stats
+from apps.tenants.provisioning import build_schema, drop_schema
+from apps.themes.models import SiteTheme
+
+from .utils import create_pages, create_section, create_tenant
+
+
+class CloneSiteTests(TestCase):
+
+    def setUp(self):
+        self.section = create_section()
+        self.source = create_tenant('source')
+        self.target = create_tenant('target', is_active=False)
+        create_pages(self.source, self.section, count=2)
+        with tenant_scope(self.source):
+            SiteTheme.objects.create(primary_color='#ff0000')
+
+    def assertStatsMatchCounts(self):
+        stats = get_platform_stats()
+        self.assertEqual({counter: getattr(stats, counter) for counter in COUNTERS}, count_all())
+
+    def test_clone_copies_site_under_new_keys(self):
+        get_platform_stats()  # Start counting before the copy
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = clone_site(self.source, self.target)
+
+        self.assertEqual(result['rows'], {'pages.Page': 2, 'pages.PageSection': 2, 'themes.SiteTheme': 1})
+        with tenant_scope(self.target):
+            pages = {page.pk: page.slug for page in Page.objects.all()}
+            page_sections = list(PageSection.objects.all())
+            self.assertEqual(SiteTheme.objects.get().primary_color, '#ff0000')
+        self.assertEqual(sorted(pages.values()), ['page-0', 'page-1'])
+        self.assertFalse(set(pages) & set(Page.unscoped.filter(tenant=self.source).values_list('pk', flat=True)))
+        self.assertEqual({page_section.page_id for page_section in page_sections}, set(pages))
+        self.assertEqual({page_section.section_id for page_section in page_sections}, {self.section.pk})
+        self.assertEqual(Page.unscoped.filter(tenant=self.source).count(), 2)
+        self.assertStatsMatchCounts()
+
+    def test_clone_again_replaces_previous_copy(self):
+        get_platform_stats()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            clone_site(self.source, self.target)
+        with self.captureOnCommitCallbacks(execute=True):
+            clone_site(self.source, self.target)
+
+        self.assertEqual(Page.unscoped.filter(tenant=self.target).count(), 2)
+        self.assertEqual(PageSection.unscoped.filter(tenant=self.target).count(), 2)
+        self.assertStatsMatchCounts()
+
+    def test_clone_job_copies_and_activates(self):
+        job = enqueue_job(self.target, 'clone', {'source': str(self.source.pk)})
+        start_job(job)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            run_job(job)
+
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(job.payload['stats']['rows']['pages.Page'], 2)
+        self.target.refresh_from_db()
+        self.assertTrue(self.target.is_active)
+
+
+@tag('postgresql')
+@skipUnless(is_schema_tenancy(), 'needs schema tenancy (settings.test_postgresql)')
+class SchemaCloneSiteTests(TransactionTestCase):
+    """
+    The target schema is freshly built: it has none of the sections and
+    templates the source site uses until the clone copies them.
+    """
+
+    def setUp(self):
+        self.source = create_tenant('source')
+        self.target = create_tenant('target', is_active=False)
+        for tenant in (self.source, self.target):
+            build_schema(get_tenant_schema_name(tenant))
+        with tenant_scope(self.source):
+            section = create_section()
+            template = Template.objects.create(
+                slug='rest-home', name='Home', website_type='one_page', is_default=True,
+            )
+            TemplateSection.objects.create(template=template, section=section, order_index=0)
+            create_pages(self.source, section, count=2)
+            Page.objects.update(template=template)
+
+    def tearDown(self):
+        for tenant in (self.source, self.target):
+            drop_schema(get_tenant_schema_name(tenant))
+
+    def test_clone_copies_referenced_sections_and_templates(self):
+        result = clone_site(self.source, self.target)
+
+        self.assertEqual(result['rows']['pages.PageSection'], 2)
+        self.assertEqual(result['rows']['sections.Section'], 1)
+        with tenant_scope(self.target):
+            self.assertEqual(
+                set(Page.objects.values_list('template__slug', flat=True)), {'rest-home'},
+            )
+            self.assertEqual(
+                set(PageSection.objects.values_list('section__slug', flat=True)), {'jcw-rest-01-hero01'},
+            )
+            template = Template.objects.get(slug='rest-home')
+            self.assertFalse(template.is_default)
+            self.assertEqual(template.template_sections.count(), 1)
+
+    def test_clone_reuses_sections_the_target_has(self):
+        with tenant_scope(self.target):
+            create_section()
+
+        result = clone_site(self.source, self.target)
+
+        self.assertEqual(result['rows']['sections.Section'], 0)
+        with tenant_scope(self.target):
+            self.assertEqual(Section.objects.count(), 1)
+            self.assertEqual(PageSection.objects.count(), 2)
@@ -0,0 +1,89 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.tenants.jobs import claim_job, claim_next_job, enqueue_job, release_stale_jobs, run_job, start_job
+from apps.tenants.models import Tenant, TenantJob
+
+
+def failing_handler(job):
+    raise RuntimeError('schema build failed')
+
+
+class JobQueueTests(TestCase):
+
+    def setUp(self):
+        self.tenant = Tenant.objects.create(
+            slug='queued', business_name='Queued', contact_email='queued@example.com', is_active=False,
+        )
+
+    def test_claim_next_job_takes_oldest_due_job(self):
+        later = enqueue_job(self.tenant, 'provision')
+        later.run_after = timezone.now() + timedelta(minutes=5)
+        later.save()
+        due = enqueue_job(self.tenant, 'provision')
+
+        job = claim_next_job()
+
+        self.assertEqual(job.pk, due.pk)
+        self.assertEqual((job.status, job.attempts), ('running', 1))
+        self.assertIsNone(claim_next_job())
+
+    def test_claim_next_job_filters_kinds(self):
+        enqueue_job(self.tenant, 'provision')
+
+        self.assertIsNone(claim_next_job(kinds=['purge']))
+        self.assertEqual(claim_next_job(kinds=['provision']).kind, 'provision')
+
+    def test_claim_job_only_succeeds_once(self):
+        job = enqueue_job(self.tenant, 'provision')
+
+        self.assertIsNotNone(claim_job(job.pk))
+        self.assertIsNone(claim_job(job.pk))
+
+    def test_successful_job_activates_tenant(self):
+        job = enqueue_job(self.tenant, 'provision')
+        start_job(job)
+
+        run_job(job)
+
+        self.assertEqual((job.status, job.progress), ('succeeded', 100))
+        self.tenant.refresh_from_db()
+        self.assertTrue(self.tenant.is_active)
+
+    @override_settings(TENANT_JOB_RETRY_DELAY=10)
+    def test_failed_job_backs_off_exponentially_then_fails(self):
+        job = enqueue_job(self.tenant, 'provision')
+        with mock.patch.dict('apps.tenants.jobs.JOB_HANDLERS', {'provision': failing_handler}):
+            for attempt, delay in [(1, 10), (2, 20)]:
+                start_job(job)
+                before = timezone.now()
+                run_job(job)
+                self.assertEqual((job.status, job.attempts), ('pending', attempt))
+                self.assertAlmostEqual((job.run_after - before).total_seconds(), delay, delta=1)
+                self.assertIn('schema build failed', job.error)
+
+            start_job(job)
+            run_job(job)
+
+        self.assertEqual(job.status, 'failed')
+        self.assertIsNotNone(job.finished_at)
+
+    def test_release_stale_jobs(self):
+        stale = timezone.now() - timedelta(minutes=10)
+        crashed = enqueue_job(self.tenant, 'provision')
+        exhausted = enqueue_job(self.tenant, 'provision')
+        alive = enqueue_job(self.tenant, 'provision')
+        for job in (crashed, exhausted, alive):
+            start_job(job)
+        TenantJob.objects.filter(pk__in=[crashed.pk, exhausted.pk]).update(locked_at=stale)
+        TenantJob.objects.filter(pk=exhausted.pk).update(attempts=3)
+
+        self.assertEqual(release_stale_jobs(timeout=60), (1, 1))
+
+        statuses = dict(TenantJob.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses[crashed.pk], 'pending')
+        self.assertEqual(statuses[exhausted.pk], 'failed')
+        self.assertEqual(statuses[alive.pk], 'running')
@@ -0,0 +1,52 @@
+from django.test import TestCase, override_settings
+
+from apps.core.utils import tenant_scope
+from apps.pages.models import Page
+from apps.tenants.jobs import claim_job, run_job
+from apps.tenants.models import TenantJob
+from apps.tenants.publishing import current_release
+
+from .utils import create_tenant
+
+
+@override_settings(PUBLISH_ON_PAGE_PUBLISH=True)
+class PublishOnPagePublishTests(TestCase):
+
+    def setUp(self):
+        self.tenant = create_tenant('published')
+
+    def publish_jobs(self):
+        return TenantJob.objects.filter(tenant=self.tenant, kind='publish')
+
+    def test_page_edits_share_one_queued_publish(self):
+        with tenant_scope(self.tenant):
+            for number in range(3):
+                Page.objects.create(slug=f'page-{number}', title='Page', status='published')
+
+        self.assertEqual(self.publish_jobs().count(), 1)
+        self.assertIsNone(current_release('published'))  # Nothing rendered inline
+
+    def test_drafts_of_unpublished_site_queue_nothing(self):
+        with tenant_scope(self.tenant):
+            Page.objects.create(slug='draft', title='Draft')
+
+        self.assertFalse(self.publish_jobs().exists())
+
+    def test_publish_job_switches_site_live(self):
+        with tenant_scope(self.tenant):
+            Page.objects.create(slug='home', title='Home', status='published')
+
+        job = run_job(claim_job(self.publish_jobs().get().pk))
+
+        self.assertEqual(job.status, 'succeeded')
+        self.assertTrue(job.payload['changed'])
+        self.assertEqual(current_release('published'), job.payload['release'])
+
+    def test_inactive_tenant_is_not_published(self):
+        self.tenant.is_active = False
+        self.tenant.save()
+
+        with tenant_scope(self.tenant):
+            Page.objects.create(slug='home', title='Home', status='published')
+
+        self.assertFalse(self.publish_jobs().exists())
@@ -0,0 +1,141 @@
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.core.views import AdminTenantDetailView, AdminTenantListView
+from apps.pages.models import Page, PageSection
+from apps.tenants.jobs import claim_job, run_job, start_job
+from apps.tenants.models import Tenant, TenantJob, WebsiteSnapshot
+from apps.tenants.platform_stats import get_platform_stats
+from apps.tenants.publishing import current_release, publish_tenant
+from apps.tenants.purging import restore_tenant, soft_delete_tenant
+from apps.tenants.snapshots import get_fresh_snapshot
+from apps.users.models import User
+
+from .utils import create_pages, create_section, create_tenant
+
+
+@override_settings(TENANT_PURGE_DELAY=3600, TENANT_PURGE_PAUSE=0, TENANT_PURGE_CHUNK_SIZE=2)
+class PurgeTests(TestCase):
+
+    def setUp(self):
+        section = create_section()
+        self.tenant = create_tenant('doomed')
+        self.other = create_tenant('kept')
+        create_pages(self.tenant, section, count=3)
+        create_pages(self.other, section, count=1)
+
+    def test_soft_delete_deactivates_and_schedules_purge(self):
+        job = soft_delete_tenant(self.tenant)
+
+        self.tenant.refresh_from_db()
+        self.assertFalse(self.tenant.is_active)
+        self.assertIsNotNone(self.tenant.deleted_at)
+        self.assertEqual((job.kind, job.status, job.payload['slug']), ('purge', 'pending', 'doomed'))
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertEqual(soft_delete_tenant(self.tenant).pk, job.pk)
+
+    def test_restore_cancels_pending_purge(self):
+        soft_delete_tenant(self.tenant)
+
+        self.assertTrue(restore_tenant(self.tenant))
+
+        self.tenant.refresh_from_db()
+        self.assertTrue(self.tenant.is_active)
+        self.assertIsNone(self.tenant.deleted_at)
+        self.assertFalse(TenantJob.objects.filter(tenant=self.tenant).exists())
+
+    def test_restore_refuses_running_purge(self):
+        start_job(soft_delete_tenant(self.tenant))
+
+        self.assertFalse(restore_tenant(self.tenant))
+
+    def test_purge_deletes_tenant_rows_then_tenant(self):
+        job = soft_delete_tenant(self.tenant)
+        start_job(job)
+
+        run_job(job)
+
+        self.assertEqual(job.status, 'succeeded')
+        job.refresh_from_db()
+        self.assertIsNone(job.tenant_id)
+        self.assertFalse(Tenant.objects.filter(slug='doomed').exists())
+        self.assertEqual(Page.unscoped.count(), 1)
+        self.assertEqual(PageSection.unscoped.count(), 1)
+        self.assertTrue(Page.unscoped.filter(tenant=self.other).exists())
+
+    def test_purge_skips_reactivated_tenant(self):
+        job = soft_delete_tenant(self.tenant)
+        Tenant.objects.filter(pk=self.tenant.pk).update(is_active=True)
+        job = claim_job(job.pk)
+
+        run_job(job)
+
+        self.assertEqual(job.status, 'succeeded')
+        self.assertTrue(Tenant.objects.filter(pk=self.tenant.pk).exists())
+        self.assertEqual(Page.unscoped.filter(tenant=self.tenant).count(), 3)
+
+    def test_soft_delete_takes_site_offline(self):
+        publish_tenant(self.tenant)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            soft_delete_tenant(self.tenant)
+
+        self.assertIsNone(get_fresh_snapshot('doomed'))
+        self.assertFalse(WebsiteSnapshot.objects.filter(tenant=self.tenant).exists())
+        self.assertIsNone(current_release('doomed'))
+
+    def test_soft_deleted_tenant_is_not_counted(self):
+        get_platform_stats()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            soft_delete_tenant(self.tenant)
+
+        stats = get_platform_stats()
+        self.assertEqual((stats.tenants, stats.active_tenants), (1, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            restore_tenant(self.tenant)
+
+        stats.refresh_from_db()
+        self.assertEqual((stats.tenants, stats.active_tenants), (2, 2))
+
+
+class AdminTenantViewTests(TestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='admin', is_staff=True)
+        self.tenant = create_tenant('doomed')
+        soft_delete_tenant(self.tenant)
+        self.factory = APIRequestFactory()
+
+    def test_list_hides_deleted_tenants(self):
+        create_tenant('kept')
+        request = self.factory.get('/api/admin/tenants/')
+        force_authenticate(request, self.admin)
+
+        response = AdminTenantListView.as_view()(request)
+
+        self.assertEqual([tenant['slug'] for tenant in response.data['results']], ['kept'])
+
+    def test_reactivating_deleted_tenant_cancels_purge(self):
+        request = self.factory.patch(f'/api/admin/tenants/{self.tenant.pk}/', {'is_active': True}, format='json')
+        force_authenticate(request, self.admin)
+
+        response = AdminTenantDetailView.as_view()(request, pk=self.tenant.pk)
+
+        self.assertEqual(response.status_code, 200)
+        self.tenant.refresh_from_db()
+        self.assertEqual((self.tenant.is_active, self.tenant.deleted_at), (True, None))
+        self.assertFalse(TenantJob.objects.filter(tenant=self.tenant, kind='purge').exists())
+
+    def test_reactivating_refused_while_purge_runs(self):
+        start_job(TenantJob.objects.get(tenant=self.tenant, kind='purge'))
+        request = self.factory.patch(f'/api/admin/tenants/{self.tenant.pk}/', {'is_active': True}, format='json')
+        force_authenticate(request, self.admin)
+
+        response = AdminTenantDetailView.as_view()(request, pk=self.tenant.pk)
+
+        self.assertEqual(response.status_code, 409)
+        self.tenant.refresh_from_db()
+        self.assertFalse(self.tenant.is_active)
@@ -0,0 +1,180 @@
+import io
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings, tag
+
+from apps.core.utils import get_tenant_schema_name, is_schema_tenancy, tenant_scope
+from apps.pages.models import Page, PageSection
+from apps.tenants.archive import import_archive, iter_archive
+from apps.tenants.cloning import clone_site
+from apps.tenants.jobs import run_job, start_job
+from apps.tenants.management.commands.move_tenant_shard import Command
+from apps.tenants.models import Tenant
+from apps.tenants.provisioning import build_schema, drop_schema
+from apps.tenants.purging import soft_delete_tenant
+from apps.tenants.sharding import (
+    LeastLoadedPolicy, TenantWriteFrozen, choose_shards, freeze_writes, is_write_frozen, unfreeze_writes,
+)
+
+from .utils import create_pages, create_section, create_tenant
+
+
+@override_settings(TENANT_SHARDS=['default', 'shard1'])
+class LeastLoadedPlacementTests(TestCase):
+    databases = {'default', 'shard1'}
+
+    def setUp(self):
+        cache.clear()
+
+    def create_tenant(self, slug):
+        return Tenant.objects.create(slug=slug, business_name=slug, contact_email=f'{slug}@example.com')
+
+    def test_new_tenants_alternate_between_shards(self):
+        shards = [self.create_tenant(f'site-{index}').shard for index in range(4)]
+
+        self.assertEqual(shards, ['default', 'shard1', 'default', 'shard1'])
+
+    def test_placement_counts_tenants_once(self):
+        policy = LeastLoadedPolicy()
+        policy.choose(Tenant(slug='first'), ['default', 'shard1'])
+
+        with self.assertNumQueries(0):
+            policy.choose(Tenant(slug='second'), ['default', 'shard1'])
+
+    def test_concurrent_placements_spread_before_tenants_are_saved(self):
+        # Two signups placed before either tenant row exists
+        first = LeastLoadedPolicy().choose(Tenant(slug='first'), ['default', 'shard1'])
+        second = LeastLoadedPolicy().choose(Tenant(slug='second'), ['default', 'shard1'])
+
+        self.assertNotEqual(first, second)
+
+    def test_counts_existing_tenants_per_shard(self):
+        Tenant.objects.bulk_create([
+            Tenant(slug=f'old-{index}', business_name='Old', contact_email='old@example.com', shard='default')
+            for index in range(3)
+        ])
+
+        self.assertEqual(choose_shards([Tenant(), Tenant(), Tenant()]), ['shard1', 'shard1', 'shard1'])
+
+    def test_tenant_is_mirrored_to_other_shards(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            tenant = self.create_tenant('mirrored')
+
+        self.assertTrue(Tenant.objects.using('shard1').filter(pk=tenant.pk, slug='mirrored').exists())
+
+
+@override_settings(TENANT_PURGE_PAUSE=0)
+class WriteFreezeTests(TestCase):
+    """
+    Cloning, archive import and purging write with raw SQL, past the
+    router's check: each checks the freeze itself.
+    """
+
+    def setUp(self):
+        self.section = create_section()
+        self.source = create_tenant('source')
+        self.target = create_tenant('target')
+        create_pages(self.source, self.section, count=2)
+        create_pages(self.target, self.section, count=1)
+        self.addCleanup(unfreeze_writes, self.target.pk)
+
+    def test_clone_refuses_frozen_target(self):
+        freeze_writes(self.target.pk)
+
+        with self.assertRaises(TenantWriteFrozen):
+            clone_site(self.source, self.target)
+
+        self.assertEqual(Page.unscoped.filter(tenant=self.target).count(), 1)
+
+    def test_import_refuses_frozen_tenant(self):
+        archive = io.BytesIO(b''.join(iter_archive(self.source)))
+        freeze_writes(self.target.pk)
+
+        with self.assertRaises(TenantWriteFrozen):
+            import_archive(archive, self.target)
+
+        self.assertEqual(Page.unscoped.filter(tenant=self.target).count(), 1)
+
+    def test_purge_waits_for_frozen_tenant(self):
+        job = soft_delete_tenant(self.target)
+        start_job(job)
+        freeze_writes(self.target.pk)
+
+        run_job(job)
+
+        self.assertEqual(job.status, 'pending')
+        self.assertIn('TenantWriteFrozen', job.error)
+        self.assertEqual(PageSection.unscoped.filter(tenant=self.target).count(), 1)
+
+
+@tag('postgresql')
+@skipUnless(is_schema_tenancy(), 'needs schema tenancy (settings.test_postgresql)')
+@skipUnless('shard1' in settings.DATABASES, 'needs DATABASE_SHARDS=shard1=postgresql://...')
+@override_settings(TENANT_RESOLVER_LOCAL_TTL=0)
+class MoveTenantShardTests(TransactionTestCase):
+    databases = {'default', 'shard1'}
+
+    def setUp(self):
+        self.tenant = create_tenant('moving', shard='default')
+        self.schema_name = get_tenant_schema_name(self.tenant)
+        build_schema(self.schema_name)
+        with tenant_scope(self.tenant):
+            self.section = create_section()
+        create_pages(self.tenant, self.section, count=3)
+
+    def tearDown(self):
+        unfreeze_writes(self.tenant.pk)
+        for shard in ('default', 'shard1'):
+            drop_schema(self.schema_name, shard)
+
+    def move(self):
+        output = io.StringIO()
+        call_command('move_tenant_shard', 'moving', 'shard1', grace=0, stdout=output)
+        return output.getvalue()
+
+    def test_move_copies_schema_and_switches_shard(self):
+        output = self.move()
+
+        self.assertIn('initial copy', output)
+        self.tenant.refresh_from_db()
+        self.assertEqual(self.tenant.shard, 'shard1')
+        self.assertFalse(is_write_frozen(self.tenant.pk))
+        with tenant_scope(self.tenant):
+            self.assertEqual(sorted(Page.objects.values_list('slug', flat=True)), ['page-0', 'page-1', 'page-2'])
+            self.assertEqual(PageSection.objects.filter(section__slug=self.section.slug).count(), 3)
+            Page.objects.create(slug='after-move', title='After the move')
+            # The source schema stays (no --drop-source) but no longer gets writes
+            self.assertTrue(Page.objects.using('shard1').filter(slug='after-move').exists())
+            self.assertFalse(Page.objects.using('default').filter(slug='after-move').exists())
+
+    def test_frozen_tenant_rejects_writes(self):
+        freeze_writes(self.tenant.pk)
+
+        with tenant_scope(self.tenant), self.assertRaises(TenantWriteFrozen):
+            Page.objects.create(slug='frozen', title='Frozen')
+
+    def test_move_picks_up_writes_made_during_the_copy(self):
+        # Rows changed after the initial copy reach the target in the final sync
+        original_sync = Command.sync
+        calls = []
+
+        def sync(command, tenant, source, target, since=None):
+            copied = original_sync(command, tenant, source, target, since)
+            if since is None:
+                with tenant_scope(self.tenant):
+                    Page.objects.filter(slug='page-0').delete()
+                    Page.objects.create(slug='late', title='Written during the copy')
+            calls.append(since)
+            return copied
+
+        with mock.patch.object(Command, 'sync', autospec=True, side_effect=sync):
+            self.move()
+
+        self.assertEqual(len(calls), 2)
+        self.assertIsNotNone(calls[1])
+        self.tenant.refresh_from_db()
+        with tenant_scope(self.tenant):
+            self.assertEqual(sorted(Page.objects.values_list('slug', flat=True)), ['late', 'page-1', 'page-2'])
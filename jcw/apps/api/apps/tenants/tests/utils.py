@@ -0,0 +1,31 @@
+from apps.core.utils import tenant_scope
+from apps.pages.models import Page, PageSection
+from apps.sections.models import Section
+from apps.tenants.models import Tenant
+from apps.users.models import User
+
+
+def create_tenant(slug, **fields):
+    fields.setdefault('business_name', slug.title())
+    fields.setdefault('contact_email', f'{slug}@example.com')
+    return Tenant.objects.create(slug=slug, **fields)
+
+
+def create_section(slug='jcw-rest-01-hero01'):
+    author = User.objects.filter(username='author').first() or User.objects.create_user(
+        username='author', email='author@example.com', password='author',
+    )
+    return Section.objects.create(
+        slug=slug, name='Hero', category='hero', vertical='rest',
+        kit_number='01', section_type_number='01', created_by=author,
+    )
+
+
+def create_pages(tenant, section, count=2, status='published'):
+    """
+    Give the tenant `count` pages, each showing `section` once.
+    """
+    with tenant_scope(tenant):
+        for number in range(count):
+            page = Page.objects.create(slug=f'page-{number}', title=f'Page {number}', status=status)
+            PageSection.objects.create(page=page, section=section, order_index=0)
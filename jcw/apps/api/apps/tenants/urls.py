@@ -5,7 +5,13 @@ urlpatterns = [
     # For public schema (admin access)
     path('', views.TenantListView.as_view(), name='tenant_list'),
     path('<uuid:pk>/', views.TenantDetailView.as_view(), name='tenant_detail'),
+    path('<uuid:pk>/restore/', views.TenantRestoreView.as_view(), name='tenant_restore'),
+    path('<uuid:pk>/export/', views.TenantExportView.as_view(), name='tenant_export'),
+    path('<uuid:pk>/import/', views.TenantImportView.as_view(), name='tenant_import'),
+    path('<uuid:pk>/clone/', views.TenantCloneView.as_view(), name='tenant_clone'),
+    path('purges/', views.TenantPurgeQueueView.as_view(), name='tenant_purge_queue'),
     # For tenant schema (user access)
     path('info/', views.TenantInfoView.as_view(), name='tenant_info'),
     path('by-slug/<str:slug>/', views.get_tenant_by_slug, name='tenant_by_slug'),
+    path('manifest/', views.routing_manifest, name='tenant_routing_manifest'),
 ]
\ No newline at end of file
@@ -1,8 +1,25 @@
-from rest_framework import generics, permissions
+import zipfile
+
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
-from .models import Tenant
-from .serializers import TenantSerializer
+from rest_framework.views import APIView
+from .archive import ArchiveError, check_tenancy, import_archive, iter_archive
+from apps.core.utils import create_tenant_with_unique_slug, generate_tenant_slug
+from .conditional import tenant_conditional
+from .jobs import enqueue_job, run_job, start_job
+from .models import Domain, Tenant, TenantJob
+from .negative_cache import unknown_slugs
+from .purging import restore_tenant, soft_delete_tenant
+from .routing import build_manifest
+from .serializers import TenantCloneSerializer, TenantJobSerializer, TenantPurgeSerializer, TenantSerializer
 
 
 class IsAdminUser(permissions.BasePermission):
@@ -17,18 +34,126 @@ class TenantListView(generics.ListCreateAPIView):
     """
     List all tenants (admin only) or create new tenant.
     """
-    queryset = Tenant.objects.all().order_by('-created_at')
+    queryset = Tenant.objects.filter(deleted_at__isnull=True).order_by('-created_at')
     serializer_class = TenantSerializer
     permission_classes = [IsAdminUser]
 
 
 class TenantDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
-    Retrieve, update, or delete a specific tenant (admin only).
+    Retrieve, update, or delete a specific tenant (admin only). Deleting
+    only deactivates the tenant and queues its purge (see purging.py).
     """
-    queryset = Tenant.objects.all()
+    queryset = Tenant.objects.filter(deleted_at__isnull=True)
     serializer_class = TenantSerializer
     permission_classes = [IsAdminUser]
+    
+    def destroy(self, request, *args, **kwargs):
+        job = soft_delete_tenant(self.get_object())
+        return Response(TenantPurgeSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class TenantRestoreView(APIView):
+    """
+    Undo a tenant delete while its purge has not started (admin only).
+    """
+    permission_classes = [IsAdminUser]
+    
+    def post(self, request, pk):
+        tenant = get_object_or_404(Tenant, pk=pk, deleted_at__isnull=False)
+        if not restore_tenant(tenant):
+            return Response({'error': 'The purge has already started'}, status=status.HTTP_409_CONFLICT)
+        return Response(TenantSerializer(tenant).data)
+
+
+class TenantExportView(APIView):
+    """
+    Download a tenant's content as a zip archive, streamed while it is
+    built (admin only).
+    """
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request, pk):
+        tenant = get_object_or_404(Tenant, pk=pk, deleted_at__isnull=True)
+        try:
+            check_tenancy()
+        except ArchiveError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        response = StreamingHttpResponse(iter_archive(tenant), content_type='application/zip')
+        filename = f'{tenant.slug}-{timezone.now():%Y%m%d-%H%M%S}.zip'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class TenantImportView(APIView):
+    """
+    Replace a tenant's content with an uploaded export archive (admin only).
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+    
+    def post(self, request, pk):
+        tenant = get_object_or_404(Tenant, pk=pk, deleted_at__isnull=True)
+        if 'archive' not in request.FILES:
+            return Response({'error': 'Upload the archive as "archive"'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            counts = import_archive(request.FILES['archive'], tenant)
+        except (ArchiveError, zipfile.BadZipFile) as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'success': True, 'imported': counts})
+
+
+class TenantCloneView(APIView):
+    """
+    Create a new tenant with a copy of this tenant's site (admin only). The
+    copy runs as a 'clone' job; poll status_url for progress and stats.
+    """
+    permission_classes = [IsAdminUser]
+    
+    def post(self, request, pk):
+        source = get_object_or_404(Tenant, pk=pk, deleted_at__isnull=True)
+        serializer = TenantCloneSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        clone_async = getattr(settings, 'TENANT_PROVISIONING_ASYNC', False)
+        
+        with transaction.atomic():
+            tenant = create_tenant_with_unique_slug(
+                generate_tenant_slug(serializer.validated_data['business_name']),
+                business_name=serializer.validated_data['business_name'],
+                contact_email=serializer.validated_data.get('contact_email', source.contact_email),
+                **{field: getattr(source, field) for field in [
+                    'contact_phone', 'industry_category', 'city', 'country', 'plan', 'website_type',
+                ]},
+                shard=source.shard,  # The copy is one INSERT ... SELECT per table on this database
+                is_active=False,
+            )
+            suffix = getattr(settings, 'TENANT_SUBDOMAIN_SUFFIX', '.lvh.me')
+            Domain.objects.create(domain=f'{tenant.slug}{suffix}', tenant=tenant, is_primary=True)
+            job = enqueue_job(tenant, 'clone', {'source': str(source.pk)})
+        
+        if not clone_async:
+            start_job(job)
+            run_job(job)
+        return Response({
+            **TenantJobSerializer(job).data,
+            'tenant_id': tenant.id,
+            'status_url': reverse('onboarding_job', kwargs={'job_id': job.id}),
+        }, status=status.HTTP_202_ACCEPTED if clone_async else status.HTTP_201_CREATED)
+
+
+class TenantPurgeQueueView(generics.ListAPIView):
+    """
+    Scheduled, running and finished tenant purges, newest first (admin only).
+    Filter with ?status=pending|running|succeeded|failed.
+    """
+    serializer_class = TenantPurgeSerializer
+    permission_classes = [IsAdminUser]
+    
+    def get_queryset(self):
+        queryset = TenantJob.objects.filter(kind='purge').order_by('-created_at')
+        if self.request.query_params.get('status'):
+            queryset = queryset.filter(status=self.request.query_params['status'])
+        return queryset
 
 
 class TenantInfoView(generics.RetrieveAPIView):
@@ -44,15 +169,39 @@ class TenantInfoView(generics.RetrieveAPIView):
         return Tenant.objects.first()
 
 
+@tenant_conditional('tenant', active_only=True)  # ETag/304 without serializing
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])  # Public endpoint for frontend
 def get_tenant_by_slug(request, slug):
     """
     Get tenant information by slug (public endpoint for frontend routing).
     """
-    try:
-        tenant = Tenant.objects.get(slug=slug, is_active=True)
-        serializer = TenantSerializer(tenant)
-        return Response(serializer.data)
-    except Tenant.DoesNotExist:
-        return Response({'error': 'Tenant not found'}, status=404)
\ No newline at end of file
+    if unknown_slugs.contains(slug):
+        return Response({'error': 'Tenant not found'}, status=404)
+    
+    tenant = Tenant.objects.filter(slug=slug).first()
+    if tenant is None:
+        # Only slugs with no tenant at all go to the negative cache;
+        # inactive tenants still exist for WebsiteView and admin tools.
+        unknown_slugs.add(slug)
+        return Response({'error': 'Tenant not found'}, status=404)
+    if not tenant.is_active:
+        return Response({'error': 'Tenant not found'}, status=404)
+    
+    serializer = TenantSerializer(tenant)
+    return Response(serializer.data)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])  # Public endpoint for frontend
+def routing_manifest(request):
+    """
+    Active tenant slugs/domains with a version; ?since=<version> returns only changes.
+    """
+    since = request.query_params.get('since')
+    if since is not None:
+        try:
+            since = int(since)
+        except ValueError:
+            return Response({'error': 'since must be an integer version'}, status=400)
+    return Response(build_manifest(since))
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenants', '0005_websitesnapshot'),
+        ('themes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sitetheme',
+            name='tenant',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='tenants.tenant'),
+        ),
+        migrations.AddConstraint(
+            model_name='sitetheme',
+            constraint=models.UniqueConstraint(fields=('tenant',), name='themes_sitetheme_tenant_uniq'),
+        ),
+    ]
@@ -1,8 +1,9 @@
 from django.db import models
+from apps.core.models import TenantScopedModel
 import uuid
 
 
-class SiteTheme(models.Model):
+class SiteTheme(TenantScopedModel):
     """
     Tenant-scoped theme customization. One per tenant.
     """
@@ -24,5 +25,10 @@ class SiteTheme(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tenant'], name='themes_sitetheme_tenant_uniq'),
+        ]
+    
     def __str__(self):
         return f"Theme (Primary: {self.primary_color})"
\ No newline at end of file
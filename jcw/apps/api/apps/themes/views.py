@@ -1,5 +1,6 @@
 from rest_framework import generics, permissions
 from rest_framework.response import Response
+from apps.core.cache import tenant_cache
 from .models import SiteTheme
 from .serializers import SiteThemeSerializer
 
@@ -21,4 +22,10 @@ class ThemeView(generics.RetrieveUpdateAPIView):
                 'font_family_body': 'Inter',
             }
         )
-        return theme
\ No newline at end of file
+        return theme
+    
+    def retrieve(self, request, *args, **kwargs):
+        # Cached per tenant; theme changes invalidate the tenant's namespace
+        return Response(tenant_cache.get_or_set(
+            'theme', lambda: super(ThemeView, self).retrieve(request, *args, **kwargs).data
+        ))
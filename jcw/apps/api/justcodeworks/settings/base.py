@@ -23,7 +23,26 @@ if DATABASE_URL.startswith('postgresql'):
     DATABASES = {
         'default': env.db()
     }
-    DATABASES['default']['ENGINE'] = 'django_tenants.postgresql_backend'
+    # django-tenants backend + psycopg pool, skips redundant SET search_path
+    DATABASES['default']['ENGINE'] = 'apps.core.postgresql_backend'
+    if env.bool('DATABASE_POOL', default=True):
+        # Connections go back to the pool at the end of each request
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': env.int('DATABASE_POOL_MIN_SIZE', default=2),
+            'max_size': env.int('DATABASE_POOL_MAX_SIZE', default=10),
+            'timeout': env.float('DATABASE_POOL_TIMEOUT', default=10.0),  # max wait for a connection
+        }
+    else:
+        DATABASES['default']['CONN_MAX_AGE'] = env.int('CONN_MAX_AGE', default=60)
+        DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+    # Extra shards for tenant schemas: DATABASE_SHARDS=shard1=postgresql://...,shard2=postgresql://...
+    for alias, url in env.dict('DATABASE_SHARDS', default={}).items():
+        DATABASES[alias] = {
+            **{key: value for key, value in DATABASES['default'].items() if key not in ('NAME', 'USER', 'PASSWORD', 'HOST', 'PORT')},
+            **env.db_url_config(url),
+            'ENGINE': DATABASES['default']['ENGINE'],
+        }
 else:
     # SQLite fallback for development
     DATABASES = {
@@ -33,7 +52,19 @@ else:
         }
     }
 
+# Databases tenant schemas can be placed on, and how new tenants are placed
+TENANT_SHARDS = list(DATABASES)
+TENANT_SHARD_POLICY = env('TENANT_SHARD_POLICY', default='apps.tenants.sharding.LeastLoadedPolicy')
+TENANT_SHARD_COUNT_TTL = env.int('TENANT_SHARD_COUNT_TTL', default=300)  # seconds between tenant recounts
+
+# Cache (set CACHE_URL=rediscache://... to share across workers)
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
 DATABASE_ROUTERS = (
+    'apps.tenants.routers.LazyTenantRouter',  # Activates lazily routed tenants; never picks a database
+    'apps.tenants.routers.ShardRouter',  # Tenant-scoped queries go to the tenant's shard
     'django_tenants.routers.TenantSyncRouter',
 )
 
@@ -72,13 +103,23 @@ TENANT_APPS = [
     'apps.activity',
 ]
 
+# Slim tenant schemas: only the JCW content apps get tables in each tenant
+# schema; auth, admin, sessions etc. exist once, in the public schema.
+# Existing schemas: run `manage.py slim_tenant_schemas` after enabling.
+FULL_TENANT_APPS = list(TENANT_APPS)
+TENANT_CONTENT_APPS = ['apps.sections', 'apps.templates', 'apps.pages', 'apps.themes', 'apps.activity']
+TENANT_SLIM_SCHEMAS = env.bool('TENANT_SLIM_SCHEMAS', default=False)
+if TENANT_SLIM_SCHEMAS:
+    SHARED_APPS = SHARED_APPS + [app for app in TENANT_APPS if app not in SHARED_APPS + TENANT_CONTENT_APPS]
+    TENANT_APPS = list(TENANT_CONTENT_APPS)
+
 INSTALLED_APPS = list(SHARED_APPS) + [app for app in TENANT_APPS if app not in SHARED_APPS]
 
 TENANT_MODEL = "tenants.Tenant"
 TENANT_DOMAIN_MODEL = "tenants.Domain"
 
 MIDDLEWARE = [
-    'django_tenants.middleware.main.TenantMainMiddleware',
+    'apps.tenants.middleware.CachedTenantMiddleware',  # TenantMainMiddleware with cached routing
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -89,6 +130,13 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Tenancy mode: 'schema' (django-tenants, schema per tenant) or 'row' (one
+# schema, tenant-scoped models filtered by their tenant column)
+TENANCY_MODE = env('TENANCY_MODE', default='schema')
+if TENANCY_MODE == 'row':
+    SHARED_APPS = SHARED_APPS + [app for app in TENANT_APPS if app not in SHARED_APPS]
+    MIDDLEWARE[0] = 'apps.tenants.middleware.RowTenantMiddleware'
+
 ROOT_URLCONF = 'justcodeworks.urls'
 
 TEMPLATES = [
@@ -139,6 +187,12 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Statically published tenant sites (see apps.tenants.publishing)
+PUBLISH_ROOT = env.path('PUBLISH_ROOT', default=BASE_DIR / 'published')
+PUBLISH_KEEP_RELEASES = env.int('PUBLISH_KEEP_RELEASES', default=3)
+PUBLISH_ON_PAGE_PUBLISH = env.bool('PUBLISH_ON_PAGE_PUBLISH', default=True)  # Queue a 'publish' job after page changes
+PUBLISH_DELAY = env.int('PUBLISH_DELAY', default=5)  # seconds a publish job waits for more edits
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -190,4 +244,57 @@ CSRF_EXEMPT_URLS = [
 TENANT_SUBDOMAIN_SUFFIX = env('TENANT_SUBDOMAIN_SUFFIX', default='.lvh.me')
 
 # Public schema name (for shared data)
-PUBLIC_SCHEMA_URLCONF = 'justcodeworks.urls_public'
\ No newline at end of file
+PUBLIC_SCHEMA_URLCONF = 'justcodeworks.urls_public'
+
+# Lazy tenant routing: these routes only need shared tables, so they skip
+# hostname resolution; a tenant is activated on first tenant-scoped query
+TENANT_LAZY_ROUTING = env.bool('TENANT_LAZY_ROUTING', default=True)
+PUBLIC_ROUTE_PREFIXES = env.list('PUBLIC_ROUTE_PREFIXES', default=[
+    '/api/onboarding/',
+    '/api/auth/',
+    '/api/admin/',
+    '/api/websites/',
+    '/api/tenants/',
+])
+# Exceptions to PUBLIC_ROUTE_PREFIXES: resolve the host's tenant as usual
+TENANT_ROUTE_PREFIXES = env.list('TENANT_ROUTE_PREFIXES', default=[
+    '/api/tenants/info/',
+])
+PUBLIC_ROUTE_HOSTS = env.list('PUBLIC_ROUTE_HOSTS', default=[])  # Hosts always served from the public schema
+
+# Tenant routing cache (hostname -> tenant)
+TENANT_RESOLVER_LRU_SIZE = env.int('TENANT_RESOLVER_LRU_SIZE', default=1024)
+TENANT_RESOLVER_LOCAL_TTL = env.int('TENANT_RESOLVER_LOCAL_TTL', default=5)  # seconds
+TENANT_RESOLVER_CACHE_TTL = env.int('TENANT_RESOLVER_CACHE_TTL', default=3600)  # seconds
+
+# Negative cache for unknown hostnames/slugs
+TENANT_NEGATIVE_CACHE_SIZE = env.int('TENANT_NEGATIVE_CACHE_SIZE', default=10000)
+TENANT_NEGATIVE_CACHE_TTL = env.int('TENANT_NEGATIVE_CACHE_TTL', default=60)  # seconds
+
+# Tenant-namespaced view cache (apps.core.cache)
+TENANT_CACHE_TIMEOUT = env.int('TENANT_CACHE_TIMEOUT', default=300)  # seconds
+
+# Tenant provisioning: onboarding queues a job for `manage.py run_tenant_jobs`
+# instead of building the schema inside the request
+TENANT_PROVISIONING_ASYNC = env.bool('TENANT_PROVISIONING_ASYNC', default=True)
+TENANT_JOB_RETRY_DELAY = env.int('TENANT_JOB_RETRY_DELAY', default=30)  # seconds, doubled per attempt
+# Empty, migrated schemas kept ready per shard by `manage.py refill_schema_pool` (0 disables)
+TENANT_SCHEMA_POOL_SIZE = env.int('TENANT_SCHEMA_POOL_SIZE', default=0)
+# 'clone' copies the golden schema (`manage.py refresh_golden_schema`) instead of replaying migrations
+TENANT_PROVISION_METHOD = env('TENANT_PROVISION_METHOD', default='migrate')
+TENANT_BASE_SCHEMA = env('TENANT_BASE_SCHEMA', default='_golden')  # Slugs never start with '_'
+# Starter content for new tenants: default theme plus these (slug, title) draft pages
+TENANT_SEED_CONTENT = env.bool('TENANT_SEED_CONTENT', default=True)
+TENANT_STARTER_PAGES = [('home', 'Home')]
+# Build the home page from the default template of the tenant's website type. Schema
+# tenancy reads templates and sections from TENANT_TEMPLATE_SCHEMA (run
+# generate_restaurant_templates there with tenant_command) and copies them over
+TENANT_TEMPLATE_SCHEMA = env('TENANT_TEMPLATE_SCHEMA', default='')
+TENANT_BOOTSTRAP_SITE = env.bool(
+    'TENANT_BOOTSTRAP_SITE', default=TENANCY_MODE == 'row' or bool(TENANT_TEMPLATE_SCHEMA),
+)
+# Deleted tenants are deactivated, then purged by a 'purge' job after this grace period
+TENANT_PURGE_DELAY = env.int('TENANT_PURGE_DELAY', default=86400)  # seconds; restorable until then
+TENANT_PURGE_CHUNK_SIZE = env.int('TENANT_PURGE_CHUNK_SIZE', default=1000)  # rows per delete (row tenancy)
+TENANT_PURGE_PAUSE = env.float('TENANT_PURGE_PAUSE', default=0.5)  # seconds between chunks
+TENANT_PURGE_LOCK_TIMEOUT = env.int('TENANT_PURGE_LOCK_TIMEOUT', default=5000)  # ms a DROP TABLE may wait
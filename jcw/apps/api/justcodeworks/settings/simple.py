@@ -29,7 +29,24 @@ DATABASES = {
     }
 }
 
-# Simple app configuration (no tenancy for now)
+# Cache
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+# No tenancy by default: every page, section and theme is shared. TENANCY_MODE=row
+# scopes tenant models by their tenant column; rows created before have no
+# tenant and are hidden from tenant requests until they are assigned one
+TENANCY_MODE = env('TENANCY_MODE', default='none')
+
+# No schema to build: provision tenants inside the onboarding request
+TENANT_PROVISIONING_ASYNC = env.bool('TENANT_PROVISIONING_ASYNC', default=False)
+TENANT_BOOTSTRAP_SITE = env.bool('TENANT_BOOTSTRAP_SITE', default=True)
+
+# Statically published tenant sites (see apps.tenants.publishing)
+PUBLISH_ON_PAGE_PUBLISH = env.bool('PUBLISH_ON_PAGE_PUBLISH', default=True)
+
+# Simple app configuration (no schema tenancy)
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -55,6 +72,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.tenants.middleware.RowTenantMiddleware',  # Scopes tenant models to the request host's tenant
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
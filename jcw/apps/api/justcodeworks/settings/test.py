@@ -0,0 +1,40 @@
+"""
+Settings for the test suite: the simple SQLite settings in row-level
+tenancy mode, plus a second database standing in for a tenant shard.
+
+    python manage.py test --settings=justcodeworks.settings.test
+"""
+import tempfile
+
+from .simple import *  # noqa: F401,F403
+from .simple import BASE_DIR
+
+
+TENANCY_MODE = 'row'
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    },
+    # Only tests that list it in `databases` (and set TENANT_SHARDS) use it
+    'shard1': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'shard1.sqlite3',
+    },
+}
+TENANT_SHARDS = ['default']
+
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+}
+
+# Keep test runs off the working tree
+MEDIA_ROOT = tempfile.mkdtemp(prefix='jcw-test-media-')
+PUBLISH_ROOT = tempfile.mkdtemp(prefix='jcw-test-published-')
+
+TENANT_PROVISIONING_ASYNC = False
+TENANT_BOOTSTRAP_SITE = False
+PUBLISH_ON_PAGE_PUBLISH = False
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
@@ -0,0 +1,37 @@
+"""
+Settings for the tests that need PostgreSQL: schema tenancy and moving
+tenants between shards. Point DATABASE_URL (and DATABASE_SHARDS for the
+shard tests) at local servers; the test runner creates its own databases.
+
+    DATABASE_URL=postgresql://localhost/jcw \
+    DATABASE_SHARDS=shard1=postgresql://localhost/jcw_shard1 \
+    python manage.py test --tag postgresql --settings=justcodeworks.settings.test_postgresql
+"""
+import os
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
+
+# Read by base.py while it is imported
+os.environ.setdefault('TENANCY_MODE', 'schema')
+os.environ.setdefault('DATABASE_POOL', 'false')
+
+from .development import *  # noqa: E402,F401,F403
+from .development import DATABASES  # noqa: E402
+
+if DATABASES['default']['ENGINE'] != 'apps.core.postgresql_backend':
+    raise ImproperlyConfigured('The PostgreSQL tests need DATABASE_URL=postgresql://...')
+
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+}
+
+# Keep test runs off the working tree
+MEDIA_ROOT = tempfile.mkdtemp(prefix='jcw-test-media-')
+PUBLISH_ROOT = tempfile.mkdtemp(prefix='jcw-test-published-')
+
+TENANT_PROVISIONING_ASYNC = False
+TENANT_BOOTSTRAP_SITE = False
+PUBLISH_ON_PAGE_PUBLISH = False
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']